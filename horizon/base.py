@@ -22,9 +22,12 @@ the classes contained therein.
 
 import collections
 import copy
+import hashlib
 import inspect
 import logging
 import os
+import threading
+import time
 
 from django.conf import settings
 from django.conf.urls import include
@@ -56,20 +59,77 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
+class _AccessCache(object):
+    """A bounded, least recently used, map of the hash of each token to the
+    access decisions made for it.
+
+    The decisions used to be kept in the session, but with the
+    ``signed_cookies`` session engine that enlarged the cookie sent with
+    every request.  A token is scoped to a single project, and the decisions
+    only depend on the user and project, so they're kept in this process
+    (for up to ``NAV_ACCESS_CACHE_SIZE`` tokens).  The decisions are made
+    again once they are ``NAV_ACCESS_CACHE_TTL`` seconds old, so that
+    changes to the policy files or the enabled services show up.
+    """
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token_hash):
+        """Returns the dict of access decisions made for the token."""
+        now = time.time()
+        ttl = getattr(settings, 'NAV_ACCESS_CACHE_TTL', 300)
+        with self._lock:
+            created, decisions = self._entries.pop(token_hash, (None, None))
+            if decisions is None or now - created >= ttl:
+                created, decisions = now, {}
+                size = getattr(settings, 'NAV_ACCESS_CACHE_SIZE', 1000)
+                while self._entries and len(self._entries) >= size:
+                    self._entries.popitem(last=False)
+            self._entries[token_hash] = (created, decisions)
+            return decisions
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_access_cache = _AccessCache()
+
+
+def _token_hash(request):
+    # The token is an openstack_auth Token, or its ID in tests.
+    token = request.session.get('token')
+    token_id = getattr(token, 'id', token)
+    if not token_id:
+        return None
+    return hashlib.md5(token_id.encode('utf-8')).hexdigest()
+
+
 def access_cached(func):
     def inner(self, context):
-        session = context['request'].session
-        try:
-            if session['allowed']['valid_for'] != session.get('token'):
-                raise KeyError()
-        except KeyError:
-            session['allowed'] = {"valid_for": session.get('token')}
+        request = context['request']
+        # The decisions are no longer kept in the session (see
+        # _AccessCache), so drop them from sessions created before.
+        if 'allowed' in request.session:
+            del request.session['allowed']
+
+        token_hash = _token_hash(request)
+        if token_hash is None:
+            return func(self, context)
+
+        # The decisions are also kept on the request, so that it doesn't
+        # matter if the token is evicted while a page is rendered.
+        if getattr(request, '_access_token_hash', None) != token_hash:
+            request._access_decisions = _access_cache.get(token_hash)
+            request._access_token_hash = token_hash
+        decisions = request._access_decisions
 
         key = "%s.%s" % (self.__class__.__module__, self.__class__.__name__)
-        if key not in session['allowed']:
-            session['allowed'][key] = func(self, context)
-            session.modified = True
-        return session['allowed'][key]
+        if key not in decisions:
+            decisions[key] = func(self, context)
+        return decisions[key]
     return inner
 
 
@@ -112,7 +172,7 @@ class HorizonComponent(object):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is cached for each token.
         """
         return self.allowed(context)
 
@@ -127,10 +187,15 @@ class HorizonComponent(object):
 
     def _can_access(self, request):
         policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
+        policy_check_many = getattr(settings, "POLICY_CHECK_MANY_FUNCTION",
+                                    None)
 
         # this check is an OR check rather than an AND check that is the
         # default in the policy engine, so calling each rule individually
         if policy_check and self.policy_rules:
+            if policy_check_many:
+                return any(policy_check_many(
+                    [((rule,), None) for rule in self.policy_rules], request))
             for rule in self.policy_rules:
                 if policy_check((rule,), request):
                     return True
@@ -84,10 +84,22 @@ class BaseActionMetaClass(type):
         return klass
 
 
+def _freeze(value):
+    """Returns a hashable equivalent of a policy target or rule list."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
 @six.add_metaclass(BaseActionMetaClass)
 class BaseAction(html.HTMLElement):
     """Common base class for all ``Action`` classes."""
 
+    # See Action for the documentation of this attribute.
+    allowed_datum_attrs = None
+
     def __init__(self, **kwargs):
         super(BaseAction, self).__init__()
         self.datum = kwargs.get('datum', None)
@@ -127,14 +139,51 @@ class BaseAction(html.HTMLElement):
         """
         return True
 
+    def _cached_decision(self, key, func):
+        """Returns the result of ``func()``, shared with the other actions of
+        the table (i.e. the copies of this action for the other rows) that
+        have the same ``key``, for as long as the table exists.
+        """
+        cache = getattr(self.table, '_action_decisions', None)
+        if cache is None:
+            return func()
+        try:
+            return cache[key]
+        except KeyError:
+            decision = cache[key] = func()
+            return decision
+        except TypeError:
+            # Part of the key isn't hashable, so it can't be cached.
+            return func()
+
+    def _allowed_for_datum(self, request, datum):
+        if datum is None or self.allowed_datum_attrs is None:
+            return self.allowed(request, datum)
+        key = ('allowed', self.name,
+               tuple(getattr(datum, attr, None)
+                     for attr in self.allowed_datum_attrs))
+        return self._cached_decision(key,
+                                     lambda: self.allowed(request, datum))
+
+    def _policy_key(self, request, datum):
+        """Returns the key of the decision of the policy check for the datum,
+        and the target to check with.
+        """
+        target = self.get_policy_target(request, datum)
+        # The key is built first as the policy check may add to the target.
+        # The decision only depends on the rules, the target and the user,
+        # so it's shared by all the rows with that target.
+        return ('policy', _freeze(self.policy_rules), _freeze(target)), target
+
     def _allowed(self, request, datum):
         policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
 
         if policy_check and self.policy_rules:
-            target = self.get_policy_target(request, datum)
-            return (policy_check(self.policy_rules, request, target) and
-                    self.allowed(request, datum))
-        return self.allowed(request, datum)
+            key, target = self._policy_key(request, datum)
+            return (self._cached_decision(
+                key, lambda: policy_check(self.policy_rules, request, target))
+                and self._allowed_for_datum(request, datum))
+        return self._allowed_for_datum(request, datum)
 
     def update(self, request, datum):
         """Allows per-action customization based on current conditions.
@@ -236,6 +285,18 @@ class Action(BaseAction):
                     "(("identity", "identity:list_users"),
                       ("identity", "identity:list_roles"))"
 
+    .. attribute:: allowed_datum_attrs
+
+        A tuple of the names of the datum attributes that the result of
+        :meth:`allowed` depends on (e.g. ``("status",)``), if it depends on
+        nothing else about the row.  The result is then worked out once for
+        each combination of their values when the table is rendered, rather
+        than once for every row, so :meth:`allowed` mustn't change the
+        action itself.
+
+        Defaults to ``None``, in which case :meth:`allowed` is called for
+        every row.
+
     At least one of the following methods must be defined:
 
     .. method:: single(self, data_table, request, object_id)
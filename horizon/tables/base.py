@@ -19,6 +19,7 @@ import logging
 from operator import attrgetter
 import sys
 
+from django.conf import settings
 from django.core import exceptions as core_exceptions
 from django.core import urlresolvers
 from django import forms
@@ -1155,6 +1156,8 @@ class DataTable(object):
         self.breadcrumb = None
         self.current_item_id = None
         self.permissions = self._meta.permissions
+        # Policy and allowed() decisions shared by the actions of each row.
+        self._action_decisions = {}
 
         # Create a new set
         columns = []
@@ -1251,6 +1254,39 @@ class DataTable(object):
         for column in self.get_columns():
             self._data_cache[column] = {}
 
+    def _check_action_policies(self, actions, data):
+        """Makes the policy checks of the actions for each datum (or for the
+        table, where the datum is None) in one pass, with
+        ``POLICY_CHECK_MANY_FUNCTION`` if it's set, and shares the decisions
+        with the actions' own checks.
+        """
+        policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
+        policy_check_many = getattr(settings, "POLICY_CHECK_MANY_FUNCTION",
+                                    None)
+        if not (policy_check and policy_check_many):
+            return
+        checks = collections.OrderedDict()
+        for action in actions:
+            if not action.policy_rules:
+                continue
+            for datum in data:
+                try:
+                    key, target = action._policy_key(self.request, datum)
+                    if key not in self._action_decisions:
+                        checks.setdefault(key, (action.policy_rules, target))
+                except Exception:
+                    # It's left to the action's own check, which reports
+                    # the error.
+                    continue
+        if not checks:
+            return
+        try:
+            decisions = policy_check_many(list(checks.values()), self.request)
+        except Exception:
+            LOG.exception("Error while checking action permissions.")
+            return
+        self._action_decisions.update(zip(checks, decisions))
+
     def _filter_action(self, action, request, datum=None):
         try:
             # Catch user errors in permission functions here
@@ -1358,6 +1394,7 @@ class DataTable(object):
         menu_actions = [self.base_actions[action.name] for
                         action in self._meta.table_actions_menu]
         bound_actions = button_actions + menu_actions
+        self._check_action_policies(bound_actions, [None])
         return [action for action in bound_actions if
                 self._filter_action(action, self.request)]
 
@@ -1760,6 +1797,10 @@ class DataTable(object):
         """Return the row data for this table broken out by columns."""
         rows = []
         try:
+            self._check_action_policies(
+                [self.base_actions[action.name]
+                 for action in self._meta.row_actions],
+                self.filtered_data)
             for datum in self.filtered_data:
                 row = self._meta.row_class(self, datum)
                 if self.get_object_id(datum) == self.current_item_id:
@@ -60,6 +60,7 @@ except ImportError as e:
 
 import mox
 
+from horizon import base
 from horizon import middleware
 
 
@@ -128,6 +129,8 @@ class TestCase(django_test.TestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.mox = mox.Mox()
+        # The tests reuse the same tokens.
+        base._access_cache.clear()
         self._setup_test_data()
         self._setup_factory()
         self._setup_user()
@@ -521,3 +521,86 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+    def _count_allowed(self, panel):
+        calls = []
+
+        def allowed(context):
+            calls.append(context['request'])
+            return True
+
+        panel.allowed = allowed
+        self.addCleanup(delattr, panel, 'allowed')
+        return calls
+
+    def test_can_access_cached_per_token(self):
+        panel = horizon.get_dashboard("dogs").get_panel("rbac_panel_yes")
+        calls = self._count_allowed(panel)
+        self.request.session['token'] = 'token-1'
+        self.assertTrue(panel.can_access({'request': self.request}))
+
+        # Another request with the same token.
+        request = self.factory.get('/')
+        request.session = self.client._session()
+        request.session['token'] = 'token-1'
+        self.assertTrue(panel.can_access({'request': request}))
+        self.assertEqual([self.request], calls)
+        self.assertNotIn('allowed', request.session)
+
+        request.session['token'] = 'token-2'
+        self.assertTrue(panel.can_access({'request': request}))
+        self.assertEqual([self.request, request], calls)
+
+    def test_can_access_not_cached_without_token(self):
+        panel = horizon.get_dashboard("dogs").get_panel("rbac_panel_yes")
+        calls = self._count_allowed(panel)
+        panel.can_access({'request': self.request})
+        panel.can_access({'request': self.request})
+        self.assertEqual(2, len(calls))
+
+    def test_can_access_removes_session_decisions(self):
+        self.request.session['token'] = 'token-1'
+        self.request.session['allowed'] = {'valid_for': 'token-1'}
+        dogs = horizon.get_dashboard("dogs")
+        self.assertTrue(dogs.can_access({'request': self.request}))
+        self.assertNotIn('allowed', self.request.session)
+
+    def test_can_access_policy_check_many(self):
+        panel = horizon.get_dashboard("dogs").get_panel("rbac_panel_yes")
+        panel.policy_rules = (("compute", "compute:create"),
+                              ("compute", "compute:delete"))
+        self.addCleanup(delattr, panel, 'policy_rules')
+        checks = []
+
+        def policy_check(actions, request, target=None):
+            self.fail("The rules should be checked at once.")
+
+        def policy_check_many(policy_checks, request):
+            checks.append(policy_checks)
+            return [False, True]
+
+        with self.settings(POLICY_CHECK_FUNCTION=policy_check,
+                           POLICY_CHECK_MANY_FUNCTION=policy_check_many):
+            # Any one of the rules is enough.
+            self.assertTrue(panel._can_access(self.request))
+        self.assertEqual([[((("compute", "compute:create"),), None),
+                           ((("compute", "compute:delete"),), None)]],
+                         checks)
+
+    def test_access_cache_bounded(self):
+        cache = base._AccessCache()
+        with self.settings(NAV_ACCESS_CACHE_SIZE=2):
+            cache.get('a')['key'] = True
+            cache.get('b')
+            # 'a' is now the most recently used, so 'b' is evicted.
+            cache.get('a')
+            cache.get('c')
+        self.assertEqual(['a', 'c'], list(cache._entries))
+        self.assertEqual({'key': True}, cache.get('a'))
+
+    def test_access_cache_expires(self):
+        cache = base._AccessCache()
+        cache.get('a')['key'] = True
+        self.assertEqual({'key': True}, cache.get('a'))
+        with self.settings(NAV_ACCESS_CACHE_TTL=0):
+            self.assertEqual({}, cache.get('a'))
@@ -1304,6 +1304,95 @@ class DataTableTests(test.TestCase):
         resp = http.HttpResponse(table.render())
         self.assertContains(resp, value)
 
+    def test_row_action_policy_checks_shared_by_rows(self):
+        checks = []
+
+        def policy_check(rules, request, target):
+            checks.append(target)
+            return True
+
+        class MyPolicyAction(tables.LinkAction):
+            name = "policy"
+            verbose_name = "Policy"
+            url = "http://example.com/"
+            policy_rules = (("compute", "compute:stop"),)
+
+            def get_policy_target(self, request, datum=None):
+                return {"project_id": "1"}
+
+        class MyPolicyTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                row_actions = (MyPolicyAction,)
+
+        with self.settings(POLICY_CHECK_FUNCTION=policy_check):
+            table = MyPolicyTable(self.request, TEST_DATA)
+            for row in table.get_rows():
+                self.assertEqual(["policy"],
+                                 [a.name for a in
+                                  table.get_row_actions(row.datum)])
+        self.assertEqual([{"project_id": "1"}], checks)
+
+    def test_row_action_policy_checks_made_at_once(self):
+        checks = []
+
+        def policy_check(rules, request, target):
+            self.fail("The rows should be checked at once.")
+
+        def policy_check_many(policy_checks, request):
+            checks.append(policy_checks)
+            return [target["project_id"] == "1"
+                    for rules, target in policy_checks]
+
+        class MyPolicyAction(tables.LinkAction):
+            name = "policy"
+            verbose_name = "Policy"
+            url = "http://example.com/"
+            policy_rules = (("compute", "compute:stop"),)
+
+            def get_policy_target(self, request, datum=None):
+                return {"project_id": datum.id}
+
+        class MyPolicyTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                row_actions = (MyPolicyAction,)
+
+        with self.settings(POLICY_CHECK_FUNCTION=policy_check,
+                           POLICY_CHECK_MANY_FUNCTION=policy_check_many):
+            table = MyPolicyTable(self.request, TEST_DATA)
+            allowed = [bool(table.get_row_actions(row.datum))
+                       for row in table.get_rows()]
+        self.assertEqual([True, False, False], allowed)
+        rules = (("compute", "compute:stop"),)
+        self.assertEqual([[(rules, {"project_id": datum.id})
+                           for datum in TEST_DATA]], checks)
+
+    def test_row_action_allowed_datum_attrs(self):
+        calls = []
+
+        class MyStatusAction(tables.LinkAction):
+            name = "status"
+            verbose_name = "Status"
+            url = "http://example.com/"
+            allowed_datum_attrs = ("status",)
+
+            def allowed(self, request, obj=None):
+                calls.append(obj.id)
+                return obj.status == "up"
+
+        class MyStatusTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                row_actions = (MyStatusAction,)
+
+        table = MyStatusTable(self.request, TEST_DATA)
+        allowed = [bool(table.get_row_actions(row.datum))
+                   for row in table.get_rows()]
+        self.assertEqual([True, False, True], allowed)
+        # The third row has the same status as the first.
+        self.assertEqual(['1', '2'], calls)
+
 
 class SingleTableView(table_views.DataTableView):
     table_class = MyTable
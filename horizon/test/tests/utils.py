@@ -21,6 +21,7 @@ from django.template import defaultfilters
 
 from horizon import forms
 from horizon.test import helpers as test
+from horizon.utils import csvbase
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa
@@ -456,3 +457,29 @@ class UnitsTests(test.TestCase):
 
         self.assertEqual(units.normalize(1, 'unknown_unit'),
                          (1, 'unknown_unit'))
+
+
+class CsvStreamingResponseTests(test.TestCase):
+    def test_rows_streamed(self):
+        generated = []
+
+        class Renderer(csvbase.BaseCsvStreamingResponse):
+            columns = ["Name", "Value"]
+
+            def get_row_data(self):
+                for row in self.context['rows']:
+                    generated.append(row)
+                    yield row
+
+        rows = [("a", 1), (u"\u4e91", 2)]
+        response = Renderer(request=self.request, template=None,
+                            context={'rows': rows}, content_type='csv')
+        content = iter(response.streaming_content)
+
+        # The header is sent before any rows are generated.
+        self.assertEqual("Name,Value\r\n", next(content))
+        self.assertEqual([], generated)
+        self.assertEqual("a,1\r\n", next(content))
+        self.assertEqual(rows[:1], generated)
+        self.assertEqual(u"\u4e91,2\r\n".encode('utf-8'), next(content))
+        self.assertRaises(StopIteration, next, content)
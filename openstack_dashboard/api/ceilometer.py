@@ -10,8 +10,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+import functools
+import json
 import logging
-import threading
 
 from ceilometerclient import client as ceilometer_client
 from django.conf import settings
@@ -24,6 +26,7 @@ from horizon.utils.memoized import memoized  # noqa
 from openstack_dashboard.api import base
 from openstack_dashboard.api import keystone
 from openstack_dashboard.api import nova
+from openstack_dashboard.utils import concurrency
 
 LOG = logging.getLogger(__name__)
 
@@ -309,23 +312,21 @@ def statistic_list(request, meter_name, query=None, period=None):
     return [Statistic(s) for s in statistics]
 
 
-class ThreadedUpdateResourceWithStatistics(threading.Thread):
-    """Multithread wrapper for update_with_statistics method of
+class ThreadedUpdateResourceWithStatistics(object):
+    """Concurrent wrapper for update_with_statistics method of
     resource_usage.
 
-    A join logic is placed in process_list class method. All resources
-    will have its statistics attribute filled in separate threads.
-
-    The resource_usage object is shared between threads. Each thread is
-    updating one Resource.
+    The statistics of each meter of each resource are retrieved as
+    separate tasks by a pool of at most ``CEILOMETER_STATISTICS_MAX_WORKERS``
+    threads, and identical queries are only made once.  Queries that haven't
+    completed within ``CEILOMETER_STATISTICS_TIMEOUT`` seconds of the start,
+    or that fail, are logged and treated as having no statistics.
 
     :Parameters:
-      - `resource`: Resource or ResourceAggregate object, that will
-                    be filled by statistic data.
-      - `resources`: List of Resource or ResourceAggregate object,
-                     that will be filled by statistic data.
       - `resource_usage`: Wrapping resource usage object, that holds
                           all statistics data.
+      - `resources`: List of Resource or ResourceAggregate object,
+                     that will be filled by statistic data.
       - `meter_names`: List of meter names of the statistics we want.
       - `period`: In seconds. If no period is given, only one aggregate
                   statistic is returned. If given, a faceted result will be
@@ -341,40 +342,43 @@ class ThreadedUpdateResourceWithStatistics(threading.Thread):
     # and group-by, so all of this optimization will not be necessary.
     # It is planned somewhere to I.
 
-    def __init__(self, resource_usage, resource, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        super(ThreadedUpdateResourceWithStatistics, self).__init__()
-        self.resource_usage = resource_usage
-        self.resource = resource
-        self.meter_names = meter_names
-        self.period = period
-        self.stats_attr = stats_attr
-        self.additional_query = additional_query
-
-    def run(self):
-        # Run the job
-        self.resource_usage.update_with_statistics(
-            self.resource,
-            meter_names=self.meter_names, period=self.period,
-            stats_attr=self.stats_attr, additional_query=self.additional_query)
-
     @classmethod
     def process_list(cls, resource_usage, resources, meter_names=None,
                      period=None, filter_func=None, stats_attr=None,
                      additional_query=None):
-        threads = []
+        if not meter_names:
+            raise ValueError("meter_names and resources must be defined to be "
+                             "able to obtain the statistics.")
 
+        # Each (resource, meter) pair is a task, but tasks with the same
+        # query share a single call (e.g. resource aggregates that select
+        # the same resources).
+        tasks = []
+        calls = collections.OrderedDict()
         for resource in resources:
-            # add statistics data into resource
-            thread = cls(resource_usage, resource, meter_names=meter_names,
-                         period=period, stats_attr=stats_attr,
-                         additional_query=additional_query)
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+            query = resource_usage.statistics_query(resource,
+                                                    additional_query)
+            for meter in meter_names:
+                key = (meter, json.dumps(query, sort_keys=True, default=str))
+                if key not in calls:
+                    calls[key] = functools.partial(
+                        statistic_list, resource_usage._request, meter,
+                        query=query, period=period)
+                tasks.append((resource, meter, key))
+
+        results = dict(zip(calls, concurrency.fan_out(
+            calls.values(),
+            max_workers=getattr(settings, 'CEILOMETER_STATISTICS_MAX_WORKERS',
+                                20),
+            timeout=getattr(settings, 'CEILOMETER_STATISTICS_TIMEOUT', 120))))
+
+        for resource, meter, key in tasks:
+            result = results[key]
+            if result.failed:
+                LOG.warning("Unable to retrieve the %s statistics for %s: %s",
+                            meter, key[1], result.exception)
+            resource_usage.set_statistics(resource, meter, result.value,
+                                          stats_attr)
 
 
 class CeilometerUsage(object):
@@ -413,19 +417,6 @@ class CeilometerUsage(object):
             self._users[user_id] = user
         return user
 
-    def preload_all_users(self):
-        """Preloads all users into dictionary.
-
-        It's more effective to preload all users, rather than fetching many
-        users by separate API get calls.
-        """
-
-        users = keystone.user_list(self._request)
-        # Cache all users on right indexes, this is more effective than to
-        # obtain large number of users one by one by keystone.user_get
-        for u in users:
-            self._users[u.id] = u
-
     def get_tenant(self, tenant_id):
         """Returns tenant fetched from API.
 
@@ -440,19 +431,6 @@ class CeilometerUsage(object):
             self._tenants[tenant_id] = tenant
         return tenant
 
-    def preload_all_tenants(self):
-        """Preloads all tenants into dictionary.
-
-        It's more effective to preload all tenants, rather than fetching each
-        tenant by separate API get calls.
-        """
-
-        tenants, more = keystone.tenant_list(self._request)
-        # Cache all tenants on right indexes, this is more effective than to
-        # obtain large number of tenants one by one by keystone.tenant_get
-        for t in tenants:
-            self._tenants[t.id] = t
-
     def global_data_get(self, used_cls=None, query=None,
                         with_statistics=False, additional_query=None,
                         with_users_and_tenants=True):
@@ -532,6 +510,36 @@ class CeilometerUsage(object):
         return make_query(tenant_id=tenant_id, user_id=user_id,
                           resource_id=resource_id)
 
+    def statistics_query(self, resource, additional_query=None):
+        """Returns the query for the statistics of the given Resource or
+        ResourceAggregate, including any additional query.
+        """
+        # query for identifying one resource in meters
+        query = resource.query
+        if additional_query:
+            if not is_iterable(additional_query):
+                raise ValueError("Additional query must be list of"
+                                 " conditions. See the docs for format.")
+            query = query + additional_query
+        return query
+
+    def set_statistics(self, resource, meter, statistics, stats_attr=None):
+        """Adds the given statistics of a meter into the resource
+        attributes.  See update_with_statistics.
+        """
+        meter = meter.replace(".", "_")
+        if statistics:
+            if stats_attr:
+                # I want to load only a specific attribute
+                resource.set_meter(
+                    meter,
+                    getattr(statistics[0], stats_attr, None))
+            else:
+                # I want a dictionary of all statistics
+                resource.set_meter(meter, statistics)
+        else:
+            resource.set_meter(meter, None)
+
     def update_with_statistics(self, resource, meter_names=None, period=None,
                                stats_attr=None, additional_query=None):
         """Adding statistical data into one Resource or ResourceAggregate.
@@ -561,34 +569,11 @@ class CeilometerUsage(object):
             raise ValueError("meter_names and resources must be defined to be "
                              "able to obtain the statistics.")
 
-        # query for identifying one resource in meters
-        query = resource.query
-        if additional_query:
-            if not is_iterable(additional_query):
-                raise ValueError("Additional query must be list of"
-                                 " conditions. See the docs for format.")
-            query = query + additional_query
-
-        # TODO(lsmola) thread for each meter will be probably overkill
-        # but I should test lets say thread pool with 100 of threads
-        # and apply it only to this code.
-        # Though I do expect Ceilometer will support bulk requests,
-        # so all of this optimization will not be necessary.
+        query = self.statistics_query(resource, additional_query)
         for meter in meter_names:
             statistics = statistic_list(self._request, meter,
                                         query=query, period=period)
-            meter = meter.replace(".", "_")
-            if statistics:
-                if stats_attr:
-                    # I want to load only a specific attribute
-                    resource.set_meter(
-                        meter,
-                        getattr(statistics[0], stats_attr, None))
-                else:
-                    # I want a dictionary of all statistics
-                    resource.set_meter(meter, statistics)
-            else:
-                resource.set_meter(meter, None)
+            self.set_statistics(resource, meter, statistics, stats_attr)
 
         return resource
 
@@ -20,9 +20,11 @@
 
 from __future__ import absolute_import
 
+import hashlib
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import pgettext_lazy
 from django.utils.translation import ugettext_lazy as _
 
@@ -33,6 +35,8 @@ from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
+from openstack_dashboard.utils import capabilities
+from openstack_dashboard.utils import concurrency
 
 LOG = logging.getLogger(__name__)
 
@@ -40,6 +44,7 @@ LOG = logging.getLogger(__name__)
 # API static values
 VOLUME_STATE_AVAILABLE = "available"
 DEFAULT_QUOTA_NAME = 'default'
+QOS_ASSOCIATIONS_CACHE_PREFIX = 'cinder-qos-associations'
 
 # Available consumer choices associated with QOS Specs
 CONSUMER_CHOICES = (
@@ -428,13 +433,16 @@ def volume_type_list_with_qos_associations(request):
 
     # get all currently defined qos specs
     qos_specs = qos_spec_list(request)
+    associations = qos_spec_associations(request,
+                                         [spec.id for spec in qos_specs])
     for qos_spec in qos_specs:
         # get all volume types this qos spec is associated with
-        assoc_vol_types = qos_spec_get_associations(request, qos_spec.id)
-        for assoc_vol_type in assoc_vol_types:
-            # update volume type to hold this association info
-            vol_type = vol_types_dict[assoc_vol_type.id]
-            vol_type.associated_qos_spec = qos_spec.name
+        for vol_type_id in associations[qos_spec.id]:
+            # update volume type to hold this association info (the cached
+            # associations may still include deleted volume types)
+            vol_type = vol_types_dict.get(vol_type_id)
+            if vol_type is not None:
+                vol_type.associated_qos_spec = qos_spec.name
 
     return vol_types
 
@@ -506,7 +514,9 @@ def qos_spec_get(request, qos_spec_id):
 
 
 def qos_spec_delete(request, qos_spec_id):
-    return cinderclient(request).qos_specs.delete(qos_spec_id, force=True)
+    result = cinderclient(request).qos_specs.delete(qos_spec_id, force=True)
+    invalidate_qos_spec_associations(request, qos_spec_id)
+    return result
 
 
 def qos_spec_create(request, name, specs):
@@ -531,17 +541,74 @@ def qos_spec_unset_keys(request, qos_spec_id, specs):
 
 
 def qos_spec_associate(request, qos_specs, vol_type_id):
-    return cinderclient(request).qos_specs.associate(qos_specs, vol_type_id)
+    result = cinderclient(request).qos_specs.associate(qos_specs,
+                                                       vol_type_id)
+    invalidate_qos_spec_associations(request, getattr(qos_specs, 'id',
+                                                      qos_specs))
+    return result
 
 
 def qos_spec_disassociate(request, qos_specs, vol_type_id):
-    return cinderclient(request).qos_specs.disassociate(qos_specs, vol_type_id)
+    result = cinderclient(request).qos_specs.disassociate(qos_specs,
+                                                          vol_type_id)
+    invalidate_qos_spec_associations(request, getattr(qos_specs, 'id',
+                                                      qos_specs))
+    return result
 
 
 def qos_spec_get_associations(request, qos_spec_id):
     return cinderclient(request).qos_specs.get_associations(qos_spec_id)
 
 
+def _qos_associations_cache_key(request, qos_spec_id):
+    # The association of volume types and QoS specs is the same for every
+    # project, so the cache is shared by every user of the cloud and region.
+    cloud = '%s|%s' % (getattr(request.user, 'endpoint', None) or '',
+                       getattr(request.user, 'services_region', None) or '')
+    return '%s:%s:%s' % (QOS_ASSOCIATIONS_CACHE_PREFIX,
+                         hashlib.md5(cloud.encode('utf-8')).hexdigest(),
+                         qos_spec_id)
+
+
+def invalidate_qos_spec_associations(request, qos_spec_id):
+    """Discards the cached associations of a QoS spec, after it has been
+    (dis)associated with a volume type or deleted.
+    """
+    cache.delete(_qos_associations_cache_key(request, qos_spec_id))
+
+
+def qos_spec_associations(request, qos_spec_ids):
+    """Returns a dict mapping each of the QoS spec IDs to a list of the IDs
+    of the volume types associated with it.
+
+    The associations of each QoS spec are fetched concurrently, by up to
+    ``CINDER_QOS_ASSOCIATIONS_MAX_WORKERS`` threads, and are kept in the
+    Django cache for ``CINDER_QOS_ASSOCIATIONS_CACHE_TTL`` seconds.
+    """
+    keys = dict((qos_spec_id, _qos_associations_cache_key(request,
+                                                          qos_spec_id))
+                for qos_spec_id in qos_spec_ids)
+    cached = cache.get_many(keys.values())
+    associations = dict((qos_spec_id, cached[key])
+                        for qos_spec_id, key in keys.items() if key in cached)
+
+    missing = [qos_spec_id for qos_spec_id in qos_spec_ids
+               if qos_spec_id not in associations]
+    fetched = concurrency.parallel_map(
+        lambda qos_spec_id: [vol_type.id for vol_type in
+                             qos_spec_get_associations(request, qos_spec_id)],
+        missing,
+        max_workers=getattr(settings, 'CINDER_QOS_ASSOCIATIONS_MAX_WORKERS',
+                            10))
+    associations.update(zip(missing, fetched))
+
+    ttl = getattr(settings, 'CINDER_QOS_ASSOCIATIONS_CACHE_TTL', 300)
+    if ttl and missing:
+        cache.set_many(dict((keys[qos_spec_id], associations[qos_spec_id])
+                            for qos_spec_id in missing), ttl)
+    return associations
+
+
 @memoized
 def tenant_absolute_limits(request):
     limits = cinderclient(request).limits.get().absolute
@@ -570,10 +637,31 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
+def _volume_endpoint(request):
+    # The cinder client uses the v2 endpoint when there is one.
+    if VERSIONS.get_active_version()['version'] == 2:
+        try:
+            return capabilities.endpoint_for(request, 'volumev2')
+        except exceptions.ServiceCatalogException:
+            pass
+    return capabilities.endpoint_for(request, 'volume')
+
+
+# The resources hold a reference to the client, so only their attributes
+# are kept.
+_extensions = capabilities.Registry(
+    'cinder',
+    _volume_endpoint,
+    lambda request: [
+        extension._info for extension in
+        cinder_list_extensions.ListExtManager(cinderclient(request))
+        .show_all()])
+
+
 @memoized
 def list_extensions(request):
-    return cinder_list_extensions.ListExtManager(cinderclient(request))\
-        .show_all()
+    return [cinder_list_extensions.ListExtResource(None, info, loaded=True)
+            for info in _extensions.get(request)]
 
 
 @memoized
@@ -23,16 +23,18 @@ import itertools
 import json
 import logging
 import os
+import tempfile
+import threading
+import time
 
 
 from django.conf import settings
-from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
-from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.cache import cache
 
 
 import glanceclient as glance_client
-from six.moves import _thread as thread
+from glanceclient import exc as glance_exceptions
+from six.moves import queue
 
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
@@ -42,6 +44,15 @@ from openstack_dashboard.api import base
 LOG = logging.getLogger(__name__)
 VERSIONS = base.APIVersionManager("image", preferred_version=2)
 
+UPLOAD_CACHE_PREFIX = 'glance-upload'
+
+# The states of an image data upload, see image_upload_progress().
+UPLOAD_QUEUED = 'queued'
+UPLOAD_UPLOADING = 'uploading'
+UPLOAD_SUCCEEDED = 'succeeded'
+UPLOAD_FAILED = 'failed'
+UPLOAD_CANCELLED = 'cancelled'
+
 
 @memoized
 def glanceclient(request, version='1'):
@@ -53,6 +64,9 @@ def glanceclient(request, version='1'):
 
 
 def image_delete(request, image_id):
+    # Deleting an image that is still being uploaded frees up the worker.
+    if image_upload_progress(request, image_id) is not None:
+        image_upload_cancel(request, image_id)
     return glanceclient(request).images.delete(image_id)
 
 
@@ -125,37 +139,172 @@ def image_update(request, image_id, **kwargs):
                 LOG.warn(msg)
 
 
+class UploadCancelled(Exception):
+    pass
+
+
+def _upload_key(image_id, suffix=''):
+    return '%s:%s%s' % (UPLOAD_CACHE_PREFIX, image_id, suffix)
+
+
+def _upload_ttl():
+    return getattr(settings, 'GLANCE_UPLOAD_STATUS_TTL', 3600)
+
+
+class ImageUpload(object):
+    """The data of a new image, being sent to glance in the background.
+
+    The uploaded data is copied to a temporary file of the upload's own,
+    as Django closes (and deletes) the uploaded file once the request is
+    done, and is then streamed from it in the chunks that glanceclient
+    reads, rather than read into memory.  The temporary file is deleted
+    when the upload finishes.  The progress is kept in the cache, where it
+    can be read with :func:`image_upload_progress`, and is checked for
+    cancellation about once a second.
+    """
+
+    def __init__(self, image_id, data):
+        self.image_id = image_id
+        self.file = tempfile.TemporaryFile(
+            dir=getattr(settings, 'FILE_UPLOAD_TEMP_DIR', None))
+        try:
+            for chunk in data.chunks():
+                self.file.write(chunk)
+            self.total = self.file.tell()
+            self.file.seek(0)
+        except Exception:
+            self.file.close()
+            raise
+        self.bytes_sent = 0
+        self._checked = 0
+
+    def save(self, status):
+        cache.set(_upload_key(self.image_id),
+                  {'status': status,
+                   'bytes_sent': self.bytes_sent,
+                   'total': self.total},
+                  _upload_ttl())
+
+    def is_cancelled(self):
+        return bool(cache.get(_upload_key(self.image_id, ':cancel')))
+
+    def read(self, size=-1):
+        chunk = self.file.read(size)
+        self.bytes_sent += len(chunk)
+        now = time.time()
+        if chunk and now - self._checked >= 1:
+            self._checked = now
+            if self.is_cancelled():
+                raise UploadCancelled()
+            self.save(UPLOAD_UPLOADING)
+        return chunk
+
+    # glanceclient works out the size of the image by seeking to the end.
+    def seek(self, *args):
+        return self.file.seek(*args)
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+    def run(self, client):
+        try:
+            if self.is_cancelled():
+                raise UploadCancelled()
+            self.save(UPLOAD_UPLOADING)
+            client.images.update(self.image_id, data=self, purge_props=False)
+        except Exception as e:
+            if isinstance(e, UploadCancelled) or self.is_cancelled():
+                LOG.info('Cancelled the upload of image %s.', self.image_id)
+                self.save(UPLOAD_CANCELLED)
+            elif isinstance(e, glance_exceptions.NotFound):
+                # The image was deleted, perhaps by a process that doesn't
+                # share this one's cache, and so couldn't cancel the upload.
+                LOG.info('Stopped the upload of deleted image %s.',
+                         self.image_id)
+                self.save(UPLOAD_CANCELLED)
+            else:
+                LOG.exception('Unable to upload image %s.', self.image_id)
+                self.save(UPLOAD_FAILED)
+        else:
+            self.save(UPLOAD_SUCCEEDED)
+        finally:
+            self.close()
+
+
+class _Uploader(object):
+    """Runs the image updates that follow creating an image in a fixed pool
+    of ``GLANCE_UPLOAD_WORKERS`` threads, so that the request needn't wait
+    for them, however many there are.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def _start_workers(self):
+        with self._lock:
+            while (len(self._workers) <
+                   getattr(settings, 'GLANCE_UPLOAD_WORKERS', 4)):
+                worker = threading.Thread(target=self._work)
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                LOG.exception('Unable to update image.')
+
+    def submit(self, func, *args, **kwargs):
+        self._start_workers()
+        self._queue.put((func, args, kwargs))
+
+
+_uploader = _Uploader()
+
+
+def image_upload_progress(request, image_id):
+    """Returns the progress of the upload of the image's data, as a dict of
+    its ``status`` (one of the ``UPLOAD_*`` states), the ``bytes_sent`` so
+    far and the ``total`` size, or None if it's not being uploaded.
+    """
+    return cache.get(_upload_key(image_id))
+
+
+def image_upload_cancel(request, image_id):
+    """Stops the upload of the image's data, or stops it being started if
+    it's still queued.
+    """
+    cache.set(_upload_key(image_id, ':cancel'), True, _upload_ttl())
+
+
 def image_create(request, **kwargs):
     copy_from = kwargs.pop('copy_from', None)
     data = kwargs.pop('data', None)
     location = kwargs.pop('location', None)
 
-    image = glanceclient(request).images.create(**kwargs)
+    client = glanceclient(request)
+    image = client.images.create(**kwargs)
 
+    # The updates run after the request is done, so they are given the
+    # client (which holds just the token and endpoint) and not the request.
     if data:
-        if isinstance(data, TemporaryUploadedFile):
-            # Hack to fool Django, so we can keep file open in the new thread.
-            data.file.close_called = True
-        if isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
-        thread.start_new_thread(image_update,
-                                (request, image.id),
-                                {'data': data,
-                                 'purge_props': False})
+        upload = ImageUpload(image.id, data)
+        upload.save(UPLOAD_QUEUED)
+        _uploader.submit(upload.run, client)
     elif copy_from:
-        thread.start_new_thread(image_update,
-                                (request, image.id),
-                                {'copy_from': copy_from,
-                                 'purge_props': False})
+        _uploader.submit(client.images.update, image.id,
+                         copy_from=copy_from, purge_props=False)
     elif location:
-        thread.start_new_thread(image_update,
-                                (request, image.id),
-                                {'location': location,
-                                 'purge_props': False})
+        _uploader.submit(client.images.update, image.id,
+                         location=location, purge_props=False)
 
     return image
 
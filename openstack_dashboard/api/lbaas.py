@@ -14,12 +14,16 @@
 
 from __future__ import absolute_import
 
+import functools
+
+from django.conf import settings
 from django.utils.datastructures import SortedDict
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import messages
 
 from openstack_dashboard.api import neutron
+from openstack_dashboard.utils import concurrency
 
 neutronclient = neutron.neutronclient
 
@@ -163,17 +167,33 @@ def pool_list(request, **kwargs):
     return _pool_list(request, expand_subnet=True, expand_vip=True, **kwargs)
 
 
+def _referenced(request, resource, ids, fields):
+    """Lists just the given fields of the neutron resources (e.g.
+    ``'subnets'``) with the given IDs, rather than every resource.
+    """
+    ids = sorted(set(i for i in ids if i is not None))
+    if not ids:
+        return []
+    list_method = getattr(neutronclient(request), 'list_%s' % resource)
+    return neutron.list_resources_with_long_filters(
+        lambda **params: list_method(**params).get(resource),
+        'id', ids, fields=['id'] + list(fields))
+
+
 def _pool_list(request, expand_subnet=False, expand_vip=False, **kwargs):
     pools = neutronclient(request).list_pools(**kwargs).get('pools')
     if expand_subnet:
-        subnets = neutron.subnet_list(request)
-        subnet_dict = SortedDict((s.id, s) for s in subnets)
+        # Only the CIDRs of the subnets used by the pools are needed.
+        subnets = _referenced(request, 'subnets',
+                              [p['subnet_id'] for p in pools], ['cidr'])
+        subnet_dict = SortedDict((s['id'], s) for s in subnets)
         for p in pools:
             subnet = subnet_dict.get(p['subnet_id'])
-            p['subnet_name'] = subnet.cidr if subnet else None
+            p['subnet_name'] = subnet['cidr'] if subnet else None
     if expand_vip:
-        vips = vip_list(request)
-        vip_dict = SortedDict((v.id, v) for v in vips)
+        vips = _referenced(request, 'vips', [p['vip_id'] for p in pools],
+                           ['name'])
+        vip_dict = SortedDict((v['id'], Vip(v)) for v in vips)
         for p in pools:
             p['vip_name'] = _get_vip(request, p, vip_dict,
                                      expand_name_only=True)
@@ -197,30 +217,52 @@ def _pool_get(request, pool_id, expand_resource=False):
         # so we need to handle the situation by showing a warning message here.
         # we can safely remove the try/except once the neutron bug is fixed
         # https://bugs.launchpad.net/neutron/+bug/1406854
-        try:
-            pool['subnet'] = neutron.subnet_get(request, pool['subnet_id'])
-        except Exception:
+        #
+        # The resources are independent, so are fetched concurrently, by up
+        # to LBAAS_POOL_EXPAND_MAX_WORKERS threads.  The warnings are added
+        # afterwards, since the request's messages aren't thread-safe.
+        vip_id = pool['vip_id']
+        calls = [
+            functools.partial(neutron.subnet_get, request, pool['subnet_id']),
+            (functools.partial(_vip_get, request, vip_id)
+             if vip_id is not None else lambda: None),
+            functools.partial(_member_list, request, expand_pool=False,
+                              pool_id=pool_id),
+        ]
+        calls.extend(functools.partial(_pool_health_monitor_get, request,
+                                       monitor_id, False)
+                     for monitor_id in pool['health_monitors'])
+        results = concurrency.fan_out(
+            calls,
+            max_workers=getattr(settings, 'LBAAS_POOL_EXPAND_MAX_WORKERS', 10))
+        subnet, vip, members = results[:3]
+
+        if subnet.failed:
             messages.warning(request, _("Unable to get subnet for pool "
                                         "%(pool)s.") % {"pool": pool_id})
-        pool['vip'] = _get_vip(request, pool, vip_dict=None,
-                               expand_name_only=False)
-        try:
-            pool['members'] = _member_list(request, expand_pool=False,
-                                           pool_id=pool_id)
-        except Exception:
+        else:
+            pool['subnet'] = subnet.value
+        if vip.failed:
+            messages.warning(request, _("Unable to get VIP for pool "
+                                        "%(pool)s.") % {"pool": pool_id})
+            pool['vip'] = Vip({'id': vip_id, 'name': ''})
+        else:
+            pool['vip'] = vip.value
+        if members.failed:
             messages.warning(request, _("Unable to get members for pool "
                                         "%(pool)s.") % {"pool": pool_id})
+        else:
+            pool['members'] = members.value
         monitors = []
-        for monitor_id in pool['health_monitors']:
-            try:
-                monitors.append(_pool_health_monitor_get(request, monitor_id,
-                                                         False))
-            except Exception:
+        for monitor_id, monitor in zip(pool['health_monitors'], results[3:]):
+            if monitor.failed:
                 messages.warning(request,
                                  _("Unable to get health monitor "
                                    "%(monitor_id)s for pool %(pool)s.")
                                  % {"pool": pool_id,
                                     "monitor_id": monitor_id})
+            else:
+                monitors.append(monitor.value)
         pool['health_monitors'] = monitors
     return Pool(pool)
 
@@ -37,6 +37,8 @@ from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
 from openstack_dashboard.api import nova
 from openstack_dashboard import policy
+from openstack_dashboard.utils import capabilities
+from openstack_dashboard.utils import concurrency
 
 
 LOG = logging.getLogger(__name__)
@@ -435,7 +437,8 @@ class FloatingIpManager(network_base.FloatingIpManager):
                                     and (p.device_id in gw_routers))])
         # we have to include any shared subnets as well because we may not
         # have permission to see the router interface to infer connectivity
-        shared = set([s.id for n in network_list(self.request, shared=True)
+        shared = set([s for n in network_list(self.request, shared=True,
+                                              expand_subnet=False)
                       for s in n.subnets])
         return reachable_subnets | shared
 
@@ -587,18 +590,55 @@ def list_resources_with_long_filters(list_method,
         return resources
 
 
-def network_list(request, **params):
-    LOG.debug("network_list(): params=%s", params)
-    networks = neutronclient(request).list_networks(**params).get('networks')
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
-    subnet_dict = dict([(s['id'], s) for s in subnets])
+def resource_count(request, resource, **params):
+    """Returns the number of resources of the given type matching the
+    given filters.
+
+    ``resource`` is the plural name used by the API, e.g. ``'networks'``
+    or ``'floatingips'``.  Only the IDs of the resources are requested,
+    so this is much cheaper than listing them.
+    """
+    LOG.debug("resource_count(): resource=%s, params=%s", resource, params)
+    params['fields'] = 'id'
+    list_method = getattr(neutronclient(request), 'list_%s' % resource)
+    return len(list_method(**params).get(resource))
+
+
+@memoized
+def _request_subnets(request):
+    """Returns a dict of the subnets already fetched while handling the
+    request, keyed by their IDs.
+    """
+    return {}
+
+
+def _expand_subnets(request, networks):
+    """Replaces the subnet IDs of each of the networks with the subnets.
+
+    Only the subnets referenced by the networks are fetched, and any fetched
+    earlier in the same request (e.g. by the other half of
+    network_list_for_tenant()) aren't fetched again.
+    """
+    subnet_dict = _request_subnets(request)
+    missing = sorted(set(s for n in networks for s in n.get('subnets', [])
+                         if s not in subnet_dict))
+    if missing:
+        subnets = list_resources_with_long_filters(subnet_list, 'id', missing,
+                                                   request=request)
+        subnet_dict.update((s.id, s) for s in subnets)
     # Expand subnet list from subnet_id to values.
     for n in networks:
         # Due to potential timing issues, we can't assume the subnet_dict data
         # is in sync with the network data.
         n['subnets'] = [subnet_dict[s] for s in n.get('subnets', []) if
                         s in subnet_dict]
+
+
+def network_list(request, expand_subnet=True, **params):
+    LOG.debug("network_list(): params=%s", params)
+    networks = neutronclient(request).list_networks(**params).get('networks')
+    if expand_subnet:
+        _expand_subnets(request, networks)
     return [Network(n) for n in networks]
 
 
@@ -607,6 +647,7 @@ def network_list_for_tenant(request, tenant_id, **params):
 
     The list contains networks owned by the tenant and public networks.
     If requested_networks specified, it searches requested_networks only.
+    Subnets referenced by both lists are only fetched once.
     """
     LOG.debug("network_list_for_tenant(): tenant_id=%s, params=%s"
               % (tenant_id, params))
@@ -711,12 +752,14 @@ def subnet_update(request, subnet_id, **kwargs):
     body = {'subnet': kwargs}
     subnet = neutronclient(request).update_subnet(subnet_id,
                                                   body=body).get('subnet')
+    _request_subnets(request).pop(subnet_id, None)
     return Subnet(subnet)
 
 
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s" % subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
+    _request_subnets(request).pop(subnet_id, None)
 
 
 def port_list(request, **params):
@@ -914,6 +957,25 @@ def list_dhcp_agent_hosting_networks(request, network, **params):
     return [Agent(a) for a in agents['agents']]
 
 
+def dhcp_agent_network_counts(request):
+    """Returns a dict mapping the ID of each network hosted by a DHCP agent
+    to the number of DHCP agents hosting it.
+
+    The DHCP agents are listed once and then the networks of each agent are
+    listed, at most ``NEUTRON_DHCP_AGENT_MAX_WORKERS`` agents at a time, so
+    the number of calls depends on the number of agents rather than the
+    number of networks.  Networks missing from the dict have no agents.
+    """
+    client = neutronclient(request)
+    agents = agent_list(request, agent_type='DHCP agent')
+    networks = concurrency.parallel_map(
+        lambda agent: client.list_networks_on_dhcp_agent(
+            agent.id, fields='id')['networks'],
+        agents,
+        max_workers=getattr(settings, 'NEUTRON_DHCP_AGENT_MAX_WORKERS', 10))
+    return collections.Counter(n['id'] for nets in networks for n in nets)
+
+
 def add_network_to_dhcp_agent(request, dhcp_agent, network_id):
     body = {'network_id': network_id}
     return neutronclient(request).add_network_to_dhcp_agent(dhcp_agent, body)
@@ -950,7 +1012,7 @@ def servers_update_addresses(request, servers, all_tenants=False):
             floating_ips = []
         networks = list_resources_with_long_filters(
             network_list, 'id', set([port.network_id for port in ports]),
-            request=request)
+            request=request, expand_subnet=False)
     except Exception:
         error_message = _('Unable to connect to Neutron.')
         LOG.error(error_message)
@@ -1018,8 +1080,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
     return dict(addresses)
 
 
-@memoized
-def list_extensions(request):
+def _fetch_extensions(request):
     extensions_list = neutronclient(request).list_extensions()
     if 'extensions' in extensions_list:
         return extensions_list['extensions']
@@ -1027,6 +1088,17 @@ def list_extensions(request):
         return {}
 
 
+_extensions = capabilities.Registry(
+    'neutron',
+    lambda request: capabilities.endpoint_for(request, 'network'),
+    _fetch_extensions)
+
+
+@memoized
+def list_extensions(request):
+    return _extensions.get(request)
+
+
 @memoized
 def is_extension_supported(request, extension_alias):
     extensions = list_extensions(request)
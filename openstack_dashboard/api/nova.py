@@ -20,19 +20,30 @@
 
 from __future__ import absolute_import
 
+import collections
+import functools
+import hashlib
 import logging
+import threading
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.functional import cached_property  # noqa
 from django.utils.translation import ugettext_lazy as _
 
+from keystoneclient.auth import token_endpoint
+from keystoneclient import session as ks_session
+from novaclient import client as nova_http
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import aggregates as nova_aggregates
 from novaclient.v2 import client as nova_client
 from novaclient.v2.contrib import instance_action as nova_instance_action
 from novaclient.v2.contrib import list_extensions as nova_list_extensions
 from novaclient.v2 import security_group_rules as nova_rules
 from novaclient.v2 import security_groups as nova_security_groups
 from novaclient.v2 import servers as nova_servers
+import requests
+import six
 
 from horizon import conf
 from horizon.utils import functions as utils
@@ -40,6 +51,8 @@ from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
+from openstack_dashboard.utils import capabilities
+from openstack_dashboard.utils import concurrency
 
 
 LOG = logging.getLogger(__name__)
@@ -50,6 +63,9 @@ INSTANCE_ACTIVE_STATE = 'ACTIVE'
 VOLUME_STATE_AVAILABLE = "available"
 DEFAULT_QUOTA_NAME = 'default'
 
+AGGREGATE_DETAILS_CACHE_PREFIX = 'nova-aggregate-details'
+HOST_OPERATION_CACHE_PREFIX = 'nova-host-operation'
+
 
 class VNCConsole(base.APIDictWrapper):
     """Wrapper for the "console" dictionary.
@@ -435,22 +451,132 @@ class FloatingIpManager(network_base.FloatingIpManager):
         return True
 
 
-@memoized
+class _ClientPoolStats(object):
+    """Counters for the pooled nova clients and their HTTP connections."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self._connections = _open_connections()
+
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @property
+    def connections(self):
+        """The number of HTTP connections opened since the last reset."""
+        return _open_connections() - self._connections
+
+    def as_dict(self):
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'connections': self.connections}
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session():
+    """Returns the HTTP session shared by all the pooled clients.
+
+    Its keep-alive connections to each compute endpoint are reused by
+    every client, whichever user it belongs to; the clients each bring
+    their own token.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
+            cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+            http = requests.Session()
+            for prefix in ('https://', 'http://'):
+                http.mount(prefix, nova_http.TCPKeepAliveAdapter())
+            _http_session = ks_session.Session(
+                verify=False if insecure else cacert or True,
+                session=http)
+        return _http_session
+
+
+def _open_connections():
+    """Returns the number of HTTP connections the shared session opened.
+
+    Only the connection pools the session still holds, one for each
+    endpoint it has recently used, are counted.
+    """
+    if _http_session is None:
+        return 0
+    count = 0
+    for adapter in _http_session.session.adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                count += pool.num_connections
+    return count
+
+
+client_pool_stats = _ClientPoolStats()
+_client_pool = collections.OrderedDict()
+_client_pool_lock = threading.Lock()
+
+
+def _create_novaclient(request, management_url):
+    token_id = request.user.token.id
+    return nova_client.Client(request.user.username,
+                              token_id,
+                              project_id=request.user.tenant_id,
+                              auth_url=management_url,
+                              http_log_debug=settings.DEBUG,
+                              session=_get_http_session(),
+                              auth=token_endpoint.Token(management_url,
+                                                        token_id))
+
+
 def novaclient(request):
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    c = nova_client.Client(request.user.username,
-                           request.user.token.id,
-                           project_id=request.user.tenant_id,
-                           auth_url=base.url_for(request, 'compute'),
-                           insecure=insecure,
-                           cacert=cacert,
-                           http_log_debug=settings.DEBUG)
-    c.client.auth_token = request.user.token.id
-    c.client.management_url = base.url_for(request, 'compute')
+    """Returns a nova client for the request's token.
+
+    Clients are kept in a process-wide pool, keyed by the token, endpoint
+    and region, holding up to ``NOVA_CLIENT_POOL_SIZE`` of the most recently
+    used ones.  Their HTTP connections are kept alive and shared between
+    all the clients for an endpoint.  The counters in
+    ``client_pool_stats`` record how often a pooled client is reused and
+    how many connections have been opened.
+    """
+    management_url = base.url_for(request, 'compute')
+    key = (request.user.token.id, management_url,
+           getattr(request.user, 'services_region', None))
+    with _client_pool_lock:
+        c = _client_pool.pop(key, None)
+        if c is not None:
+            _client_pool[key] = c
+    if c is not None:
+        client_pool_stats.increment('hits')
+        return c
+
+    client_pool_stats.increment('misses')
+    c = _create_novaclient(request, management_url)
+    size = getattr(settings, 'NOVA_CLIENT_POOL_SIZE', 100)
+    with _client_pool_lock:
+        c = _client_pool.setdefault(key, c)
+        while len(_client_pool) > size:
+            _client_pool.popitem(last=False)
     return c
 
 
+def clear_client_pool():
+    """Discards all the pooled clients."""
+    with _client_pool_lock:
+        _client_pool.clear()
+
+
 def server_vnc_console(request, instance_id, console_type='novnc'):
     return VNCConsole(novaclient(request).servers.get_vnc_console(
         instance_id, console_type)['console'])
@@ -753,14 +879,53 @@ def instance_volume_detach(request, instance_id, att_id):
                                                             att_id)
 
 
+def _names_by_id(ids, list_func, get_func):
+    """Returns a dict mapping each of the given resource IDs to its name.
+
+    When there's more than one ID they're looked up in the result of a single
+    call to ``list_func``, if given, and only those missing from it (such as
+    resources belonging to other projects) are retrieved with ``get_func``,
+    up to ``NAME_LOOKUP_MAX_WORKERS`` at a time.  Exceptions raised by
+    ``get_func`` are propagated.
+    """
+    ids = set(ids)
+    names = {}
+    if list_func is not None and len(ids) > 1:
+        try:
+            names = dict((r.id, r.name) for r in list_func() if r.id in ids)
+        except Exception:
+            LOG.info("Unable to list resources to look up their names, "
+                     "retrieving them individually instead.", exc_info=True)
+    missing = [obj_id for obj_id in ids if obj_id not in names]
+    resources = concurrency.parallel_map(
+        get_func, missing,
+        max_workers=getattr(settings, 'NAME_LOOKUP_MAX_WORKERS', 10))
+    for obj_id, resource in zip(missing, resources):
+        names[obj_id] = resource.name
+    return names
+
+
+def server_names(request, server_ids):
+    """Returns a dict mapping each of the given server IDs to its name."""
+    return _names_by_id(server_ids,
+                        lambda: server_list(request)[0],
+                        lambda server_id: server_get(request, server_id))
+
+
 def instance_volumes_list(request, instance_id):
     from openstack_dashboard.api import cinder
 
     volumes = novaclient(request).volumes.get_server_volumes(instance_id)
 
+    # Cinder can't filter its volume list by ID, and the project may have
+    # far more volumes than are attached to the instance, so only the
+    # attached volumes are retrieved (concurrently).
+    c = cinder.cinderclient(request)
+    names = _names_by_id(
+        [volume.id for volume in volumes], None,
+        lambda volume_id: cinder.Volume(c.volumes.get(volume_id)))
     for volume in volumes:
-        volume_data = cinder.cinderclient(request).volumes.get(volume.id)
-        volume.name = cinder.Volume(volume_data).name
+        volume.name = names[volume.id]
 
     return volumes
 
@@ -777,70 +942,159 @@ def hypervisor_search(request, query, servers=True):
     return novaclient(request).hypervisors.search(query, servers)
 
 
-def evacuate_host(request, host, target=None, on_shared_storage=False):
-    # TODO(jmolle) This should be change for nova atomic api host_evacuate
-    hypervisors = novaclient(request).hypervisors.search(host, True)
-    response = []
-    err_code = None
-    for hypervisor in hypervisors:
-        hyper = Hypervisor(hypervisor)
-        # if hypervisor doesn't have servers, the attribute is not present
-        for server in hyper.servers:
+class HostOperation(object):
+    """Tracks the progress of an operation (such as an evacuation) on each
+    of the instances on a compute host.
+
+    The progress is kept in the Django cache, for up to
+    ``NOVA_HOST_OPERATION_TTL`` seconds, where it can be retrieved with
+    :func:`host_operations_get` by any request while the operation is
+    running.
+    """
+    PENDING = 'pending'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+    def __init__(self, request, action, host, servers):
+        self.key = _host_operation_cache_key(request, host)
+        self.action = action
+        self.host = host
+        self.instances = collections.OrderedDict(
+            (server['uuid'], {'name': server['name'],
+                              'status': self.PENDING,
+                              'message': None})
+            for server in servers)
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def to_dict(self):
+        return {'action': self.action,
+                'host': self.host,
+                'finished': self.finished,
+                'instances': [dict(info, id=uuid)
+                              for uuid, info in self.instances.items()]}
+
+    def save(self):
+        with self._lock:
+            cache.set(self.key, self.to_dict(),
+                      getattr(settings, 'NOVA_HOST_OPERATION_TTL', 3600))
+
+    def record(self, uuid, error=None):
+        with self._lock:
+            self.instances[uuid].update(
+                status=self.FAILED if error else self.SUCCEEDED,
+                message=error and six.text_type(error))
+        self.save()
+
+    def run(self, func):
+        """Calls ``func`` with the ID of each instance, up to
+        ``NOVA_HOST_OPERATION_MAX_WORKERS`` at a time, and returns the
+        :class:`~openstack_dashboard.utils.concurrency.CallResult` of each.
+        """
+        def call(uuid):
             try:
-                novaclient(request).servers.evacuate(server['uuid'],
-                                                     target,
-                                                     on_shared_storage)
-            except nova_exceptions.ClientException as err:
-                err_code = err.code
-                msg = _("Name: %(name)s ID: %(uuid)s")
-                msg = msg % {'name': server['name'], 'uuid': server['uuid']}
-                response.append(msg)
+                func(uuid)
+            except Exception as error:
+                self.record(uuid, error)
+                raise
+            self.record(uuid)
 
-    if err_code:
-        msg = _('Failed to evacuate instances: %s') % ', '.join(response)
-        raise nova_exceptions.ClientException(err_code, msg)
+        try:
+            return concurrency.fan_out(
+                [functools.partial(call, uuid) for uuid in self.instances],
+                max_workers=getattr(settings,
+                                    'NOVA_HOST_OPERATION_MAX_WORKERS', 10))
+        finally:
+            self.finished = True
+            self.save()
 
-    return True
 
+def _host_operation_cache_key(request, host):
+    endpoint = base.url_for(request, 'compute')
+    return '%s:%s:%s' % (HOST_OPERATION_CACHE_PREFIX,
+                         hashlib.md5(endpoint.encode('utf-8')).hexdigest(),
+                         host)
 
-def migrate_host(request, host, live_migrate=False, disk_over_commit=False,
-                 block_migration=False):
+
+def host_operations_get(request, hosts):
+    """Returns a dict mapping each of the given hosts that has been evacuated
+    or migrated recently to the progress of its latest operation, as a dict.
+    """
+    keys = dict((_host_operation_cache_key(request, host), host)
+                for host in hosts)
+    return dict((keys[key], operation)
+                for key, operation in cache.get_many(keys.keys()).items())
+
+
+def _host_operation(request, action, host, func, failure_message):
     hypervisors = novaclient(request).hypervisors.search(host, True)
+    servers = [server for hypervisor in hypervisors
+               for server in Hypervisor(hypervisor).servers]
+    operation = HostOperation(request, action, host, servers)
+    operation.save()
+
     response = []
     err_code = None
-    for hyper in hypervisors:
-        for server in getattr(hyper, "servers", []):
-            try:
-                if live_migrate:
-                    instance = server_get(request, server['uuid'])
-
-                    # Checking that instance can be live-migrated
-                    if instance.status in ["ACTIVE", "PAUSED"]:
-                        novaclient(request).servers.live_migrate(
-                            server['uuid'],
-                            None,
-                            block_migration,
-                            disk_over_commit
-                        )
-                    else:
-                        novaclient(request).servers.migrate(server['uuid'])
-                else:
-                    novaclient(request).servers.migrate(server['uuid'])
-            except nova_exceptions.ClientException as err:
-                err_code = err.code
-                msg = _("Name: %(name)s ID: %(uuid)s")
-                msg = msg % {'name': server['name'], 'uuid': server['uuid']}
-                response.append(msg)
+    for server, result in zip(servers, operation.run(func)):
+        if isinstance(result.exception, nova_exceptions.ClientException):
+            err_code = result.exception.code
+            msg = _("Name: %(name)s ID: %(uuid)s")
+            msg = msg % {'name': server['name'], 'uuid': server['uuid']}
+            response.append(msg)
+        else:
+            result.get()
 
     if err_code:
-        msg = _('Failed to migrate instances: %s') % ', '.join(response)
+        msg = failure_message % ', '.join(response)
         raise nova_exceptions.ClientException(err_code, msg)
 
     return True
 
 
-def tenant_absolute_limits(request, reserved=False):
-    limits = novaclient(request).limits.get(reserved=reserved).absolute
+def evacuate_host(request, host, target=None, on_shared_storage=False):
+    """Evacuates all the instances on the host, several at a time.
+
+    This returns once every instance has been dealt with, raising an
+    exception naming any that couldn't be.  Meanwhile the progress can be
+    followed by other requests with :func:`host_operations_get`.
+    """
+    # TODO(jmolle) This should be change for nova atomic api host_evacuate
+    def evacuate(uuid):
+        novaclient(request).servers.evacuate(uuid, target, on_shared_storage)
+
+    return _host_operation(request, 'evacuate', host, evacuate,
+                           _('Failed to evacuate instances: %s'))
+
+
+def migrate_host(request, host, live_migrate=False, disk_over_commit=False,
+                 block_migration=False):
+    """Migrates all the instances off the host, several at a time, as for
+    :func:`evacuate_host`.
+    """
+    def migrate(uuid):
+        if live_migrate:
+            instance = server_get(request, uuid)
+
+            # Checking that instance can be live-migrated
+            if instance.status in ["ACTIVE", "PAUSED"]:
+                novaclient(request).servers.live_migrate(
+                    uuid,
+                    None,
+                    block_migration,
+                    disk_over_commit
+                )
+                return
+        novaclient(request).servers.migrate(uuid)
+
+    return _host_operation(request, 'migrate', host, migrate,
+                           _('Failed to migrate instances: %s'))
+
+
+def tenant_absolute_limits(request, reserved=False, tenant_id=None):
+    # Only admins may ask for the limits of another tenant.
+    kwargs = {'tenant_id': tenant_id} if tenant_id else {}
+    limits = novaclient(request).limits.get(reserved=reserved,
+                                            **kwargs).absolute
     limits_dict = {}
     for limit in limits:
         if limit.value < 0:
@@ -877,20 +1131,57 @@ def service_disable(request, host, binary, reason=None):
         return novaclient(request).services.disable(host, binary)
 
 
+def _aggregate_details_cache_key(request):
+    endpoint = base.url_for(request, 'compute')
+    return '%s:%s' % (AGGREGATE_DETAILS_CACHE_PREFIX,
+                      hashlib.md5(endpoint.encode('utf-8')).hexdigest())
+
+
+def invalidate_aggregate_details(request):
+    """Discards the cached aggregate details, after a change to any
+    aggregate.
+    """
+    cache.delete(_aggregate_details_cache_key(request))
+
+
 def aggregate_details_list(request):
-    result = []
+    """Returns the details of all the host aggregates.
+
+    The details of each aggregate are fetched concurrently, by up to
+    ``NOVA_AGGREGATE_DETAILS_MAX_WORKERS`` threads, and are kept in the
+    Django cache for ``NOVA_AGGREGATE_DETAILS_CACHE_TTL`` seconds, shared
+    with every other (admin) request to the same compute endpoint.
+    """
     c = novaclient(request)
-    for aggregate in c.aggregates.list():
-        result.append(c.aggregates.get_details(aggregate.id))
+    key = _aggregate_details_cache_key(request)
+    cached = cache.get(key)
+    if cached is not None:
+        return [nova_aggregates.Aggregate(c.aggregates, info, loaded=True)
+                for info in cached]
+
+    result = concurrency.parallel_map(
+        lambda aggregate: c.aggregates.get_details(aggregate.id),
+        c.aggregates.list(),
+        max_workers=getattr(settings, 'NOVA_AGGREGATE_DETAILS_MAX_WORKERS',
+                            10))
+    ttl = getattr(settings, 'NOVA_AGGREGATE_DETAILS_CACHE_TTL', 30)
+    if ttl:
+        # The resources hold a reference to the client, so only their
+        # attributes are cached.
+        cache.set(key, [aggregate._info for aggregate in result], ttl)
     return result
 
 
 def aggregate_create(request, name, availability_zone=None):
-    return novaclient(request).aggregates.create(name, availability_zone)
+    result = novaclient(request).aggregates.create(name, availability_zone)
+    invalidate_aggregate_details(request)
+    return result
 
 
 def aggregate_delete(request, aggregate_id):
-    return novaclient(request).aggregates.delete(aggregate_id)
+    result = novaclient(request).aggregates.delete(aggregate_id)
+    invalidate_aggregate_details(request)
+    return result
 
 
 def aggregate_get(request, aggregate_id):
@@ -898,11 +1189,16 @@ def aggregate_get(request, aggregate_id):
 
 
 def aggregate_update(request, aggregate_id, values):
-    return novaclient(request).aggregates.update(aggregate_id, values)
+    result = novaclient(request).aggregates.update(aggregate_id, values)
+    invalidate_aggregate_details(request)
+    return result
 
 
 def aggregate_set_metadata(request, aggregate_id, metadata):
-    return novaclient(request).aggregates.set_metadata(aggregate_id, metadata)
+    result = novaclient(request).aggregates.set_metadata(aggregate_id,
+                                                         metadata)
+    invalidate_aggregate_details(request)
+    return result
 
 
 def host_list(request):
@@ -910,11 +1206,25 @@ def host_list(request):
 
 
 def add_host_to_aggregate(request, aggregate_id, host):
-    return novaclient(request).aggregates.add_host(aggregate_id, host)
+    result = novaclient(request).aggregates.add_host(aggregate_id, host)
+    invalidate_aggregate_details(request)
+    return result
 
 
 def remove_host_from_aggregate(request, aggregate_id, host):
-    return novaclient(request).aggregates.remove_host(aggregate_id, host)
+    result = novaclient(request).aggregates.remove_host(aggregate_id, host)
+    invalidate_aggregate_details(request)
+    return result
+
+
+# The resources hold a reference to the client, so only their attributes
+# are kept.
+_extensions = capabilities.Registry(
+    'nova',
+    lambda request: capabilities.endpoint_for(request, 'compute'),
+    lambda request: [
+        extension._info for extension in
+        nova_list_extensions.ListExtManager(novaclient(request)).show_all()])
 
 
 @memoized
@@ -924,9 +1234,9 @@ def list_extensions(request):
     blacklist = set(getattr(settings,
                             'OPENSTACK_NOVA_EXTENSIONS_BLACKLIST', []))
     return [
-        extension for extension in
-        nova_list_extensions.ListExtManager(novaclient(request)).show_all()
-        if extension.name not in blacklist
+        nova_list_extensions.ListExtResource(None, info, loaded=True)
+        for info in _extensions.get(request)
+        if info['name'] not in blacklist
     ]
 
 
@@ -19,6 +19,7 @@ from django.views import generic
 
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import utils as rest_utils
+from openstack_dashboard.utils import identity
 
 from openstack_dashboard.api.rest import urls
 
@@ -79,6 +80,7 @@ class Users(generic.View):
             enabled=True,
             domain=domain.id
         )
+        identity.users.forget(request)
 
         # assign role to user
         api.keystone.add_tenant_user_role(
@@ -105,6 +107,7 @@ class Users(generic.View):
         for user_id in request.DATA:
             if user_id != request.user.id:
                 api.keystone.user_delete(request, user_id)
+        identity.users.forget(request)
 
 
 @urls.register
@@ -133,6 +136,7 @@ class User(generic.View):
         if id == 'current':
             raise django.http.HttpResponseNotFound('current')
         api.keystone.user_delete(request, id)
+        identity.users.forget(request)
 
     @rest_utils.ajax(data_required=True)
     def patch(self, request, id):
@@ -158,12 +162,14 @@ class User(generic.View):
         elif 'enabled' in keys:
             enabled = request.DATA['enabled']
             api.keystone.user_update_enabled(request, user, enabled)
+            identity.users.forget(request)
 
         else:
             # note that project is actually project_id
             # but we can not rename due to legacy compatibility
             # refer to keystone.api user_update method
             api.keystone.user_update(request, user, **request.DATA)
+            identity.users.forget(request)
 
 
 @urls.register
@@ -440,6 +446,7 @@ class Projects(generic.View):
             kwargs.pop('name'),
             **kwargs
         )
+        identity.projects.forget(request)
         return rest_utils.CreatedResponse(
             '/api/keystone/projects/%s' % new_project.id,
             new_project.to_dict()
@@ -456,6 +463,7 @@ class Projects(generic.View):
         """
         for id in request.DATA:
             api.keystone.tenant_delete(request, id)
+        identity.projects.forget(request)
 
 
 @urls.register
@@ -481,6 +489,7 @@ class Project(generic.View):
         This method returns HTTP 204 (no content) on success.
         """
         api.keystone.tenant_delete(request, id)
+        identity.projects.forget(request)
 
     @rest_utils.ajax(data_required=True)
     def patch(self, request, id):
@@ -496,6 +505,7 @@ class Project(generic.View):
         """
         kwargs = _tenant_kwargs_from_DATA(request.DATA, enabled=None)
         api.keystone.tenant_update(request, id, **kwargs)
+        identity.projects.forget(request)
 
 
 @urls.register
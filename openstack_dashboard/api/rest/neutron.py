@@ -21,6 +21,7 @@ from openstack_dashboard import api
 from openstack_dashboard.api.rest import utils as rest_utils
 
 from openstack_dashboard.api.rest import urls
+from openstack_dashboard.usage import quotas
 
 
 @urls.register
@@ -64,6 +65,7 @@ class Networks(generic.View):
         if not api.neutron.is_port_profiles_supported():
             request.DATA.pop("net_profile_id", None)
         new_network = api.neutron.network_create(request, **request.DATA)
+        quotas.invalidate_tenant_quota_usages(request, new_network.tenant_id)
         return rest_utils.CreatedResponse(
             '/api/neutron/networks/%s' % new_network.id,
             new_network.to_dict()
@@ -110,6 +112,7 @@ class Subnets(generic.View):
 
         """
         new_subnet = api.neutron.subnet_create(request, **request.DATA)
+        quotas.invalidate_tenant_quota_usages(request, new_subnet.tenant_id)
         return rest_utils.CreatedResponse(
             '/api/neutron/subnets/%s' % new_subnet.id,
             new_subnet.to_dict()
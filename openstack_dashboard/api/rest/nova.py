@@ -21,6 +21,7 @@ from django.views import generic
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
+from openstack_dashboard.usage import quotas
 
 
 @urls.register
@@ -56,6 +57,7 @@ class Keypairs(generic.View):
                                           request.DATA['public_key'])
         else:
             new = api.nova.keypair_create(request, request.DATA['name'])
+        quotas.invalidate_tenant_quota_usages(request)
         return rest_utils.CreatedResponse(
             '/api/nova/keypairs/%s' % utils_http.urlquote(new.name),
             new.to_dict()
@@ -168,6 +170,7 @@ class Servers(generic.View):
                 kw[name] = request.DATA[name]
 
         new = api.nova.server_create(*args, **kw)
+        quotas.invalidate_tenant_quota_usages(request)
         return rest_utils.CreatedResponse(
             '/api/nova/servers/%s' % utils_http.urlquote(new.id),
             new.to_dict()
@@ -14,6 +14,7 @@ from django.template import defaultfilters as filters
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ungettext_lazy
 
+from horizon import exceptions
 from horizon import tables
 from horizon.utils import filters as utils_filters
 
@@ -113,6 +114,73 @@ class MigrateMaintenanceHost(tables.LinkAction):
         return service.status == "disabled"
 
 
+def set_host_operations(request, services):
+    """Adds the progress of any recent evacuation or migration of each
+    host to its service.
+    """
+    operations = api.nova.host_operations_get(
+        request, [service.host for service in services])
+    for service in services:
+        service.operation = operations.get(service.host)
+
+
+class UpdateRow(tables.Row):
+    ajax = True
+
+    def get_data(self, request, host):
+        for service in api.nova.service_list(request, binary='nova-compute'):
+            if service.host == host:
+                set_host_operations(request, [service])
+                return service
+        raise exceptions.NotFound()
+
+
+OPERATION_ACTIONS = {
+    'evacuate': _("Evacuation"),
+    'migrate': _("Migration"),
+}
+
+
+OPERATION_STATUS_CHOICES = (
+    ("none", True),
+    ("finished", True),
+    ("failed", False),
+    ("running", None),
+)
+
+
+def get_operation_status(service):
+    operation = getattr(service, 'operation', None)
+    if not operation:
+        return "none"
+    if not operation['finished']:
+        return "running"
+    if any(instance['status'] == api.nova.HostOperation.FAILED
+           for instance in operation['instances']):
+        return "failed"
+    return "finished"
+
+
+def get_operation_progress(service):
+    operation = getattr(service, 'operation', None)
+    if not operation:
+        return None
+    instances = operation['instances']
+    failed = [instance['name'] for instance in instances
+              if instance['status'] == api.nova.HostOperation.FAILED]
+    done = [instance for instance in instances
+            if instance['status'] != api.nova.HostOperation.PENDING]
+    vals = {'action': OPERATION_ACTIONS.get(operation['action'],
+                                            operation['action']),
+            'done': len(done),
+            'total': len(instances),
+            'failed': ", ".join(failed)}
+    if failed:
+        return _("%(action)s: %(done)s of %(total)s instances done, "
+                 "failed: %(failed)s") % vals
+    return _("%(action)s: %(done)s of %(total)s instances done") % vals
+
+
 class ComputeHostFilterAction(tables.FilterAction):
     def filter(self, table, services, filter_string):
         q = filter_string.lower()
@@ -129,6 +197,13 @@ class ComputeHostTable(tables.DataTable):
                                verbose_name=_('Updated At'),
                                filters=(utils_filters.parse_isotime,
                                         filters.timesince))
+    operation = tables.Column(get_operation_progress,
+                              verbose_name=_('Instance Operations'),
+                              empty_value="-")
+    operation_status = tables.Column(get_operation_status,
+                                     hidden=True,
+                                     status=True,
+                                     status_choices=OPERATION_STATUS_CHOICES)
 
     def get_object_id(self, obj):
         return obj.host
@@ -141,6 +216,8 @@ class ComputeHostTable(tables.DataTable):
         verbose_name = _("Compute Host")
         table_actions = (ComputeHostFilterAction,)
         multi_select = False
+        status_columns = ["operation_status"]
+        row_class = UpdateRow
         row_actions = (
             EvacuateHost,
             DisableService,
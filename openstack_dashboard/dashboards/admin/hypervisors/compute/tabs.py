@@ -28,8 +28,10 @@ class ComputeHostTab(tabs.TableTab):
     def get_compute_host_data(self):
         try:
             services = nova.service_list(self.tab_group.request)
-            return [service for service in services
-                    if service.binary == 'nova-compute']
+            services = [service for service in services
+                        if service.binary == 'nova-compute']
+            tables.set_host_operations(self.tab_group.request, services)
+            return services
         except Exception:
             msg = _('Unable to get nova services list.')
             exceptions.handle(self.tab_group.request, msg)
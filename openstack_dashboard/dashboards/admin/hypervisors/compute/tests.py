@@ -12,6 +12,7 @@
 
 from django.core.urlresolvers import reverse
 from django import http
+from django.utils.http import urlencode
 from mox import IsA  # noqa
 
 from openstack_dashboard import api
@@ -252,3 +253,36 @@ class DisableServiceViewTest(test.BaseAdminViewTests):
         dest_url = reverse('horizon:admin:hypervisors:index')
         self.assertMessageCount(error=1)
         self.assertRedirectsNoFollow(res, dest_url)
+
+
+class ComputeHostTableTest(test.BaseAdminViewTests):
+    @test.create_stubs({api.nova: ('service_list',
+                                   'host_operations_get',
+                                   'extension_supported')})
+    def test_row_update_operation_progress(self):
+        service = [service for service in self.services.list()
+                   if service.binary == 'nova-compute'][0]
+        operation = {'action': 'evacuate',
+                     'host': service.host,
+                     'finished': False,
+                     'instances': [{'id': '1', 'name': 'server_1',
+                                    'status': 'succeeded', 'message': None},
+                                   {'id': '2', 'name': 'server_2',
+                                    'status': 'pending', 'message': None}]}
+        api.nova.service_list(IsA(http.HttpRequest),
+                              binary='nova-compute').AndReturn([service])
+        api.nova.host_operations_get(IsA(http.HttpRequest), [service.host]) \
+            .AndReturn({service.host: operation})
+        api.nova.extension_supported('AdminActions',
+                                     IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        self.mox.ReplayAll()
+
+        url = "%s?%s" % (reverse('horizon:admin:hypervisors:index'),
+                         urlencode({'action': 'row_update',
+                                    'table': 'compute_host',
+                                    'obj_id': service.host}))
+        res = self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertContains(res, 'Evacuation: 1 of 2 instances done')
+        # The row keeps being updated until the operation has finished.
+        self.assertContains(res, 'status_unknown')
@@ -9,14 +9,17 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import collections
 import json
 
 from django.core.urlresolvers import reverse
 from django import http
 
+from mox import IgnoreArg  # noqa
 from mox import IsA  # noqa
 
 from openstack_dashboard import api
+from openstack_dashboard.dashboards.admin.metering import views
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.test.test_data import utils as test_utils
 
@@ -24,6 +27,9 @@ from openstack_dashboard.test.test_data import utils as test_utils
 INDEX_URL = reverse('horizon:admin:metering:index')
 CREATE_URL = reverse('horizon:admin:metering:create')
 SAMPLES_URL = reverse('horizon:admin:metering:samples')
+CSV_URL = reverse('horizon:admin:metering:csvreport')
+
+FakeMeter = collections.namedtuple('FakeMeter', 'name description unit')
 
 
 class MeteringViewTests(test.BaseAdminViewTests):
@@ -54,6 +60,55 @@ class MeteringViewTests(test.BaseAdminViewTests):
         self.assertFormError(res, "form", "date_from",
                              ['Must specify start of period'])
 
+    def _stub_report_meters(self):
+        meters = [(FakeMeter('cpu', 'CPU time', 'ns'), 'Nova'),
+                  (FakeMeter('image', 'Image', 'image'), 'Glance')]
+        self.mox.StubOutWithMock(views, '_report_meters')
+        self.mox.StubOutWithMock(views, '_meter_rows')
+        views._report_meters(IsA(http.HttpRequest), IgnoreArg(),
+                             IgnoreArg()).AndReturn(('aggregates', meters))
+        return meters
+
+    def test_csv_report_meter_error(self):
+        meters = self._stub_report_meters()
+        views._meter_rows('aggregates', *meters[0]).AndReturn([
+            {"name": 'none', "project": 'project1', "meter": 'cpu',
+             "description": 'CPU time', "service": 'Nova',
+             "time": '2015-01-01T00:00:00', "value": 1.5, "unit": 'ns'}])
+        views._meter_rows('aggregates', *meters[1]) \
+            .AndRaise(self.exceptions.ceilometer)
+        self.mox.ReplayAll()
+
+        # The test client replaces the response's context, which the
+        # streaming renderer reads its rows from, so call the view directly.
+        res = views.CsvReportView.as_view()(self.factory.get(CSV_URL))
+        content = ''.join(res.streaming_content)
+        self.assertEqual(200, res.status_code)
+        self.assertIn('project1,cpu,CPU time,Nova', content)
+        self.assertIn('image,Unable to retrieve usage data.,Glance', content)
+
+    def test_csv_report_first_meter_error(self):
+        meters = self._stub_report_meters()
+        views._meter_rows('aggregates', *meters[0]) \
+            .AndRaise(self.exceptions.keystone)
+        self.mox.ReplayAll()
+
+        res = self.client.get(CSV_URL)
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+
+    def test_csv_report_invalid_dates(self):
+        # The dates are rejected before any usage data is retrieved.
+        self.mox.StubOutWithMock(views, '_report_meters')
+        self.mox.ReplayAll()
+
+        for query in ({'date_options': 'week'},
+                      {'date_options': 'other', 'date_from': '2014-13-01'},
+                      {'date_options': 'other', 'date_to': '2014-01-01'},
+                      {'date_options': 'other', 'date_from': '2014-02-02',
+                       'date_to': '2014-01-01'}):
+            res = self.client.get(CSV_URL, query)
+            self.assertEqual(400, res.status_code, query)
+
 
 class MeteringLineChartTabTests(test.BaseAdminViewTests):
     def setUp(self):
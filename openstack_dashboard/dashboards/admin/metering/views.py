@@ -10,16 +10,21 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import itertools
 import json
 import logging
 
+from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.http import HttpResponse  # noqa
+from django.http import HttpResponseBadRequest  # noqa
 from django.utils.translation import ugettext_lazy as _
 import django.views
+import six
 
 from horizon import exceptions
 from horizon import forms
+from horizon import messages
 from horizon import tabs
 from horizon.utils import csvbase
 
@@ -92,7 +97,22 @@ class CsvReportView(django.views.generic.View):
     def get(self, request, **response_kwargs):
         render_class = ReportCsvRenderer
         response_kwargs.setdefault("filename", "usage.csv")
-        context = {'usage': load_report_data(request)}
+        # The dates are checked before the response starts streaming, as
+        # an error can't be reported once it has.
+        try:
+            date_from, date_to = _report_dates(request)
+        except ValueError as e:
+            return HttpResponseBadRequest(six.text_type(e),
+                                          content_type='text/plain')
+        # The rows are generated as the response is sent, so that the report
+        # doesn't have to be held in memory.
+        try:
+            usage = iter_report_data(request, date_from, date_to)
+        except Exception:
+            exceptions.handle(request,
+                              _('Unable to retrieve usage data.'),
+                              redirect=reverse('horizon:admin:metering:index'))
+        context = {'usage': usage}
         resp = render_class(request=request,
                             template=None,
                             context=context,
@@ -101,25 +121,43 @@ class CsvReportView(django.views.generic.View):
         return resp
 
 
-class ReportCsvRenderer(csvbase.BaseCsvResponse):
+class ReportCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Project Name"), _("Meter"), _("Description"),
                _("Service"), _("Time"), _("Value (Avg)"), _("Unit")]
 
     def get_row_data(self):
 
-        for p in self.context['usage'].values():
-            for u in p:
-                yield (u["project"],
-                       u["meter"],
-                       u["description"],
-                       u["service"],
-                       u["time"],
-                       u["value"],
-                       u["unit"])
+        for u in self.context['usage']:
+            yield (u["project"],
+                   u["meter"],
+                   u["description"],
+                   u["service"],
+                   u["time"],
+                   u["value"],
+                   u["unit"])
 
 
-def load_report_data(request):
+def _report_dates(request):
+    """Returns the start and end of the report's period, as given by the
+    request's query, or raises ValueError if they aren't valid.
+    """
+    date_options = request.GET.get('date_options', 7)
+    date_from = request.GET.get('date_from')
+    date_to = request.GET.get('date_to')
+    if date_options == 'other' and not date_from:
+        raise ValueError(_('Must specify start of period'))
+    date_from, date_to = metering_utils.calc_date_args(date_from, date_to,
+                                                       date_options)
+    if date_from > date_to:
+        raise ValueError(_('Start must be earlier than end of period.'))
+    return date_from, date_to
+
+
+def _report_meters(request, date_from, date_to):
+    """Returns the project aggregates query and the (meter, service) pairs
+    of the usage report.
+    """
     meters = ceilometer.Meters(request)
     services = {
         _('Nova'): meters.list_nova(),
@@ -130,45 +168,92 @@ def load_report_data(request):
         _('Kwapi'): meters.list_kwapi(),
         _('IPMI'): meters.list_ipmi(),
     }
-    project_rows = {}
-    date_options = request.GET.get('date_options', 7)
-    date_from = request.GET.get('date_from')
-    date_to = request.GET.get('date_to')
-    try:
-        date_from, date_to = metering_utils.calc_date_args(date_from,
-                                                           date_to,
-                                                           date_options)
-    except Exception:
-        exceptions.handle(request, _('Dates cannot be recognized.'))
-    try:
-        project_aggregates = metering_utils.ProjectAggregatesQuery(request,
-                                                                   date_from,
-                                                                   date_to,
-                                                                   3600 * 24)
-    except Exception:
-        exceptions.handle(request,
-                          _('Unable to retrieve project list.'))
+    project_aggregates = metering_utils.ProjectAggregatesQuery(request,
+                                                               date_from,
+                                                               date_to,
+                                                               3600 * 24)
+    report_meters = []
     for meter in meters._cached_meters.values():
         service = None
         for name, m_list in services.items():
             if meter in m_list:
                 service = name
                 break
-        res, unit = project_aggregates.query(meter.name)
-        for r in res:
-            values = r.get_meter(meter.name.replace(".", "_"))
-            if values:
-                for value in values:
-                    row = {"name": 'none',
-                           "project": r.id,
-                           "meter": meter.name,
-                           "description": meter.description,
-                           "service": service,
-                           "time": value._apiresource.period_end,
-                           "value": value._apiresource.avg,
-                           "unit": meter.unit}
-                    if r.id not in project_rows:
-                        project_rows[r.id] = [row]
-                    else:
-                        project_rows[r.id].append(row)
+        report_meters.append((meter, service))
+    return project_aggregates, report_meters
+
+
+def _meter_rows(project_aggregates, meter, service):
+    """Returns the rows of the usage report for a single meter."""
+    rows = []
+    res, unit = project_aggregates.query(meter.name)
+    for r in res:
+        values = r.get_meter(meter.name.replace(".", "_"))
+        if values:
+            for value in values:
+                rows.append({"name": 'none',
+                             "project": r.id,
+                             "meter": meter.name,
+                             "description": meter.description,
+                             "service": service,
+                             "time": value._apiresource.period_end,
+                             "value": value._apiresource.avg,
+                             "unit": meter.unit})
+    return rows
+
+
+def iter_report_data(request, date_from, date_to):
+    """Returns an iterator over the rows of the usage report.
+
+    The rows are fetched one meter at a time as they are consumed, except
+    for the first meter, which is fetched straight away so that errors are
+    raised to the caller before a response has started streaming.  Errors
+    for the later meters are logged and reported as a row of their own.
+    """
+    project_aggregates, report_meters = _report_meters(request, date_from,
+                                                       date_to)
+    if not report_meters:
+        return iter([])
+    first_rows = _meter_rows(project_aggregates, *report_meters[0])
+    return itertools.chain(first_rows,
+                           _iter_meter_rows(project_aggregates,
+                                            report_meters[1:]))
+
+
+def _iter_meter_rows(project_aggregates, report_meters):
+    for meter, service in report_meters:
+        try:
+            rows = _meter_rows(project_aggregates, meter, service)
+        except Exception:
+            LOG.exception("Unable to retrieve usage data for meter %s.",
+                          meter.name)
+            rows = [{"name": 'none',
+                     "project": '',
+                     "meter": meter.name,
+                     "description": _("Unable to retrieve usage data."),
+                     "service": service,
+                     "time": '',
+                     "value": '',
+                     "unit": meter.unit}]
+        for row in rows:
+            yield row
+
+
+def load_report_data(request):
+    project_rows = {}
+    try:
+        date_from, date_to = _report_dates(request)
+    except ValueError as e:
+        messages.error(request, six.text_type(e))
+        return project_rows
+    try:
+        project_aggregates, report_meters = _report_meters(request,
+                                                           date_from,
+                                                           date_to)
+        for meter, service in report_meters:
+            for row in _meter_rows(project_aggregates, meter, service):
+                project_rows.setdefault(row["project"], []).append(row)
+    except Exception:
+        exceptions.handle(request,
+                          _('Unable to retrieve usage data.'))
     return project_rows
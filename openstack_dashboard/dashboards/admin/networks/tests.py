@@ -29,26 +29,21 @@ INDEX_URL = reverse('horizon:admin:networks:index')
 
 class NetworkTests(test.BaseAdminViewTests):
     @test.create_stubs({api.neutron: ('network_list',
-                                      'list_dhcp_agent_hosting_networks',
+                                      'dhcp_agent_network_counts',
                                       'is_extension_supported'),
                         api.keystone: ('tenant_list',)})
     def test_index(self):
         tenants = self.tenants.list()
+        network = self.networks.first()
         api.neutron.network_list(IsA(http.HttpRequest)) \
             .AndReturn(self.networks.list())
         api.keystone.tenant_list(IsA(http.HttpRequest))\
             .AndReturn([tenants, False])
-        for network in self.networks.list():
-            api.neutron.list_dhcp_agent_hosting_networks(IsA(http.HttpRequest),
-                                                         network.id)\
-                .AndReturn(self.agents.list())
-            api.neutron.is_extension_supported(
-                IsA(http.HttpRequest),
-                'dhcp_agent_scheduler').AndReturn(True)
-
+        api.neutron.dhcp_agent_network_counts(IsA(http.HttpRequest)) \
+            .AndReturn({network.id: 2})
         api.neutron.is_extension_supported(
             IsA(http.HttpRequest),
-            'dhcp_agent_scheduler').AndReturn(True)
+            'dhcp_agent_scheduler').MultipleTimes().AndReturn(True)
         self.mox.ReplayAll()
 
         res = self.client.get(INDEX_URL)
@@ -56,6 +51,33 @@ class NetworkTests(test.BaseAdminViewTests):
         self.assertTemplateUsed(res, 'admin/networks/index.html')
         networks = res.context['networks_table'].data
         self.assertItemsEqual(networks, self.networks.list())
+        self.assertEqual([2] + [0] * (len(networks) - 1),
+                         [n.num_agents for n in networks])
+
+    @test.create_stubs({api.neutron: ('network_list',
+                                      'dhcp_agent_network_counts',
+                                      'is_extension_supported'),
+                        api.keystone: ('tenant_list',)})
+    def test_index_dhcp_agent_exception(self):
+        api.neutron.network_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.networks.list())
+        api.keystone.tenant_list(IsA(http.HttpRequest))\
+            .AndReturn([self.tenants.list(), False])
+        api.neutron.dhcp_agent_network_counts(IsA(http.HttpRequest)) \
+            .AndRaise(self.exceptions.neutron)
+        api.neutron.is_extension_supported(
+            IsA(http.HttpRequest),
+            'dhcp_agent_scheduler').MultipleTimes().AndReturn(True)
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(res, 'admin/networks/index.html')
+        networks = res.context['networks_table'].data
+        self.assertEqual(len(self.networks.list()), len(networks))
+        self.assertEqual(set(["Unknown"]),
+                         set(n.num_agents for n in networks))
+        self.assertMessageCount(res, error=1)
 
     @test.create_stubs({api.neutron: ('network_list',
                                       'is_extension_supported',)})
@@ -552,21 +574,17 @@ class NetworkTests(test.BaseAdminViewTests):
 
     @test.create_stubs({api.neutron: ('network_list',
                                       'network_delete',
-                                      'list_dhcp_agent_hosting_networks',
+                                      'dhcp_agent_network_counts',
                                       'is_extension_supported'),
                         api.keystone: ('tenant_list',)})
     def test_delete_network(self):
         tenants = self.tenants.list()
         network = self.networks.first()
-        api.neutron.list_dhcp_agent_hosting_networks(IsA(http.HttpRequest),
-                                                     network.id).\
-            AndReturn(self.agents.list())
-        api.neutron.is_extension_supported(
-            IsA(http.HttpRequest),
-            'dhcp_agent_scheduler').AndReturn(True)
+        api.neutron.dhcp_agent_network_counts(IsA(http.HttpRequest)).\
+            AndReturn({network.id: len(self.agents.list())})
         api.neutron.is_extension_supported(
             IsA(http.HttpRequest),
-            'dhcp_agent_scheduler').AndReturn(True)
+            'dhcp_agent_scheduler').MultipleTimes().AndReturn(True)
         api.keystone.tenant_list(IsA(http.HttpRequest))\
             .AndReturn([tenants, False])
         api.neutron.network_list(IsA(http.HttpRequest))\
@@ -582,21 +600,17 @@ class NetworkTests(test.BaseAdminViewTests):
 
     @test.create_stubs({api.neutron: ('network_list',
                                       'network_delete',
-                                      'list_dhcp_agent_hosting_networks',
+                                      'dhcp_agent_network_counts',
                                       'is_extension_supported'),
                         api.keystone: ('tenant_list',)})
     def test_delete_network_exception(self):
         tenants = self.tenants.list()
         network = self.networks.first()
-        api.neutron.list_dhcp_agent_hosting_networks(IsA(http.HttpRequest),
-                                                     network.id).\
-            AndReturn(self.agents.list())
+        api.neutron.dhcp_agent_network_counts(IsA(http.HttpRequest)).\
+            AndReturn({network.id: len(self.agents.list())})
         api.neutron.is_extension_supported(
             IsA(http.HttpRequest),
-            'dhcp_agent_scheduler').AndReturn(True)
-        api.neutron.is_extension_supported(
-            IsA(http.HttpRequest),
-            'dhcp_agent_scheduler').AndReturn(True)
+            'dhcp_agent_scheduler').MultipleTimes().AndReturn(True)
         api.keystone.tenant_list(IsA(http.HttpRequest))\
             .AndReturn([tenants, False])
         api.neutron.network_list(IsA(http.HttpRequest))\
@@ -54,21 +54,18 @@ class IndexView(tables.DataTableView):
         tenant_dict = SortedDict([(t.id, t) for t in tenants])
         return tenant_dict
 
-    def _get_agents_data(self, network):
-        agents = []
-        data = _("Unknown")
+    def _get_agents_data(self):
+        """Returns a dict mapping network IDs to the number of DHCP agents
+        hosting them, or None if the counts aren't available.
+        """
         try:
             if api.neutron.is_extension_supported(self.request,
                                                   'dhcp_agent_scheduler'):
-                # This method is called for each network. If agent-list cannot
-                # be retrieved, we will see many pop-ups. So the error message
-                # will be popup-ed in get_data() below.
-                agents = api.neutron.list_dhcp_agent_hosting_networks(
-                    self.request, network)
-                data = len(agents)
+                return api.neutron.dhcp_agent_network_counts(self.request)
         except Exception:
-            self.exception = True
-        return data
+            msg = _('Unable to list dhcp agents hosting network.')
+            exceptions.handle(self.request, msg)
+        return None
 
     def get_data(self):
         try:
@@ -78,17 +75,16 @@ class IndexView(tables.DataTableView):
             msg = _('Network list can not be retrieved.')
             exceptions.handle(self.request, msg)
         if networks:
-            self.exception = False
             tenant_dict = self._get_tenant_list()
+            agent_counts = self._get_agents_data()
             for n in networks:
                 # Set tenant name
                 tenant = tenant_dict.get(n.tenant_id, None)
                 n.tenant_name = getattr(tenant, 'name', None)
-                n.num_agents = self._get_agents_data(n.id)
-
-            if self.exception:
-                msg = _('Unable to list dhcp agents hosting network.')
-                exceptions.handle(self.request, msg)
+                if agent_counts is None:
+                    n.num_agents = _("Unknown")
+                else:
+                    n.num_agents = agent_counts.get(n.id, 0)
         return networks
 
 
@@ -192,8 +192,10 @@ class UsageViewTests(test.BaseAdminViewTests):
         res = self.client.get(csv_url)
         self.assertTemplateUsed(res, 'admin/overview/usage.csv')
         self.assertTrue(isinstance(res.context['usage'], usage.GlobalUsage))
+        # The response is streamed, so can only be read once.
+        content = b''.join(res.streaming_content).decode('utf-8')
         hdr = 'Project Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours)'
-        self.assertContains(res, '%s\r\n' % hdr)
+        self.assertIn('%s\r\n' % hdr, content)
 
         if nova_stu_enabled:
             for obj in usage_obj:
@@ -202,4 +204,4 @@ class UsageViewTests(test.BaseAdminViewTests):
                                                             obj.memory_mb,
                                                             obj.disk_gb_hours,
                                                             obj.vcpu_hours)
-                self.assertContains(res, row)
+                self.assertIn(row, content)
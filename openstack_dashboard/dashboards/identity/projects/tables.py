@@ -26,6 +26,7 @@ from keystoneclient.exceptions import Conflict  # noqa
 
 from openstack_dashboard import api
 from openstack_dashboard import policy
+from openstack_dashboard.utils import identity
 
 
 class RescopeTokenToProject(tables.LinkAction):
@@ -157,6 +158,7 @@ class DeleteTenantsAction(tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.keystone.tenant_delete(request, obj_id)
+        identity.projects.forget(request)
 
     def handle(self, table, request, obj_ids):
         response = \
@@ -210,6 +212,7 @@ class UpdateCell(tables.UpdateAction):
                 name=project_obj.name,
                 description=project_obj.description,
                 enabled=project_obj.enabled)
+            identity.projects.forget(request)
 
         except Conflict:
             # Returning a nice error message about name conflict. The message
@@ -35,6 +35,7 @@ from openstack_dashboard.api import cinder
 from openstack_dashboard.api import keystone
 from openstack_dashboard.api import nova
 from openstack_dashboard.usage import quotas
+from openstack_dashboard.utils import identity
 
 INDEX_URL = "horizon:identity:projects:index"
 ADD_USER_URL = "horizon:identity:projects:create_user"
@@ -413,6 +414,7 @@ class CreateProject(workflows.Workflow):
                                                      description=desc,
                                                      enabled=data['enabled'],
                                                      domain=domain_id)
+            identity.projects.forget(request)
             return self.object
         except Exception:
             exceptions.handle(request, ignore=True)
@@ -599,12 +601,14 @@ class UpdateProject(workflows.Workflow):
         # update project info
         try:
             project_id = data['project_id']
-            return api.keystone.tenant_update(
+            project = api.keystone.tenant_update(
                 request,
                 project_id,
                 name=data['name'],
                 description=data['description'],
                 enabled=data['enabled'])
+            identity.projects.forget(request)
+            return project
         except Exception:
             exceptions.handle(request, ignore=True)
             return
@@ -33,6 +33,7 @@ from horizon.utils import functions as utils
 from horizon.utils import validators
 
 from openstack_dashboard import api
+from openstack_dashboard.utils import identity
 
 
 LOG = logging.getLogger(__name__)
@@ -142,6 +143,7 @@ class CreateUserForm(PasswordMixin, BaseUserForm):
                                                 project=data['project'],
                                                 enabled=True,
                                                 domain=domain.id)
+            identity.users.forget(request)
             messages.success(request,
                              _('User "%s" was successfully created.')
                              % data['name'])
@@ -206,6 +208,7 @@ class UpdateUserForm(BaseUserForm):
             if "email" in data:
                 data['email'] = data['email'] or None
             response = api.keystone.user_update(request, user, **data)
+            identity.users.forget(request)
             messages.success(request,
                              _('User has been updated successfully.'))
         except exceptions.Conflict:
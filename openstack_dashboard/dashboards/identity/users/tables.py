@@ -21,6 +21,7 @@ from horizon import messages
 from horizon import tables
 from openstack_dashboard import api
 from openstack_dashboard import policy
+from openstack_dashboard.utils import identity
 
 ENABLE = 0
 DISABLE = 1
@@ -134,6 +135,7 @@ class ToggleEnabled(policy.PolicyTargetMixin, tables.BatchAction):
         else:
             api.keystone.user_update_enabled(request, obj_id, True)
             self.current_past_action = ENABLE
+        identity.users.forget(request)
 
 
 class DeleteUsersAction(tables.DeleteAction):
@@ -162,6 +164,7 @@ class DeleteUsersAction(tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.keystone.user_delete(request, obj_id)
+        identity.users.forget(request)
 
 
 class UserFilterAction(tables.FilterAction):
@@ -206,6 +209,7 @@ class UpdateCell(tables.UpdateAction):
                 if value is not None:
                     kwargs[keyword_name] = value
             api.keystone.user_update(request, user_obj, **kwargs)
+            identity.users.forget(request)
 
         except horizon_exceptions.Conflict:
             message = _("This name is already taken.")
@@ -25,6 +25,7 @@ from horizon import forms
 from horizon import messages
 
 from openstack_dashboard import api
+from openstack_dashboard.usage import quotas
 
 
 NEW_LINES = re.compile(r"\r|\n")
@@ -60,6 +61,7 @@ class ImportKeypair(forms.SelfHandlingForm):
             keypair = api.nova.keypair_import(request,
                                               data['name'],
                                               data['public_key'])
+            quotas.invalidate_tenant_quota_usages(request)
             messages.success(request,
                              _('Successfully imported public key: %s')
                              % data['name'])
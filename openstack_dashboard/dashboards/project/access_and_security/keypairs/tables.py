@@ -43,6 +43,7 @@ class DeleteKeyPairs(tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.nova.keypair_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(request)
 
 
 class ImportKeyPair(tables.LinkAction):
@@ -32,6 +32,7 @@ from horizon.utils import memoized
 from horizon import views
 
 from openstack_dashboard import api
+from openstack_dashboard.usage import quotas
 
 from openstack_dashboard.dashboards.project.access_and_security.keypairs \
     import forms as project_forms
@@ -107,6 +108,7 @@ class GenerateView(View):
                 api.nova.keypair_delete(request, keypair_name)
 
             keypair = api.nova.keypair_create(request, keypair_name)
+            quotas.invalidate_tenant_quota_usages(request)
         except Exception:
             redirect = reverse('horizon:project:access_and_security:index')
             exceptions.handle(self.request,
@@ -63,6 +63,7 @@ class DeleteGroup(policy.PolicyTargetMixin, tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.network.security_group_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(request)
 
 
 class CreateGroup(tables.LinkAction):
@@ -115,6 +115,42 @@ class DeleteImage(tables.DeleteAction):
         api.glance.image_delete(request, obj_id)
 
 
+class CancelUpload(tables.BatchAction):
+    name = "cancel_upload"
+    classes = ("btn-danger",)
+    help_text = _("The image is left without data, and can then be "
+                  "deleted.")
+    policy_rules = (("image", "upload_image"),)
+
+    @staticmethod
+    def action_present(count):
+        return ungettext_lazy(
+            u"Cancel Upload",
+            u"Cancel Uploads",
+            count
+        )
+
+    @staticmethod
+    def action_past(count):
+        return ungettext_lazy(
+            u"Cancelled Upload",
+            u"Cancelled Uploads",
+            count
+        )
+
+    def allowed(self, request, image=None):
+        if not image or image.status not in ("queued", "saving"):
+            return False
+        if image.owner != request.user.tenant_id:
+            return False
+        progress = api.glance.image_upload_progress(request, image.id)
+        return bool(progress) and progress['status'] in (
+            api.glance.UPLOAD_QUEUED, api.glance.UPLOAD_UPLOADING)
+
+    def action(self, request, obj_id):
+        api.glance.image_upload_cancel(request, obj_id)
+
+
 class CreateImage(tables.LinkAction):
     name = "create"
     verbose_name = _("Create Image")
@@ -246,6 +282,22 @@ class UpdateRow(tables.Row):
             self.classes.append('category-' + category)
 
 
+class ImageStatusColumn(tables.Column):
+    """Shows how much of the data of images being uploaded has been sent."""
+
+    def get_data(self, datum):
+        data = super(ImageStatusColumn, self).get_data(datum)
+        if getattr(datum, 'status', None) in ("queued", "saving"):
+            progress = api.glance.image_upload_progress(self.table.request,
+                                                        datum.id)
+            if (progress and progress['total'] and
+                    progress['status'] == api.glance.UPLOAD_UPLOADING):
+                percent = 100 * progress['bytes_sent'] // progress['total']
+                data = _("%(status)s (%(percent)d%%)") % {
+                    'status': data, 'percent': percent}
+        return data
+
+
 class ImagesTable(tables.DataTable):
     STATUS_CHOICES = (
         ("active", True),
@@ -274,11 +326,11 @@ class ImagesTable(tables.DataTable):
     image_type = tables.Column(get_image_type,
                                verbose_name=_("Type"),
                                display_choices=TYPE_CHOICES)
-    status = tables.Column("status",
-                           verbose_name=_("Status"),
-                           status=True,
-                           status_choices=STATUS_CHOICES,
-                           display_choices=STATUS_DISPLAY_CHOICES)
+    status = ImageStatusColumn("status",
+                               verbose_name=_("Status"),
+                               status=True,
+                               status_choices=STATUS_CHOICES,
+                               display_choices=STATUS_DISPLAY_CHOICES)
     public = tables.Column("is_public",
                            verbose_name=_("Public"),
                            empty_value=False,
@@ -305,5 +357,6 @@ class ImagesTable(tables.DataTable):
         if getattr(settings, 'LAUNCH_INSTANCE_NG_ENABLED', False):
             launch_actions = (LaunchImageNG,) + launch_actions
         row_actions = launch_actions + (CreateVolumeFromImage,
-                                        EditImage, DeleteImage,)
+                                        EditImage, CancelUpload,
+                                        DeleteImage,)
         pagination_param = "image_marker"
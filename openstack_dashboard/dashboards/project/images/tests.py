@@ -118,6 +118,25 @@ class ImagesAndSnapshotsTests(test.TestCase):
                          u"Delete Image")
         self.assertEqual(str(row_actions[0]), "<DeleteImage: delete>")
 
+    @test.create_stubs({api.glance: ('image_list_detailed',
+                                     'image_upload_progress',
+                                     'image_upload_cancel')})
+    def test_cancel_upload(self):
+        snapshots = self.snapshots.list()
+        queued = snapshots[2]
+        api.glance.image_list_detailed(IsA(http.HttpRequest), marker=None) \
+            .AndReturn([snapshots, False, False])
+        api.glance.image_upload_progress(IsA(http.HttpRequest), queued.id) \
+            .MultipleTimes().AndReturn({'status': api.glance.UPLOAD_UPLOADING,
+                                        'bytes_sent': 0,
+                                        'total': 10})
+        api.glance.image_upload_cancel(IsA(http.HttpRequest), str(queued.id))
+        self.mox.ReplayAll()
+
+        action = 'images__cancel_upload__%s' % queued.id
+        res = self.client.post(INDEX_URL, {'action': action})
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+
 
 class ImagesAndSnapshotsUtilsTests(test.TestCase):
 
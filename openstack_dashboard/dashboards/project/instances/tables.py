@@ -44,6 +44,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 
 
 LOG = logging.getLogger(__name__)
@@ -107,6 +108,8 @@ class TerminateInstance(policy.PolicyTargetMixin, tables.BatchAction):
 
     def action(self, request, obj_id):
         api.nova.server_delete(request, obj_id)
+        instance = self.table.get_object_by_id(obj_id)
+        quotas.invalidate_tenant_quota_usages(request, instance.tenant_id)
 
 
 class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -591,6 +594,7 @@ class SimpleAssociateIP(policy.PolicyTargetMixin, tables.Action):
                 request, instance_id).split('_')[0]
 
             fip = api.network.tenant_floating_ip_allocate(request)
+            quotas.invalidate_tenant_quota_usages(request)
             api.network.floating_ip_associate(request, fip.id, target_id)
             messages.success(request,
                              _("Successfully associated floating IP: %s")
@@ -26,6 +26,7 @@ from openstack_dashboard.dashboards.project.instances \
     import utils as instance_utils
 from openstack_dashboard.dashboards.project.instances.workflows \
     import create_instance
+from openstack_dashboard.usage import quotas
 
 
 class SetFlavorChoiceAction(workflows.Action):
@@ -98,6 +99,7 @@ class ResizeInstance(workflows.Workflow):
         disk_config = context.get('disk_config', None)
         try:
             api.nova.server_resize(request, instance_id, flavor, disk_config)
+            quotas.invalidate_tenant_quota_usages(request)
             return True
         except Exception:
             exceptions.handle(request)
@@ -29,6 +29,7 @@ from horizon import exceptions
 from horizon import views
 
 from openstack_dashboard import api
+from openstack_dashboard import policy
 from openstack_dashboard.usage import quotas
 
 from openstack_dashboard.dashboards.project.network_topology.instances \
@@ -100,15 +101,6 @@ class NetworkTopologyView(views.HorizonTemplateView):
     template_name = 'project/network_topology/index.html'
     page_title = _("Network Topology")
 
-    def _has_permission(self, policy):
-        has_permission = True
-        policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
-
-        if policy_check:
-            has_permission = policy_check(policy, self.request)
-
-        return has_permission
-
     def _quota_exceeded(self, quota):
         usages = quotas.tenant_quota_usages(self.request)
         available = usages.get(quota, {}).get('available', 1)
@@ -118,15 +110,19 @@ class NetworkTopologyView(views.HorizonTemplateView):
         context = super(NetworkTopologyView, self).get_context_data(**kwargs)
         network_config = getattr(settings, 'OPENSTACK_NEUTRON_NETWORK', {})
 
-        context['launch_instance_allowed'] = self._has_permission(
-            (("compute", "compute:create"),))
+        (launch_instance_allowed, create_network_allowed,
+         create_router_allowed) = policy.check_many(
+            [((("compute", "compute:create"),), None),
+             ((("network", "create_network"),), None),
+             ((("network", "create_router"),), None)], self.request)
+
+        context['launch_instance_allowed'] = launch_instance_allowed
         context['instance_quota_exceeded'] = self._quota_exceeded('instances')
-        context['create_network_allowed'] = self._has_permission(
-            (("network", "create_network"),))
+        context['create_network_allowed'] = create_network_allowed
         context['network_quota_exceeded'] = self._quota_exceeded('networks')
         context['create_router_allowed'] = (
             network_config.get('enable_router', True) and
-            self._has_permission((("network", "create_router"),)))
+            create_router_allowed)
         context['router_quota_exceeded'] = self._quota_exceeded('routers')
         context['console_type'] = getattr(
             settings, 'CONSOLE_TYPE', 'AUTO')
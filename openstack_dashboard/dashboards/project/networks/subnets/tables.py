@@ -76,6 +76,8 @@ class DeleteSubnet(SubnetPolicyTargetMixin, CheckNetworkEditable,
     def delete(self, request, obj_id):
         try:
             api.neutron.subnet_delete(request, obj_id)
+            subnet = self.table.get_object_by_id(obj_id)
+            quotas.invalidate_tenant_quota_usages(request, subnet.tenant_id)
         except Exception:
             msg = _('Failed to delete subnet %s') % obj_id
             LOG.info(msg)
@@ -75,6 +75,7 @@ class DeleteNetwork(policy.PolicyTargetMixin, CheckNetworkEditable,
                 LOG.debug('Deleted subnet %s', subnet_id)
             api.neutron.network_delete(request, network_id)
             LOG.debug('Deleted network %s successfully', network_id)
+            quotas.invalidate_tenant_quota_usages(request, network.tenant_id)
         except Exception:
             msg = _('Failed to delete network %s')
             LOG.info(msg, network_id)
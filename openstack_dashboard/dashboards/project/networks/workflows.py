@@ -27,6 +27,7 @@ from horizon import workflows
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.networks.subnets import utils
+from openstack_dashboard.usage import quotas
 
 
 LOG = logging.getLogger(__name__)
@@ -335,6 +336,7 @@ class CreateNetwork(workflows.Workflow):
             params = {'name': data['net_name'],
                       'admin_state_up': (data['admin_state'] == 'True')}
             network = api.neutron.network_create(request, **params)
+            quotas.invalidate_tenant_quota_usages(request)
             self.context['net_id'] = network.id
             msg = (_('Network "%s" was successfully created.') %
                    network.name_or_id)
@@ -424,6 +426,7 @@ class CreateNetwork(workflows.Workflow):
         """Delete the created network when subnet creation failed."""
         try:
             api.neutron.network_delete(request, network.id)
+            quotas.invalidate_tenant_quota_usages(request)
             msg = _('Delete the created network "%s" '
                     'due to subnet creation failure.') % network.name
             LOG.debug(msg)
@@ -27,7 +27,7 @@ from horizon import views
 from openstack_dashboard import usage
 
 
-class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
+class ProjectUsageCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Instance Name"), _("VCPUs"), _("RAM (MB)"),
                _("Disk (GB)"), _("Usage (Hours)"),
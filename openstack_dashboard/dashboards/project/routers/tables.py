@@ -63,6 +63,8 @@ class DeleteRouter(policy.PolicyTargetMixin, tables.DeleteAction):
                 api.neutron.router_remove_interface(request, obj_id,
                                                     port_id=port.id)
             api.neutron.router_delete(request, obj_id)
+            router = self.table.get_object_by_id(obj_id)
+            quotas.invalidate_tenant_quota_usages(request, router.tenant_id)
         except q_ext.NeutronClientException as e:
             msg = _('Unable to delete router "%s"') % e
             LOG.info(msg)
@@ -389,6 +389,7 @@ class CreateForm(forms.SelfHandlingForm):
                                           metadata=metadata,
                                           availability_zone=az,
                                           source_volid=volume_id)
+            quotas.invalidate_tenant_quota_usages(request)
             message = _('Creating volume "%s"') % data['name']
             messages.info(request, message)
             return volume
@@ -515,6 +516,7 @@ class CreateSnapshotForm(forms.SelfHandlingForm):
                                                      data['name'],
                                                      data['description'],
                                                      force=force)
+            quotas.invalidate_tenant_quota_usages(request)
 
             messages.info(request, message)
             return snapshot
@@ -727,6 +729,7 @@ class ExtendForm(forms.SelfHandlingForm):
             volume = cinder.volume_extend(request,
                                           volume_id,
                                           data['new_size'])
+            quotas.invalidate_tenant_quota_usages(request)
 
             message = _('Extending volume: "%s"') % data['name']
             messages.info(request, message)
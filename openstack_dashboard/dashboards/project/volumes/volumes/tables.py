@@ -31,6 +31,7 @@ from horizon import tables
 from openstack_dashboard import api
 from openstack_dashboard.api import cinder
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 
 
 DELETABLE_STATES = ("available", "error", "error_extending")
@@ -83,6 +84,9 @@ class DeleteVolume(VolumePolicyTargetMixin, tables.DeleteAction):
 
     def delete(self, request, obj_id):
         cinder.volume_delete(request, obj_id)
+        volume = self.table.get_object_by_id(obj_id)
+        quotas.invalidate_tenant_quota_usages(
+            request, getattr(volume, 'os-vol-tenant-attr:tenant_id', None))
 
     def allowed(self, request, volume=None):
         if volume:
@@ -306,10 +310,29 @@ def get_size(volume):
     return _("%sGB") % volume.size
 
 
-def get_attachment_name(request, attachment):
+def get_attachment_instance_names(request, attachments):
+    """Looks up the names of the instances the attachments belong to, for
+    :func:`get_attachment_name`, all at once.
+    """
+    server_ids = [attachment['server_id'] for attachment in attachments
+                  if attachment.get('server_id') and
+                  not attachment.get('instance')]
+    if len(set(server_ids)) < 2:
+        return {}
+    try:
+        return api.nova.server_names(request, server_ids)
+    except Exception:
+        # They're looked up (and any failure reported) one at a time
+        # instead.
+        return {}
+
+
+def get_attachment_name(request, attachment, instance_names=None):
     server_id = attachment.get("server_id", None)
     if "instance" in attachment and attachment['instance']:
         name = attachment["instance"].name
+    elif instance_names and server_id in instance_names:
+        name = instance_names[server_id]
     else:
         try:
             server = api.nova.server_get(request, server_id)
@@ -337,10 +360,17 @@ class AttachmentColumn(tables.Column):
         link = _('Attached to %(instance)s on %(dev)s')
         attachments = []
         # Filter out "empty" attachments which the client returns...
-        for attachment in [att for att in volume.attachments if att]:
+        volume_attachments = [att for att in volume.attachments if att]
+        instance_names = self.table.attachment_instance_names
+        if instance_names is None:
+            # The row is being rendered on its own.
+            instance_names = get_attachment_instance_names(
+                request, volume_attachments)
+        for attachment in volume_attachments:
             # When a volume is attached it may return the server_id
             # without the server name...
-            instance = get_attachment_name(request, attachment)
+            instance = get_attachment_name(request, attachment,
+                                           instance_names)
             vals = {"instance": instance,
                     "dev": html.escape(attachment.get("device", ""))}
             attachments.append(link % vals)
@@ -406,7 +436,23 @@ class VolumesFilterAction(tables.FilterAction):
                 if q in volume.name.lower()]
 
 
-class VolumesTable(VolumesTableBase):
+class AttachmentNamesMixin(object):
+    """Looks up the names of all the instances the table's attachments
+    belong to before its rows are rendered, rather than row by row.
+    """
+    attachment_instance_names = None
+
+    def get_attachments(self):
+        return [attachment for volume in self.filtered_data
+                for attachment in volume.attachments if attachment]
+
+    def get_rows(self):
+        self.attachment_instance_names = get_attachment_instance_names(
+            self.request, self.get_attachments())
+        return super(AttachmentNamesMixin, self).get_rows()
+
+
+class VolumesTable(AttachmentNamesMixin, VolumesTableBase):
     name = tables.Column("name",
                          verbose_name=_("Name"),
                          link="horizon:project:volumes:volumes:detail")
@@ -478,10 +524,11 @@ class AttachedInstanceColumn(tables.Column):
     """
     def get_raw_data(self, attachment):
         request = self.table.request
-        return safestring.mark_safe(get_attachment_name(request, attachment))
+        return safestring.mark_safe(get_attachment_name(
+            request, attachment, self.table.attachment_instance_names))
 
 
-class AttachmentsTable(tables.DataTable):
+class AttachmentsTable(AttachmentNamesMixin, tables.DataTable):
     instance = AttachedInstanceColumn(get_attachment_name,
                                       verbose_name=_("Instance"))
     device = tables.Column("device",
@@ -490,8 +537,12 @@ class AttachmentsTable(tables.DataTable):
     def get_object_id(self, obj):
         return obj['id']
 
+    def get_attachments(self):
+        return self.filtered_data
+
     def get_object_display(self, attachment):
-        instance_name = get_attachment_name(self.request, attachment)
+        instance_name = get_attachment_name(self.request, attachment,
+                                            self.attachment_instance_names)
         vals = {"volume_name": attachment['volume_name'],
                 "instance_name": html.strip_tags(instance_name)}
         return _("Volume %(volume_name)s on instance %(instance_name)s") % vals
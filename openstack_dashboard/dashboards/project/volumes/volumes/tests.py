@@ -1609,3 +1609,25 @@ class VolumeViewTests(test.TestCase):
         url = reverse('horizon:project:volumes:volumes:accept_transfer')
         res = self.client.post(url, formData, follow=True)
         self.assertNoFormErrors(res)
+
+    @test.create_stubs({api.nova: ('server_list', 'server_get'),
+                        cinder: ('tenant_absolute_limits',)})
+    def test_volumes_table_attachment_names(self):
+        volumes = self.cinder_volumes.list()[:2]
+        servers = self.servers.list()[:2]
+        for volume, server in zip(volumes, servers):
+            volume.attachments = [{'id': volume.id,
+                                   'volume_id': volume.id,
+                                   'server_id': server.id,
+                                   'device': '/dev/vdb'}]
+
+        # The instances are looked up all at once, not row by row.
+        api.nova.server_list(IsA(http.HttpRequest)).AndReturn([servers, False])
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(self.cinder_limits['absolute'])
+        self.mox.ReplayAll()
+
+        table = tables.VolumesTable(self.request, data=volumes)
+        rows = table.get_rows()
+        for row, server in zip(rows, servers):
+            self.assertIn(server.name, row.cells['attachments'].data)
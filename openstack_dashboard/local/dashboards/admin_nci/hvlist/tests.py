@@ -0,0 +1,139 @@
+# openstack_dashboard.local.dashboards.admin_nci.hvlist.tests
+#
+# Copyright (c) 2015, NCI, Australian National University.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import json
+
+from django import http
+from django.test.utils import override_settings
+
+from mox import IsA  # noqa
+
+from openstack_dashboard.local.dashboards.admin_nci.hvlist import views
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import identity
+
+
+class FakeResource(object):
+    def __init__(self, **attrs):
+        for name, value in attrs.items():
+            setattr(self, name, value)
+
+
+def fake_inventory():
+    hypervisor = FakeResource(service={'host': 'tc1'},
+                              state='up', status='enabled',
+                              vcpus=8, vcpus_used=2,
+                              memory_mb=8192, memory_mb_used=2048,
+                              local_gb=100, local_gb_used=20)
+    flavor = FakeResource(**{'id': '1', 'name': 'm1.small', 'vcpus': 2,
+                             'ram': 2048, 'disk': 20,
+                             'OS-FLV-EXT-DATA:ephemeral': 0})
+    instance = FakeResource(**{'id': 'i1', 'name': 'vm1',
+                               'status': 'ACTIVE',
+                               'tenant_id': 'p1',
+                               'flavor': {'id': '1'},
+                               'created': '2015-01-01T00:00:00Z',
+                               'OS-EXT-SRV-ATTR:host': 'tc1'})
+    unknown_flavor = FakeResource(**{'id': 'i2', 'name': 'vm2',
+                                     'status': 'ACTIVE',
+                                     'tenant_id': 'p1',
+                                     'flavor': {'id': 'gone'},
+                                     'created': '2015-01-01T00:00:00Z',
+                                     'OS-EXT-SRV-ATTR:host': 'tc1'})
+    return FakeResource(
+        aggregates=[],
+        hypervisors=[hypervisor],
+        instances=[instance, unknown_flavor],
+        project_d={'p1': identity.Identity('p1', 'project1', True, '')},
+        flavor_d={'1': flavor},
+        digest='abc',
+        timestamp=1420070400.0,
+        age=0)
+
+
+@override_settings(NCI_NOVA_COMMIT_RATIOS={'cpu': 2.0})
+class HypervisorListTests(test.BaseAdminViewTests):
+    def test_build_host_aggregates(self):
+        errors = []
+        host_aggregates = views.build_host_aggregates(fake_inventory(),
+                                                      errors)
+
+        self.assertEqual(1, len(errors))
+        self.assertIn('i2', errors[0])
+        self.assertEqual(1, len(host_aggregates))
+        aggregate = host_aggregates[0]
+        self.assertEqual('(none)', aggregate['name'])
+        self.assertEqual(2.0, aggregate['overcommit']['cpu'])
+
+        hypervisor, = aggregate['hypervisors']
+        self.assertEqual('1', hypervisor.short_name)
+        self.assertEqual(['i1'], [i.id for i in hypervisor.instances])
+        self.assertEqual((2.0, 16.0), hypervisor.usage['vcpus'])
+        self.assertEqual((2048.0 * 1024 ** 2, 8192.0 * 1024 ** 2),
+                         hypervisor.usage['memory_bytes'])
+        self.assertEqual('project1', hypervisor.instances[0].project.name)
+        self.assertEqual('', hypervisor.cpu_overcommit)
+
+    def _get_heatmap(self, **headers):
+        request = self.factory.get('/heatmap.json', **headers)
+        request.user = self.user
+        return views.HeatmapView.as_view()(request)
+
+    def test_heatmap(self):
+        self.mox.StubOutWithMock(views, 'get_cluster_inventory')
+        views.get_cluster_inventory(IsA(http.HttpRequest)) \
+            .AndReturn(fake_inventory())
+        self.mox.ReplayAll()
+
+        response = self._get_heatmap()
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('"abc"', response['ETag'])
+        data = json.loads(response.content)
+        self.assertEqual('abc', data['digest'])
+        hypervisor = dict(zip(data['hypervisors']['fields'],
+                              data['hypervisors']['rows'][0]))
+        self.assertEqual('tc1', hypervisor['host'])
+        self.assertEqual(1, hypervisor['instances'])
+        instance = dict(zip(data['instances']['fields'],
+                            data['instances']['rows'][0]))
+        self.assertEqual('i1', instance['id'])
+        self.assertEqual('project1', instance['project'])
+
+    def test_heatmap_not_modified(self):
+        # The inventory isn't loaded if the client has the latest data.
+        self.mox.StubOutWithMock(views, 'get_cluster_inventory')
+        self.mox.StubOutWithMock(views, 'get_cluster_inventory_digest')
+        views.get_cluster_inventory_digest(IsA(http.HttpRequest)) \
+            .AndReturn('abc')
+        self.mox.ReplayAll()
+
+        response = self._get_heatmap(HTTP_IF_NONE_MATCH='"abc"')
+        self.assertEqual(304, response.status_code)
+        self.assertEqual('"abc"', response['ETag'])
+
+    def test_heatmap_not_modified_after_refresh(self):
+        self.mox.StubOutWithMock(views, 'get_cluster_inventory')
+        self.mox.StubOutWithMock(views, 'get_cluster_inventory_digest')
+        views.get_cluster_inventory_digest(IsA(http.HttpRequest)) \
+            .AndReturn(None)
+        views.get_cluster_inventory(IsA(http.HttpRequest)) \
+            .AndReturn(fake_inventory())
+        self.mox.ReplayAll()
+
+        response = self._get_heatmap(data={'since': 'abc'})
+        self.assertEqual(304, response.status_code)
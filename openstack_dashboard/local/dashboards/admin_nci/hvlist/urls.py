@@ -19,8 +19,9 @@
 from django.conf.urls import patterns
 from django.conf.urls import url
 
-from .views import IndexView
+from .views import IndexView, HeatmapView
 
 urlpatterns = patterns("",
     url(r"^$", IndexView.as_view(), name="index"),
+    url(r"^heatmap\.json$", HeatmapView.as_view(), name="heatmap"),
 )
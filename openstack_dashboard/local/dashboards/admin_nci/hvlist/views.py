@@ -17,11 +17,15 @@
 #
 
 from horizon import views, messages
-from openstack_dashboard import api
 from iso8601 import parse_date
 from colorsys import hsv_to_rgb
+import json
 import re
 from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+import django.views
+
+from openstack_dashboard.local.nci.inventory import get_cluster_inventory, get_cluster_inventory_digest
 
 from openstack_dashboard.openstack.common import log as logging
 LOG = logging.getLogger(__name__)
@@ -104,144 +108,156 @@ class AggregateHack(object):
         self.hosts    = [h.service['host'] for h in hypervisors]
         self.metadata = {}
 
-class IndexView(views.APIView):
-    template_name = 'admin/hvlist/index.html'
-
-    def get_data(self, request, context, *args, **kwargs):
-        # grab all the data
-        aggregates = api.nova.aggregate_details_list(request)
-        hypervisors = api.nova.hypervisor_list(request)
-        instances, _ = api.nova.server_list(request, all_tenants=True)
-        projects, _ = api.keystone.tenant_list(request)
-        flavs = api.nova.flavor_list(request)
-
-        # reorganise some
-        if not aggregates: aggregates = [AggregateHack(hypervisors)]
-        host_aggregates = [{'name':a.name, 'hypervisors':[]} for a in aggregates]
-        projects = {p.id : p for p in projects}
-        flavs = {f.id : f for f in flavs}
-        hypervisor_instances = {} # OS-EXT-SRV-ATTR:host : [instance]
-        for i in instances:
-            # make sure we can tell which hypervisor is running this instance; if not, ignore it
-            try:
-                host = getattr(i, 'OS-EXT-SRV-ATTR:host')
-            except AttributeError:
-                messages.error(request, 'could not get OS-EXT-SRV-ATTR:host attribute of instance '+str(i.id)+' ('+str(i.name)+'); it will be ignored')
-                continue
-
-            # api.nova.flavor_list (which wraps novaclient.flavors.list) does not get all flavors,
-            # so if we have a reference to one that hasn't been retrieved, try looking it up specifically
-            # (wrap this rather trivially in a try block to make the error less cryptic)
-            if i.flavor['id'] not in flavs:
-                try:
-                    flavs[i.flavor['id']] = api.nova.flavor_get(request, i.flavor['id'])
-                    LOG.debug('Extra lookup for flavor "'+str(i.flavor['id'])+'"')
-                except NotFound as e:
-                    messages.error(request, 'Instance '+i.id+' has unknown flavor, so will be ignored.')
-                    continue
+def build_host_aggregates(inventory, errors):
+    """Return list of host aggregate dicts, each with a list of hypervisors
+    decorated with their instances and resource usage, from the given
+    ClusterInventory. Descriptions of any problems with the data are appended
+    to errors.
 
-            # maybe the same thing could happen for projects (haven't actually experienced this one though)
-            if i.tenant_id not in projects:
+    Resource usage is left unscaled (i.e. in vcpus and bytes) so that it can
+    be used both for rendering the page and by the JSON view.
+    """
+    aggregates = inventory.aggregates
+    hypervisors = inventory.hypervisors
+    instances = inventory.instances
+    projects = inventory.project_d
+    flavs = inventory.flavor_d
+
+    # reorganise some
+    if not aggregates: aggregates = [AggregateHack(hypervisors)]
+    host_aggregates = [{'name':a.name, 'hypervisors':[]} for a in aggregates]
+    hypervisor_instances = {} # OS-EXT-SRV-ATTR:host : [instance]
+    for i in instances:
+        # make sure we can tell which hypervisor is running this instance; if not, ignore it
+        try:
+            host = getattr(i, 'OS-EXT-SRV-ATTR:host')
+        except AttributeError:
+            errors.append('could not get OS-EXT-SRV-ATTR:host attribute of instance '+str(i.id)+' ('+str(i.name)+'); it will be ignored')
+            continue
+
+        # flavors and projects missing from the list results have already been
+        # looked up by the inventory, so any still missing no longer exist
+        if i.flavor['id'] not in flavs:
+            errors.append('Instance '+i.id+' has unknown flavor, so will be ignored.')
+            continue
+        if i.tenant_id not in projects:
+            errors.append('Instance '+i.id+' has unknown project, so will be ignored.')
+            continue
+
+        # extract flavor data
+        flav = flavs[i.flavor['id']]
+        try:
+            ephemeral = getattr(flav, 'OS-FLV-EXT-DATA:ephemeral')
+        except AttributeError:
+            errors.append('could not get OS-FLV-EXT-DATA:ephemeral attribute of flavor '+str(flav.id)+' ('+str(flav.name)+'); associated instance will be ignored')
+            continue
+
+        # everything's sane, so set some fields for the template to use
+        def format_bytes(b): # formatter for bytes
+            p, s = binary_prefix_scale(b)
+            return '{scaled:.0f} {prefix}B'.format(scaled=b*s, prefix=p)
+        i.project = projects[i.tenant_id]
+        i.created = parse_date(i.created)
+        i.flavor_name = flav.name
+        i.flavor_vcpus = float(flav.vcpus)
+        i.flavor_memory_bytes = float(flav.ram) * 1024**2
+        i.flavor_disk_bytes = (float(flav.disk) + float(ephemeral)) * 1024**3
+        i.flavor_description = '{vcpus} / {memory} / {disk}'.format(
+            vcpus  = flav.vcpus,
+            memory = format_bytes(i.flavor_memory_bytes),
+            disk   = format_bytes(i.flavor_disk_bytes)
+        )
+
+        # maintain lists of which instances belong to which hypervisors
+        if host not in hypervisor_instances: hypervisor_instances[host] = []
+        hypervisor_instances[host].append(i)
+
+    # get overcommit values
+    oc = get_overcommit_ratios()
+    p = re.compile(r'^(?P<resource>cpu|ram|disk)_allocation_ratio$')
+    for (a, h) in zip(aggregates, host_aggregates):
+        h['overcommit'] = {k:oc[k] for k in oc} # copy default overcommit values
+        for k in a.metadata:
+            m = p.match(k)
+            if m:
                 try:
-                    projects[i.tenant_id] = api.keystone.tenant_get(request, i.tenant_id)
-                    LOG.debug('Extra lookup for project "'+str(i.tenant_id)+'"')
-                except NotFound as e:
-                    messages.error(request, 'Instance '+i.id+' has unknown project, so will be ignored.')
+                    h['overcommit'][m.group('resource')] = float(a.metadata[k])
+                except ValueError:
+                    LOG.debug('Could not parse host aggregate "{key}" metadata value "{value}" as float.'.format(key=k, value=a.metadata[k]))
                     continue
+        h['pretty_overcommit'] = '{cpu} / {ram} / {disk}'.format(**h['overcommit'])
+
+    # assign hosts to host aggregates
+    for h in hypervisors:
+        for (ha, agg) in zip(host_aggregates, aggregates):
+            if h.service['host'] in agg.hosts:
+                ha['hypervisors'].append(h)
+
+    for ha in host_aggregates:
+        for h in ha['hypervisors']:
+            h.host = h.service['host']
+            h.short_name = short_name(h.host)
+            h.instances = hypervisor_instances[h.host] if h.host in hypervisor_instances else []
+
+
+            # convert number of vcpus used (n)ow, and (t)otal available, to float, for arithmetic later on
+            vcpus_used,        total_vcpus        = float(h.vcpus_used),             float(h.vcpus)             * ha['overcommit']['cpu']
+            memory_bytes_used, total_memory_bytes = float(h.memory_mb_used)*1024**2, float(h.memory_mb)*1024**2 * ha['overcommit']['ram']
+            disk_bytes_used,   total_disk_bytes   = float(h.local_gb_used)*1024**3,  float(h.local_gb)*1024**3  * ha['overcommit']['disk']
+
+            # save the unscaled totals (used by the JSON view)
+            h.usage = {
+                'vcpus':        (vcpus_used, total_vcpus),
+                'memory_bytes': (memory_bytes_used, total_memory_bytes),
+                'disk_bytes':   (disk_bytes_used, total_disk_bytes),
+            }
+
+            # save these values for scaling visual elements later on...
+            h.max_vcpus = max(vcpus_used, total_vcpus)
+            h.max_memory_bytes = max(memory_bytes_used, total_memory_bytes)
+            h.max_disk_bytes = max(disk_bytes_used, total_disk_bytes)
+
+            # colour hypervisors that are up
+            h.color = hypervisor_color(vcpus_used/total_vcpus, memory_bytes_used/total_memory_bytes, disk_bytes_used/total_disk_bytes) if h.state == 'up' else '#999'
+
+            # calculate how much of the hypervisor's resources each instance is using
+            for i in h.instances:
+                i.status_symbol = hypervisor_status_symbol(i)
+                i.cpuu  = i.flavor_vcpus
+                i.memu  = i.flavor_memory_bytes
+                i.disku = i.flavor_disk_bytes
 
-            # extract flavor data
-            flav = flavs[i.flavor['id']]
-            try:
-                ephemeral = getattr(flav, 'OS-FLV-EXT-DATA:ephemeral')
-            except AttributeError:
-                messages.error(request, 'could not get OS-FLV-EXT-DATA:ephemeral attribute of flavor '+str(flav.id)+' ('+str(flav.name)+'); associated instance will be ignored')
-                continue
-
-            # everything's sane, so set some fields for the template to use
-            def format_bytes(b): # formatter for bytes
-                p, s = binary_prefix_scale(b)
-                return '{scaled:.0f} {prefix}B'.format(scaled=b*s, prefix=p)
-            i.project = projects[i.tenant_id]
-            i.created = parse_date(i.created)
-            i.flavor_name = flav.name
-            i.flavor_vcpus = float(flav.vcpus)
-            i.flavor_memory_bytes = float(flav.ram) * 1024**2
-            i.flavor_disk_bytes = (float(flav.disk) + float(ephemeral)) * 1024**3
-            i.flavor_description = '{vcpus} / {memory} / {disk}'.format(
-                vcpus  = flav.vcpus,
-                memory = format_bytes(i.flavor_memory_bytes),
-                disk   = format_bytes(i.flavor_disk_bytes)
-            )
-
-            # maintain lists of which instances belong to which hypervisors
-            if host not in hypervisor_instances: hypervisor_instances[host] = []
-            hypervisor_instances[host].append(i)
-
-        # get overcommit values
-        oc = get_overcommit_ratios()
-        p = re.compile(r'^(?P<resource>cpu|ram|disk)_allocation_ratio$')
-        for (a, h) in zip(aggregates, host_aggregates):
-            h['overcommit'] = {k:oc[k] for k in oc} # copy default overcommit values
-            for k in a.metadata:
-                m = p.match(k)
-                if m:
-                    try:
-                        h['overcommit'][m.group('resource')] = float(a.metadata[k])
-                    except ValueError:
-                        LOG.debug('Could not parse host aggregate "{key}" metadata value "{value}" as float.'.format(key=k, value=a.metadata[k]))
-                        continue
-            h['pretty_overcommit'] = '{cpu} / {ram} / {disk}'.format(**h['overcommit'])
-
-        # assign hosts to host aggregates
-        for h in hypervisors:
-            for (ha, agg) in zip(host_aggregates, aggregates):
-                if h.service['host'] in agg.hosts:
-                    ha['hypervisors'].append(h)
-
-        for ha in host_aggregates:
-            for h in ha['hypervisors']:
-                h.host = h.service['host']
-                h.short_name = short_name(h.host)
-                h.instances = hypervisor_instances[h.host] if h.host in hypervisor_instances else []
-
-
-                # convert number of vcpus used (n)ow, and (t)otal available, to float, for arithmetic later on
-                vcpus_used,        total_vcpus        = float(h.vcpus_used),             float(h.vcpus)             * ha['overcommit']['cpu']
-                memory_bytes_used, total_memory_bytes = float(h.memory_mb_used)*1024**2, float(h.memory_mb)*1024**2 * ha['overcommit']['ram']
-                disk_bytes_used,   total_disk_bytes   = float(h.local_gb_used)*1024**3,  float(h.local_gb)*1024**3  * ha['overcommit']['disk']
-
-                # save these values for scaling visual elements later on...
-                h.max_vcpus = max(vcpus_used, total_vcpus)
-                h.max_memory_bytes = max(memory_bytes_used, total_memory_bytes)
-                h.max_disk_bytes = max(disk_bytes_used, total_disk_bytes)
+            # count resources used by host but not allocated to any instance
+            h.cpuu  = (vcpus_used - sum(i.flavor_vcpus for i in h.instances))
+            h.memu  = (memory_bytes_used - sum(i.flavor_memory_bytes for i in h.instances))
+            h.disku = (disk_bytes_used - sum(i.flavor_disk_bytes for i in h.instances))
 
-                # colour hypervisors that are up
-                h.color = hypervisor_color(vcpus_used/total_vcpus, memory_bytes_used/total_memory_bytes, disk_bytes_used/total_disk_bytes) if h.state == 'up' else '#999'
+            # usage strings for cpu/mem/disk
+            h.cpu_usage  = '{n:d} / {t:.2g}'.format(n=int(vcpus_used), t=total_vcpus)
+            h.mem_usage  = usage_string(memory_bytes_used, total_memory_bytes)
+            h.disk_usage = usage_string(disk_bytes_used, total_disk_bytes)
 
-                # calculate how much of the hypervisor's resources each instance is using
-                for i in h.instances:
-                    i.status_symbol = hypervisor_status_symbol(i)
-                    i.cpuu  = i.flavor_vcpus
-                    i.memu  = i.flavor_memory_bytes
-                    i.disku = i.flavor_disk_bytes
+            # are resources overcommitted?
+            h.cpu_overcommit  = 'overcommitted' if vcpus_used > total_vcpus else ''
+            h.mem_overcommit  = 'overcommitted' if memory_bytes_used > total_memory_bytes else ''
+            h.disk_overcommit = 'overcommitted' if disk_bytes_used > total_disk_bytes else ''
 
-                # count resources used by host but not allocated to any instance
-                h.cpuu  = (vcpus_used - sum(i.flavor_vcpus for i in h.instances))
-                h.memu  = (memory_bytes_used - sum(i.flavor_memory_bytes for i in h.instances))
-                h.disku = (disk_bytes_used - sum(i.flavor_disk_bytes for i in h.instances))
+        # sort lists of hypervisors in host aggregates
+        ha['hypervisors'] = sorted(ha['hypervisors'], key=lambda hyp: hyp.short_name)
 
-                # usage strings for cpu/mem/disk
-                h.cpu_usage  = '{n:d} / {t:.2g}'.format(n=int(vcpus_used), t=total_vcpus)
-                h.mem_usage  = usage_string(memory_bytes_used, total_memory_bytes)
-                h.disk_usage = usage_string(disk_bytes_used, total_disk_bytes)
+    return host_aggregates
 
-                # are resources overcommitted?
-                h.cpu_overcommit  = 'overcommitted' if vcpus_used > total_vcpus else ''
-                h.mem_overcommit  = 'overcommitted' if memory_bytes_used > total_memory_bytes else ''
-                h.disk_overcommit = 'overcommitted' if disk_bytes_used > total_disk_bytes else ''
+class IndexView(views.APIView):
+    template_name = 'admin/hvlist/index.html'
 
-            # sort lists of hypervisors in host aggregates
-            ha['hypervisors'] = sorted(ha['hypervisors'], key=lambda hyp: hyp.short_name)
+    def get_data(self, request, context, *args, **kwargs):
+        # grab all the data (shared with other panels, see inventory module)
+        inventory = get_cluster_inventory(request, refresh='refresh' in request.GET)
+        errors = []
+        host_aggregates = build_host_aggregates(inventory, errors)
+        for e in errors:
+            messages.error(request, e)
+        hypervisors = inventory.hypervisors
 
         # scale by 100 everything that will be rendered as a percentage...
         # this would be better in a custom template tag, but here is a link
@@ -260,4 +276,60 @@ class IndexView(views.APIView):
         context['host_aggregates'] = host_aggregates
         context['used_count'] = sum(1 for h in hypervisors if h.instances)
         context['instance_count'] = sum(len(h.instances) for h in hypervisors)
+        context['inventory_age'] = int(inventory.age)
+        context['inventory_digest'] = inventory.digest
+        context['poll_interval'] = getattr(settings, 'NCI_HVLIST_POLL_INTERVAL', 60)
         return context
+
+class HeatmapView(django.views.generic.View):
+    """Return the hypervisor/instance usage matrix as compact JSON, so that the
+    page (or anything else) can poll for changes and redraw client-side.
+
+    Each response has an ETag, which is the digest of the cluster inventory.
+    If the client already has the current data, i.e. sends a matching
+    If-None-Match header (or "since" parameter), then 304 Not Modified is
+    returned without loading the inventory at all.
+    """
+    hypervisor_fields = ('host', 'aggregate', 'state', 'status', 'color', 'instances',
+        'vcpus_used', 'vcpus_total', 'memory_bytes_used', 'memory_bytes_total',
+        'disk_bytes_used', 'disk_bytes_total')
+    instance_fields = ('id', 'name', 'host', 'project', 'status', 'vcpus',
+        'memory_bytes', 'disk_bytes')
+
+    @staticmethod
+    def etag(digest):
+        return '"{}"'.format(digest)
+
+    def not_modified(self, digest):
+        response = HttpResponseNotModified()
+        response['ETag'] = self.etag(digest)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        known = request.GET.get('since', request.META.get('HTTP_IF_NONE_MATCH', '').strip('"'))
+        if known and known == get_cluster_inventory_digest(request):
+            return self.not_modified(known)
+
+        inventory = get_cluster_inventory(request)
+        if known == inventory.digest:
+            return self.not_modified(known)
+
+        host_aggregates = build_host_aggregates(inventory, [])
+        hypervisors = []
+        instances = []
+        for ha in host_aggregates:
+            for h in ha['hypervisors']:
+                hypervisors.append((h.host, ha['name'], h.state, h.status, h.color, len(h.instances)) +
+                    h.usage['vcpus'] + h.usage['memory_bytes'] + h.usage['disk_bytes'])
+                instances.extend((i.id, i.name, h.host, i.project.name, i.status,
+                    i.flavor_vcpus, i.flavor_memory_bytes, i.flavor_disk_bytes) for i in h.instances)
+
+        data = {
+            'digest': inventory.digest,
+            'timestamp': inventory.timestamp,
+            'hypervisors': {'fields': self.hypervisor_fields, 'rows': hypervisors},
+            'instances': {'fields': self.instance_fields, 'rows': instances},
+        }
+        response = HttpResponse(json.dumps(data, separators=(',', ':')), content_type='application/json')
+        response['ETag'] = self.etag(inventory.digest)
+        return response
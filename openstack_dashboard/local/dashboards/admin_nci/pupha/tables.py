@@ -125,6 +125,11 @@ class ProjectUsageTable(tables.DataTable):
         verbose_name = _('RAM'),
         filters      = [lambda mb: format_bytes(mb*1024*1024)],
         summation    = 'sum')
+    disk = tables.Column(
+        'disk_gb',
+        verbose_name = _('Disk'),
+        filters      = [lambda gb: format_bytes(gb*1024*1024*1024)],
+        summation    = 'sum')
     sus  = tables.Column(
         lambda pu: float(su(pu.vcpus, pu.memory_mb)), # without float cast, summation doesn't work (but with float cast, we could potentially lose nice formatting)
         verbose_name = _('SU'),
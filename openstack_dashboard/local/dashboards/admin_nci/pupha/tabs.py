@@ -16,7 +16,6 @@
 #    under the License.
 
 import types
-import itertools
 
 from .constants import TABLES_TEMPLATE_NAME, SUMMARY_TEMPLATE_NAME
 from . import tables
@@ -76,19 +75,7 @@ class ProjectsTab(tabs.TableTab):
         This must be called after (or from within) get_context_data, otherwise
         the necessary data will not have been loaded.
         """
-        # find instances running in this host aggregate
-        instances = list(itertools.chain(*(h.instances for h in host_aggregate.hypervisors)))
-
-        # find projects with instances running in this host aggregate
-        projects = set([i.project for i in instances])
-
-        # sum usage per project, and sort from most vcpus to fewest
-        return sorted([DictObject(
-            id        = p.id,
-            project   = p,
-            vcpus     = sum(i.flavor.vcpus for i in instances if i.project == p),
-            memory_mb = sum(i.flavor.ram   for i in instances if i.project == p)
-        ) for p in projects], key=lambda pu:pu.vcpus, reverse=True)
+        return host_aggregate.project_usage
 
     def get_context_data(self, request, **kwargs):
         # parent sets "{{ table_name }}_table" keys corresponding to items in table_classes
@@ -120,16 +107,7 @@ class SummaryTab(tabs.TableTab):
         super(SummaryTab, self).__init__(tab_group, request)
 
     def get_summary_data(self):
-        return [DictObject(
-            id             = a.aggregate.id,
-            name           = a.aggregate.name,
-            vcpus          = sum(h.vcpus for h in a.hypervisors),
-            memory_mb      = sum(h.memory_mb for h in a.hypervisors),
-            vcpus_used     = sum(h.vcpus_used for h in a.hypervisors),
-            memory_mb_used = sum(h.memory_mb_used for h in a.hypervisors),
-            vcpu_o         = a.overcommit['cpu'], # these keys are hard-coded
-            memory_mb_o    = a.overcommit['ram'], # to match nova.conf
-        ) for a in self.host_aggregates]
+        return [a.summary for a in self.host_aggregates]
 
 
 class HypervisorsTab(tabs.TableTab):
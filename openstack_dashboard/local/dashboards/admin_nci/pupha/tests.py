@@ -0,0 +1,131 @@
+# openstack_dashboard.local.dashboards.admin_nci.pupha.tests
+#
+# Copyright (c) 2016, NCI, Australian National University.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import itertools
+
+from openstack_dashboard.local.dashboards.admin_nci.pupha.tabs import \
+    DictObject
+from openstack_dashboard.local.dashboards.admin_nci.pupha import views
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import identity
+
+
+def multi_pass_project_usage(host_aggregate):
+    """The per-project usage as ProjectsTab used to calculate it."""
+    instances = list(itertools.chain(*(h.instances
+                                       for h in host_aggregate.hypervisors)))
+    projects = set([i.project for i in instances])
+    return dict((p.id, (sum(i.flavor.vcpus for i in instances
+                            if i.project == p),
+                        sum(i.flavor.ram for i in instances
+                            if i.project == p)))
+                for p in projects)
+
+
+def multi_pass_summary(host_aggregate):
+    """The summary as SummaryTab used to calculate it."""
+    a = host_aggregate
+    return {
+        'id': a.aggregate.id,
+        'name': a.aggregate.name,
+        'vcpus': sum(h.vcpus for h in a.hypervisors),
+        'memory_mb': sum(h.memory_mb for h in a.hypervisors),
+        'vcpus_used': sum(h.vcpus_used for h in a.hypervisors),
+        'memory_mb_used': sum(h.memory_mb_used for h in a.hypervisors),
+        'vcpu_o': a.overcommit['cpu'],
+        'memory_mb_o': a.overcommit['ram'],
+    }
+
+
+def hypervisor(vcpus, memory_mb, instances):
+    return DictObject(vcpus=vcpus, vcpus_used=len(instances),
+                      memory_mb=memory_mb,
+                      memory_mb_used=sum(i.flavor.ram for i in instances),
+                      instances=instances)
+
+
+def instance(project, flavor):
+    return DictObject(project=project, flavor=flavor)
+
+
+class HostAggregateTests(test.TestCase):
+    def setUp(self):
+        super(HostAggregateTests, self).setUp()
+        self.p1 = identity.Identity('p1', 'project1', True, '')
+        self.p2 = identity.Identity('p2', 'project2', True, '')
+        self.small = DictObject(**{'vcpus': 1, 'ram': 2048, 'disk': 20,
+                                   'OS-FLV-EXT-DATA:ephemeral': 0})
+        self.large = DictObject(**{'vcpus': 4, 'ram': 8192, 'disk': 40,
+                                   'OS-FLV-EXT-DATA:ephemeral': 100})
+        # Flavors from older clouds may not have the extension attribute.
+        self.plain = DictObject(vcpus=2, ram=4096, disk=10)
+
+    def _host_aggregate(self, hypervisors):
+        ha = views.HostAggregate(
+            aggregate=DictObject(id=1, name='agg1', hosts=[], metadata={}),
+            hypervisors=hypervisors)
+        ha.overcommit = {'cpu': 2.0, 'ram': 1.5, 'disk': 1.0}
+        ha.tabulate_usage()
+        return ha
+
+    def _assertMatchesMultiPass(self, ha):
+        self.assertEqual(multi_pass_project_usage(ha),
+                         dict((pu.id, (pu.vcpus, pu.memory_mb))
+                              for pu in ha.project_usage))
+        self.assertEqual(multi_pass_summary(ha),
+                         dict((k, getattr(ha.summary, k))
+                              for k in multi_pass_summary(ha)))
+
+    def test_tabulate_usage(self):
+        ha = self._host_aggregate([
+            hypervisor(16, 65536, [instance(self.p1, self.small),
+                                   instance(self.p2, self.large),
+                                   instance(self.p1, self.plain)]),
+            hypervisor(8, 32768, [instance(self.p2, self.small)]),
+            # Hosts with no instances still count towards the totals.
+            hypervisor(32, 131072, []),
+        ])
+
+        self._assertMatchesMultiPass(ha)
+        self.assertEqual(['p2', 'p1'], [pu.id for pu in ha.project_usage])
+        self.assertEqual(self.p2, ha.project_usage[0].project)
+        self.assertEqual({'p1': 30, 'p2': 160},
+                         dict((pu.id, pu.disk_gb)
+                              for pu in ha.project_usage))
+        self.assertEqual(56, ha.summary.vcpus)
+        self.assertEqual(4, ha.summary.vcpus_used)
+
+    def test_tabulate_usage_no_instances(self):
+        ha = self._host_aggregate([hypervisor(16, 65536, []),
+                                   hypervisor(8, 32768, [])])
+
+        self._assertMatchesMultiPass(ha)
+        self.assertEqual([], ha.project_usage)
+        self.assertEqual(24, ha.summary.vcpus)
+        self.assertEqual(0, ha.summary.memory_mb_used)
+
+    def test_tabulate_usage_no_hypervisors(self):
+        ha = self._host_aggregate([])
+
+        self._assertMatchesMultiPass(ha)
+        self.assertEqual([], ha.project_usage)
+        self.assertEqual(0, ha.summary.vcpus)
+        self.assertEqual(2.0, ha.summary.vcpu_o)
+
+
+# vim:ts=4 et sw=4 sts=4:
@@ -17,7 +17,6 @@
 
 import re
 
-from openstack_dashboard import api
 from openstack_dashboard.openstack.common import log as logging
 
 from horizon import tabs
@@ -28,11 +27,10 @@ from . import constants
 from .constants import short_name # separate import because it feels weird having short_name live in constants, so that may change..
 
 # surely there is a cleaner way to do this...?
-from novaclient.exceptions import NotFound as NotFoundNova
-from keystoneclient.openstack.common.apiclient.exceptions import NotFound as NotFoundKeystone
-
 from django.conf import settings
 
+from openstack_dashboard.local.nci.inventory import get_cluster_inventory
+
 LOG = logging.getLogger(__name__)
 
 def get_overcommit_ratios():
@@ -58,11 +56,45 @@ class HostAggregate(object):
                         instances -- list of objects with attributes including
                                        project
                                        flavor
+
+    and, once tabulate_usage has been called:
+      project_usage -- list of per-project usage objects, most vcpus first
+      summary       -- object with hypervisor resource totals
     """
     def __init__(self, aggregate, hypervisors=None):
         self.aggregate = aggregate
         self.hypervisors = [] if hypervisors == None else hypervisors
 
+    def tabulate_usage(self):
+        """
+        Sum resource usage per project, and hypervisor resources in total, in
+        a single sweep over the hypervisors (and their instances) in this host
+        aggregate. The results are shared by all the tabs, so no tab needs to
+        iterate over the instances itself.
+        """
+        hypervisor_fields = ('vcpus', 'memory_mb', 'vcpus_used', 'memory_mb_used')
+        totals = dict.fromkeys(hypervisor_fields, 0)
+        usage = {} # project id => usage object
+        for h in self.hypervisors:
+            for f in hypervisor_fields:
+                totals[f] += getattr(h, f)
+            for i in h.instances:
+                pu = usage.get(i.project.id)
+                if pu is None:
+                    pu = usage[i.project.id] = DictObject(id=i.project.id, project=i.project, vcpus=0, memory_mb=0, disk_gb=0)
+                pu.vcpus     += i.flavor.vcpus
+                pu.memory_mb += i.flavor.ram
+                pu.disk_gb   += i.flavor.disk + getattr(i.flavor, 'OS-FLV-EXT-DATA:ephemeral', 0)
+
+        self.project_usage = sorted(usage.values(), key=lambda pu:pu.vcpus, reverse=True)
+        self.summary = DictObject(
+            id          = self.aggregate.id,
+            name        = self.aggregate.name,
+            vcpu_o      = self.overcommit['cpu'], # these keys are hard-coded
+            memory_mb_o = self.overcommit['ram'], # to match nova.conf
+            **totals
+        )
+
 class IndexView(tabs.TabbedTableView):
     tab_group_class = TabGroup
     template_name = constants.TEMPLATE_NAME
@@ -75,7 +107,8 @@ class IndexView(tabs.TabbedTableView):
         objects.
 
         This is useful because it avoids re-fetching the same data for each Tab
-        in the TabGroup (which would take some time -- there's no caching).
+        in the TabGroup. (The data itself comes from the cluster inventory,
+        which is cached and shared with the hvlist panel.)
 
         This is a slightly hacky solution, because if the way that TabView
         instantiates its TabGroup changes such that it's no longer done in
@@ -83,15 +116,14 @@ class IndexView(tabs.TabbedTableView):
         like this least hacky way of doing it, though.
         (TabView.get_tabs performs the initialisation of the TabGroup.)
         """
-        aggregates   = api.nova.aggregate_details_list(request)
-        hypervisors  = api.nova.hypervisor_list(request)
-        instances, _ = api.nova.server_list(request, all_tenants=True)
-        projects, _  = api.keystone.tenant_list(request)
-        flavors      = api.nova.flavor_list(request)
-
-        # define these dicts to make it easier to look up objects
-        flavor_d     = {f.id : f for f in flavors}
-        project_d    = {p.id : p for p in projects}
+        inventory    = get_cluster_inventory(request, refresh='refresh' in request.GET)
+        aggregates   = inventory.aggregates
+        hypervisors  = inventory.hypervisors
+        instances    = inventory.instances
+        flavor_d     = inventory.flavor_d
+        project_d    = inventory.project_d
+
+        # define this dict to make it easier to look up objects
         hypervisor_d = {short_name(getattr(h, h.NAME_ATTR)) : h for h in hypervisors}
 
         # (only) this list ends up being shared with the TabGroup
@@ -122,25 +154,14 @@ class IndexView(tabs.TabbedTableView):
                 messages.error(request, 'Instance {} is missing host, so was ignored.'.format(i.id))
                 continue
 
-            # api.nova.flavor_list (which wraps novaclient.flavors.list) does not get all flavors,
-            # so if we have a reference to one that hasn't been retrieved, try looking it up specifically
-            # (wrap this rather trivially in a try block to make the error less cryptic)
+            # flavors and projects missing from the list results have already been
+            # looked up by the inventory, so any still missing no longer exist
             if i.flavor['id'] not in flavor_d:
-                try:
-                    LOG.debug('Extra lookup for flavor "{}"'.format(i.flavor['id']))
-                    flavor_d[i.flavor['id']] = api.nova.flavor_get(request, i.flavor['id'])
-                except NotFoundNova:
-                    messages.error(request, 'Instance {} has unknown flavor, so was ignored.'.format(i.id))
-                    continue
-
-            # maybe the same thing could happen for projects (haven't actually experienced this one though)
+                messages.error(request, 'Instance {} has unknown flavor, so was ignored.'.format(i.id))
+                continue
             if i.tenant_id not in project_d:
-                try:
-                    LOG.debug('Extra lookup for project "{}"'.format(i.tenant_id))
-                    project_d[i.tenant_id] = api.keystone.tenant_get(request, i.tenant_id)
-                except NotFoundKeystone:
-                    messages.error(request, 'Instance {} has unknown project, so was ignored.'.format(i.id))
-                    continue
+                messages.error(request, 'Instance {} has unknown project, so was ignored.'.format(i.id))
+                continue
 
             # expose related objects, so that no further lookups are required
             i.flavor  = flavor_d[i.flavor['id']]
@@ -171,5 +192,6 @@ class IndexView(tabs.TabbedTableView):
                     except ValueError:
                         LOG.debug('Could not parse host aggregate "{key}" metadata value "{value}" as float.'.format(key=k, value=h.aggregate.metadata[k]))
                         continue
+            h.tabulate_usage()
 
         return super(IndexView, self).get_tabs(request, host_aggregates=host_aggregates, **kwargs)
@@ -0,0 +1,101 @@
+# openstack_dashboard.local.dashboards.project_nci.instances.tests
+#
+# Copyright (c) 2015, NCI, Australian National University.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import json
+import os
+
+from django.conf.urls import include
+from django.conf.urls import patterns
+from django.conf.urls import url
+from django import http
+from django.template import loader
+from django.test.utils import override_settings
+
+from mox import IsA  # noqa
+
+from openstack_dashboard.local.dashboards.project_nci.instances import views
+from openstack_dashboard.local.nci import jobs as nci_jobs
+from openstack_dashboard.test import helpers as test
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+# Just enough of horizon's URLs to reverse the jobs view, which is only
+# registered once openstack_dashboard.local.nci's customisation has
+# replaced the instances panel.
+jobs_urls = patterns("", url(r"^jobs\.json$", views.JobsView.as_view(),
+                             name="jobs"))
+project_urls = patterns("", url(r"^instances/",
+                                include((jobs_urls, "instances",
+                                         "instances"))))
+horizon_urls = patterns("", url(r"^project/",
+                                include((project_urls, "project",
+                                         "project"))))
+urlpatterns = patterns("", url(r"^", include((horizon_urls, "horizon",
+                                              "horizon"))))
+
+
+def fake_job(status, messages=()):
+    return {"id": "job1",
+            "description": "Associate floating IPs",
+            "status": status,
+            "messages": list(messages),
+            "submitted": 0}
+
+
+class JobsViewTests(test.TestCase):
+    def _get_jobs(self):
+        request = self.factory.get("/jobs.json")
+        response = views.JobsView.as_view()(request)
+        return request, response
+
+    def test_pending_job(self):
+        self.mox.StubOutWithMock(nci_jobs, "get_user_jobs")
+        nci_jobs.get_user_jobs(IsA(http.HttpRequest), collect=True) \
+            .AndReturn([fake_job(nci_jobs.RUNNING)])
+        self.mox.ReplayAll()
+
+        request, response = self._get_jobs()
+        data = json.loads(response.content)
+        self.assertTrue(data["pending"])
+        self.assertEqual(["job1"], [j["id"] for j in data["jobs"]])
+        self.assertEqual(0, len(request._messages))
+
+    def test_finished_job_messages(self):
+        self.mox.StubOutWithMock(nci_jobs, "get_user_jobs")
+        nci_jobs.get_user_jobs(IsA(http.HttpRequest), collect=True) \
+            .AndReturn([fake_job(nci_jobs.FAILED,
+                                 [("error", "Unable to associate")])])
+        self.mox.ReplayAll()
+
+        request, response = self._get_jobs()
+        data = json.loads(response.content)
+        self.assertFalse(data["pending"])
+        self.assertEqual(["Unable to associate"],
+                         [m.message for m in request._messages])
+
+
+@override_settings(ROOT_URLCONF=__name__,
+                   TEMPLATE_DIRS=(TEMPLATE_DIR,))
+class JobsPollTemplateTests(test.TestCase):
+    def test_polls_jobs_view(self):
+        content = loader.render_to_string("instances_nci/_jobs_poll.html")
+        self.assertIn("url: '/project/instances/jobs.json'", content)
+
+
+# vim:ts=4 et sw=4 sts=4:
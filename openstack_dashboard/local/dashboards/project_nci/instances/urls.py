@@ -26,9 +26,13 @@ from . import views
 
 VIEW_MOD = "openstack_dashboard.local.dashboards.project_nci.instances.views"
 
-urlpatterns = []
+urlpatterns = patterns(VIEW_MOD,
+    url(r"^jobs\.json$", views.JobsView.as_view(), name="jobs"),
+)
 for x in orig_urlpatterns:
-    if getattr(x, "name", "") == "launch":
+    if getattr(x, "name", "") == "index":
+        x = patterns(VIEW_MOD, url(x.regex.pattern, views.NCIIndexView.as_view(), name=x.name))[0]
+    elif getattr(x, "name", "") == "launch":
         x = patterns(VIEW_MOD, url(x.regex.pattern, views.NCILaunchInstanceView.as_view(), name=x.name))[0]
 
     urlpatterns.append(x)
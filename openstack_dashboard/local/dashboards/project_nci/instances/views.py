@@ -16,13 +16,52 @@
 #    under the License.
 #
 
+import json
+
+import django.views.generic
+from django.conf import settings
+from django.http import HttpResponse
+
+from horizon import messages
+
 from openstack_dashboard.dashboards.project.instances import views as base_mod
+from openstack_dashboard.local.nci import jobs as nci_jobs
 
 from . import workflows
 
 
+class NCIIndexView(base_mod.IndexView):
+    template_name = "project/instances/../instances_nci/index.html"
+
+
 class NCILaunchInstanceView(base_mod.LaunchInstanceView):
     workflow_class = workflows.NCILaunchInstance
 
 
+class JobsView(django.views.generic.View):
+    """Return the status of the user's background jobs (such as associating
+    floating IPs with newly launched instances) as JSON.
+
+    The messages of jobs that have finished are also added to the response as
+    Horizon messages, which are shown by the page polling for them, and the
+    jobs are then forgotten.
+    """
+    def get(self, request, *args, **kwargs):
+        jobs = nci_jobs.get_user_jobs(request, collect=True)
+        pending = False
+        for job in jobs:
+            if job["status"] in (nci_jobs.QUEUED, nci_jobs.RUNNING):
+                pending = True
+            else:
+                for level, text in job["messages"]:
+                    getattr(messages, level)(request, text)
+
+        data = {
+            "jobs": jobs,
+            "pending": pending,
+            "poll_interval": getattr(settings, "NCI_JOB_POLL_INTERVAL", 5),
+        }
+        return HttpResponse(json.dumps(data), content_type="application/json")
+
+
 # vim:ts=4 et sw=4 sts=4:
@@ -46,6 +46,7 @@ from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.instances.workflows import create_instance as base_mod
 
 from openstack_dashboard.local.nci import crypto as ncicrypto
+from openstack_dashboard.local.nci import jobs as nci_jobs
 from openstack_dashboard.local.nci import utils as nciutils
 from openstack_dashboard.local.nci.constants import *
 
@@ -761,63 +762,82 @@ def server_create_hook_func(request, context, floats):
         srv = api.nova.server_create(*args, **kwargs)
 
         if float_nets:
-            # Find the ports created for the new instance which we need to
-            # associate each floating IP with.  We have to wait until the
-            # ports are created by Neutron.  Note that the only unique
-            # information we have to identify which port should be paired
-            # with each floating IP is the network ID.  Hence we don't
-            # support more than one interface connected to the same network
-            # when floating IPs are specified.
-            try:
-                max_attempts = 15
-                attempt = 0
-                while attempt < max_attempts:
-                    attempt += 1
-
-                    LOG.debug("Fetching network ports for instance: {0}".format(srv.id))
-                    ports = api.neutron.port_list(request, device_id=srv.id)
-                    for p in ports:
-                        LOG.debug("Found port: id={0}; owner={1}; network={2}".format(*[p.get(x) for x in ["id", "device_owner", "network_id"]]))
-                        if p.get("device_owner", "").startswith("compute:") and (p.get("network_id") in float_nets):
-                            for t in api.network.floating_ip_target_list_by_instance(request, srv.id):
-                                LOG.debug("Got floating IP target: {0}".format(t))
-                                if t.startswith(p.id):
-                                    float_id = float_nets[p.network_id]
-                                    api.network.floating_ip_associate(request, float_id, t)
-                                    del float_nets[p.network_id]
-                                    msg = _("Floating IP {0} associated with new instance.".format(floats[float_id].ip))
-                                    messages.info(request, msg)
-                                    break
-
-                    if not float_nets:
-                        # All floating IPs have now been assigned.
-                        srv = api.nova.server_get(request, srv.id)
-                        break
-
-                    status = api.nova.server_get(request, srv.id).status.lower()
-                    if status == "active":
-                        if max_attempts != 2:
-                            LOG.debug("VM state has become active")
-                            max_attempts = 2
-                            attempt = 0
-                    elif status != "build":
-                        LOG.debug("Aborting wait loop due to server status: {0}".format(status))
-                        break
-
-                    LOG.debug("Waiting for network port allocation")
-                    time.sleep(2)
-            except:
-                exceptions.handle(request)
+            # The ports for the new instance won't exist until Neutron has
+            # created them, which can take a while, so leave that to the job
+            # runner rather than holding up the launch request.
+            float_ips = dict((k, str(floats[k].ip)) for k in float_nets.itervalues())
+            nci_jobs.submit(request,
+                _("Associate floating IPs with instance {0}").format(srv.id),
+                associate_floating_ips, srv.id, float_nets, float_ips)
 
-            for f in float_nets.itervalues():
-                msg = _("Failed to associate floating IP {0} with new instance.".format(floats[f].ip))
-                messages.warning(request, msg)
+            msg = _("Floating IPs will be associated with the new instance once its network ports are ready.")
+            messages.info(request, msg)
 
         return srv
 
     return _impl
 
 
+def associate_floating_ips(job, request, server_id, float_nets, float_ips):
+    """Job that associates floating IPs with a new instance once the ports
+    they belong to have been created.
+
+    "float_nets" maps network IDs to floating IP IDs, and "float_ips" maps
+    the floating IP IDs to their addresses (for the messages).  "request"
+    only has the user of the launch request, which has finished by the time
+    the job runs.
+    """
+    # Find the ports created for the new instance which we need to
+    # associate each floating IP with.  We have to wait until the
+    # ports are created by Neutron.  Note that the only unique
+    # information we have to identify which port should be paired
+    # with each floating IP is the network ID.  Hence we don't
+    # support more than one interface connected to the same network
+    # when floating IPs are specified.
+    float_nets = dict(float_nets)
+    try:
+        max_attempts = 15
+        attempt = 0
+        while attempt < max_attempts:
+            attempt += 1
+
+            LOG.debug("Fetching network ports for instance: {0}".format(server_id))
+            ports = api.neutron.port_list(request, device_id=server_id)
+            for p in ports:
+                LOG.debug("Found port: id={0}; owner={1}; network={2}".format(*[p.get(x) for x in ["id", "device_owner", "network_id"]]))
+                if p.get("device_owner", "").startswith("compute:") and (p.get("network_id") in float_nets):
+                    for t in api.network.floating_ip_target_list_by_instance(request, server_id):
+                        LOG.debug("Got floating IP target: {0}".format(t))
+                        if t.startswith(p.id):
+                            float_id = float_nets[p.network_id]
+                            api.network.floating_ip_associate(request, float_id, t)
+                            del float_nets[p.network_id]
+                            msg = _("Floating IP {0} associated with new instance.").format(float_ips[float_id])
+                            job.success(msg)
+                            break
+
+            if not float_nets:
+                # All floating IPs have now been assigned.
+                break
+
+            status = api.nova.server_get(request, server_id).status.lower()
+            if status == "active":
+                if max_attempts != 2:
+                    LOG.debug("VM state has become active")
+                    max_attempts = 2
+                    attempt = 0
+            elif status != "build":
+                LOG.debug("Aborting wait loop due to server status: {0}".format(status))
+                break
+
+            LOG.debug("Waiting for network port allocation")
+            time.sleep(2)
+    finally:
+        for f in float_nets.itervalues():
+            msg = _("Failed to associate floating IP {0} with new instance.").format(float_ips[f])
+            job.warning(msg)
+
+
 def step_generator():
     for step in base_mod.LaunchInstance.default_steps:
         if step == base_mod.SetInstanceDetails:
@@ -0,0 +1,225 @@
+# openstack_dashboard.local.nci.inventory
+#
+# Copyright (c) 2015, NCI, Australian National University.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from keystoneclient import exceptions as keystone_exceptions
+from novaclient import exceptions as nova_exceptions
+
+from openstack_dashboard import api
+from openstack_dashboard.utils import concurrency
+from openstack_dashboard.utils import identity
+
+
+LOG = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "nci-cluster-inventory"
+
+# Serialises fetches of each inventory within this process so that
+# concurrent page loads wait for a single fetch rather than each starting
+# their own.  There is one lock per cache key (that is, per compute
+# endpoint) so that one slow region doesn't hold up the others.
+_fetch_locks = {}
+_fetch_locks_lock = threading.Lock()
+
+
+def _fetch_lock(key):
+    with _fetch_locks_lock:
+        return _fetch_locks.setdefault(key, threading.Lock())
+
+
+def _freeze(resources):
+    """Returns a picklable representation of a list of API resources.
+
+    The client resource objects hold a reference to their manager (and hence
+    the HTTP client) so can't be stored in the cache as-is.  Only the class
+    and the raw API response are kept.
+    """
+    return [(type(r), r._info) for r in resources]
+
+
+def _thaw(frozen):
+    return [cls(None, info, loaded=True) for (cls, info) in frozen]
+
+
+def _cache_key(request):
+    endpoint = api.base.url_for(request, "compute")
+    return "{0}:{1}".format(CACHE_KEY_PREFIX,
+                            hashlib.md5(endpoint.encode("utf-8")).hexdigest())
+
+
+def _resolve(request, kind, ids, getter, not_found):
+    """Looks up the given resource IDs concurrently.
+
+    Returns a list of the resources that were found.  IDs that don't exist
+    are remembered in the cache for ``NCI_CLUSTER_INVENTORY_NOT_FOUND_TTL``
+    seconds and skipped in the meantime, since deleted flavors (say) may
+    still be referenced by instances for a long time.  Any other failure is
+    logged and the resource left out, so that it is looked up again on the
+    next refresh.
+    """
+    keys = dict((i, "{0}:missing-{1}:{2}".format(CACHE_KEY_PREFIX, kind, i))
+                for i in ids)
+    known_missing = cache.get_many(keys.values())
+    ids = [i for i in ids if keys[i] not in known_missing]
+    if not ids:
+        return []
+
+    LOG.debug("Extra lookups for {0}s: {1}".format(kind, ", ".join(ids)))
+    results = concurrency.fan_out(
+        [functools.partial(getter, request, i) for i in ids],
+        max_workers=getattr(settings, "NCI_CLUSTER_INVENTORY_LOOKUP_WORKERS",
+                            10))
+
+    found = []
+    missing = {}
+    for i, result in zip(ids, results):
+        if not result.failed:
+            found.append(result.get())
+        elif isinstance(result.exception, not_found):
+            missing[keys[i]] = True
+        else:
+            LOG.warning("Unable to look up {0} {1}: {2}".format(
+                kind, i, result.exception))
+
+    if missing:
+        cache.set_many(missing,
+                       getattr(settings, "NCI_CLUSTER_INVENTORY_NOT_FOUND_TTL",
+                               3600))
+    return found
+
+
+def _fetch(request):
+    calls = [
+        functools.partial(api.nova.aggregate_details_list, request),
+        functools.partial(api.nova.hypervisor_list, request),
+        functools.partial(api.nova.server_list, request, all_tenants=True),
+        functools.partial(identity.projects.entries, request),
+        functools.partial(api.nova.flavor_list, request),
+    ]
+    results = [r.get() for r in concurrency.fan_out(calls)]
+    aggregates, hypervisors, (instances, _), projects, flavors = results
+
+    # The flavor list doesn't include deleted or private flavors, and the
+    # shared project directory can be stale, so resolve any that are
+    # referenced by instances in bulk rather than one at a time later on.
+    missing_flavors = (set(i.flavor["id"] for i in instances) -
+                       set(f.id for f in flavors))
+    missing_projects = set(i.tenant_id for i in instances) - set(projects)
+    flavors = flavors + _resolve(request, "flavor", missing_flavors,
+                                 api.nova.flavor_get,
+                                 nova_exceptions.NotFound)
+    projects = list(projects.values()) + _resolve(
+        request, "project", missing_projects, identity.projects.get,
+        keystone_exceptions.NotFound)
+
+    frozen = {
+        "aggregates": _freeze(aggregates),
+        "hypervisors": _freeze(hypervisors),
+        "instances": _freeze([i._apiresource for i in instances]),
+        "flavors": _freeze(flavors),
+    }
+
+    # The digest only changes when the data does, unlike the timestamp, so
+    # clients polling for changes can use it as an ETag.
+    content = dict((k, [info for (cls, info) in v])
+                   for (k, v) in frozen.items())
+    content["projects"] = sorted(projects)
+    content = json.dumps(content, sort_keys=True, default=str)
+
+    # The project identities are plain tuples so can be cached as they are.
+    frozen["projects"] = projects
+    frozen["digest"] = hashlib.md5(content.encode("utf-8")).hexdigest()
+    frozen["timestamp"] = time.time()
+    return frozen
+
+
+class ClusterInventory(object):
+    """Snapshot of the host aggregates, hypervisors, instances, projects and
+    flavors across the whole cloud.
+
+    Each instance gets its own copy of the resource objects, so callers are
+    free to decorate them with extra attributes.  The projects are the
+    (immutable) identities from :mod:`openstack_dashboard.utils.identity`.
+    """
+
+    def __init__(self, request, frozen):
+        self.digest = frozen["digest"]
+        self.timestamp = frozen["timestamp"]
+        self.aggregates = _thaw(frozen["aggregates"])
+        self.hypervisors = _thaw(frozen["hypervisors"])
+        self.instances = [api.nova.Server(s, request)
+                          for s in _thaw(frozen["instances"])]
+        self.projects = list(frozen["projects"])
+        self.flavors = _thaw(frozen["flavors"])
+
+        # Instances referencing flavors or projects that aren't in these
+        # dicts have been deleted.
+        self.flavor_d = dict((f.id, f) for f in self.flavors)
+        self.project_d = dict((p.id, p) for p in self.projects)
+
+    @property
+    def age(self):
+        """Number of seconds since the data was fetched."""
+        return max(0, time.time() - self.timestamp)
+
+
+def get_cluster_inventory(request, refresh=False):
+    """Returns a :class:`ClusterInventory`, from the cache where possible.
+
+    The snapshot is shared by all users for up to ``NCI_CLUSTER_INVENTORY_TTL``
+    seconds.  If ``refresh`` is true then the cache is bypassed and a new
+    snapshot is fetched, unless one was fetched by another request while
+    this one was waiting.
+    """
+    key = _cache_key(request)
+    requested = time.time()
+    frozen = None if refresh else cache.get(key)
+    if frozen is None:
+        with _fetch_lock(key):
+            frozen = cache.get(key)
+            if (frozen is None) or (refresh and
+                                    frozen["timestamp"] < requested):
+                LOG.debug("Fetching cluster inventory.")
+                frozen = _fetch(request)
+                cache.set_many({key: frozen, key + ":digest": frozen["digest"]},
+                               getattr(settings, "NCI_CLUSTER_INVENTORY_TTL",
+                                       60))
+
+    return ClusterInventory(request, frozen)
+
+
+def get_cluster_inventory_digest(request):
+    """Returns the digest of the cached cluster inventory, or None if there is
+    no cached inventory.
+
+    This is much cheaper than loading the inventory itself, so can be used to
+    check whether a client already has the latest data.
+    """
+    return cache.get(_cache_key(request) + ":digest")
+
+
+# vim:ts=4 et sw=4 sts=4:
@@ -0,0 +1,250 @@
+# openstack_dashboard.local.nci.jobs
+#
+# Copyright (c) 2015, NCI, Australian National University.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import copy
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django import http
+from django.utils.translation import ugettext_lazy as _
+
+from six.moves import queue
+
+
+LOG = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "nci-job"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+# Number of the most recent jobs of each user that are reported.
+MAX_USER_JOBS = 50
+
+
+def _job_key(job_id, suffix=""):
+    return "{0}:{1}{2}".format(CACHE_KEY_PREFIX, job_id, suffix)
+
+
+def _user_key(request, suffix):
+    return "{0}s:{1}:{2}".format(CACHE_KEY_PREFIX, request.user.id, suffix)
+
+
+def _ttl():
+    return getattr(settings, "NCI_JOB_TTL", 3600)
+
+
+def _period(when, ttl):
+    # Jobs are numbered separately in each period of "ttl" seconds, so that
+    # the count of a period only has to be kept until every job numbered
+    # with it has expired, at the end of the following period.
+    return int(when // max(ttl, 1))
+
+
+def _detach(request):
+    """Returns a new request with just the user (and hence the token and
+    region) of the given one.
+
+    A job runs after the request that submitted it has finished, so it
+    mustn't use that request, its session or anything memoized for it.
+    """
+    user = request.user
+    # Evaluate a lazy user and copy the user it wraps, so that the copy
+    # doesn't refer to the request.
+    user.is_authenticated()
+    detached = http.HttpRequest()
+    detached.user = copy.copy(getattr(user, '_wrapped', user))
+    return detached
+
+
+class Job(object):
+    """Handle passed to a job's function for reporting its progress.
+
+    The messages are shown to the user who submitted the job, through the
+    status endpoint, once the job has finished.
+    """
+
+    def __init__(self, job_id, description):
+        self.id = job_id
+        self.description = description
+        self.status = QUEUED
+        self.messages = []
+        self.submitted = time.time()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "description": self.description,
+            "status": self.status,
+            "messages": list(self.messages),
+            "submitted": self.submitted,
+        }
+
+    def save(self):
+        cache.set(_job_key(self.id), self.to_dict(), _ttl())
+
+    def info(self, message):
+        self.messages.append(("info", unicode(message)))
+
+    def success(self, message):
+        self.messages.append(("success", unicode(message)))
+
+    def warning(self, message):
+        self.messages.append(("warning", unicode(message)))
+
+    def error(self, message):
+        self.messages.append(("error", unicode(message)))
+
+
+class JobRunner(object):
+    """Runs jobs, such as post-processing after an instance is launched, in
+    a fixed pool of background threads so that the request which submitted
+    them needn't wait for them.
+
+    The status of each job is kept in the Django cache for ``NCI_JOB_TTL``
+    seconds.  A job runs in the process that it was submitted to, so the
+    cache must be shared between the dashboard's processes (such as
+    memcached) for its status to be reported reliably to the user; a
+    warning is logged if it's the per-process local memory cache.  The
+    worker threads are only started when the first job is submitted.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def _start_workers(self):
+        with self._lock:
+            backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+            if not self._workers and backend.endswith(".LocMemCache"):
+                LOG.warning("Background jobs are tracked in a local memory "
+                            "cache, so their status is only reported to "
+                            "requests served by the same process.")
+            while len(self._workers) < getattr(settings, "NCI_JOB_WORKERS", 4):
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self._workers.append(thread)
+
+    def _work(self):
+        while True:
+            self._run(*self._queue.get())
+
+    def _run(self, job, func, args, kwargs):
+        job.status = RUNNING
+        job.save()
+        try:
+            func(job, *args, **kwargs)
+            job.status = SUCCEEDED
+        except Exception as e:
+            LOG.exception("Job failed: {0}".format(job.description))
+            job.status = FAILED
+            job.error(_("{0} failed: {1}").format(job.description, e))
+        finally:
+            job.save()
+
+    def submit(self, request, description, func, *args, **kwargs):
+        """Queues ``func(job, request, *args, **kwargs)`` to be run in the
+        background and returns the job ID.
+
+        ``job`` is the :class:`Job`, used to report messages to the user,
+        and ``request`` a copy of the submitting request with just its user
+        (see :func:`_detach`), for making API calls.  The job is considered
+        failed if the function raises an exception.
+        """
+        job = Job(uuid.uuid4().hex, unicode(description))
+        job.save()
+
+        # Each job of a user gets its own numbered key, so that concurrent
+        # requests don't overwrite each other's jobs.
+        ttl = _ttl()
+        period = _period(job.submitted, ttl)
+        count_key = _user_key(request, "{0}:count".format(period))
+        cache.add(count_key, 0, 2 * ttl)
+        try:
+            number = cache.incr(count_key)
+        except ValueError:
+            # The count has been evicted from the cache.
+            cache.add(count_key, 0, 2 * ttl)
+            number = cache.incr(count_key)
+        cache.set(_user_key(request, "{0}:{1}".format(period, number)),
+                  job.id, ttl)
+
+        self._start_workers()
+        self._queue.put((job, func, (_detach(request),) + args, kwargs))
+        return job.id
+
+
+runner = JobRunner()
+
+
+def submit(request, description, func, *args, **kwargs):
+    """Submits a job to the shared :class:`JobRunner`."""
+    return runner.submit(request, description, func, *args, **kwargs)
+
+
+def get_user_jobs(request, collect=False):
+    """Returns the status dicts of the most recent jobs submitted by the
+    current user, oldest first.
+
+    If ``collect`` is true then finished jobs are forgotten once returned,
+    so that their messages are only reported once, even to concurrent
+    requests.
+    """
+    # Jobs from before the previous period have expired.
+    period = _period(time.time(), _ttl())
+    periods = (period - 1, period)
+    counts = cache.get_many([_user_key(request, "{0}:count".format(p))
+                             for p in periods])
+    slots = []
+    for p in periods:
+        count = counts.get(_user_key(request, "{0}:count".format(p)), 0)
+        slots.extend(_user_key(request, "{0}:{1}".format(p, n))
+                     for n in range(max(1, count - MAX_USER_JOBS + 1),
+                                    count + 1))
+    slots = slots[-MAX_USER_JOBS:]
+    found = cache.get_many(slots)
+    job_ids = [found[s] for s in slots if s in found]
+
+    keys = [_job_key(i) for i in job_ids]
+    keys.extend(_job_key(i, ":collected") for i in job_ids)
+    found = cache.get_many(keys)
+
+    jobs = []
+    for job_id in job_ids:
+        job = found.get(_job_key(job_id))
+        if job is None or _job_key(job_id, ":collected") in found:
+            continue
+        if collect and job["status"] not in (QUEUED, RUNNING):
+            # Only the request that marks the job as collected returns it.
+            if not cache.add(_job_key(job_id, ":collected"), True, _ttl()):
+                continue
+        jobs.append(job)
+
+    return jobs
+
+
+# vim:ts=4 et sw=4 sts=4:
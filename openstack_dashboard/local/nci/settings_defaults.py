@@ -45,3 +45,37 @@ NCI_SU_MEMORY_MB = 4096.
 # Pattern to match hypervisor.hypervisor_hostname (e.g. "tc097.ncmgmt") and
 # instance.host_server (e.g. "tc097"), with common part as group 'name'
 NCI_HOSTNAME_PATTERN = r'^(?P<name>tc\d+)(\.ncmgmt)?$'
+
+# Number of seconds for which the cluster inventory (host aggregates,
+# hypervisors, instances, projects and flavors) used by the admin hypervisor
+# panels is cached and shared between requests.
+NCI_CLUSTER_INVENTORY_TTL = 60
+
+# Number of seconds for which a flavor or project that is referenced by an
+# instance but no longer exists is remembered, so that it isn't looked up
+# again every time the cluster inventory is refreshed.
+NCI_CLUSTER_INVENTORY_NOT_FOUND_TTL = 3600
+
+# Maximum number of concurrent lookups, per cluster inventory fetch, of
+# flavors or projects that are referenced by instances but missing from the
+# list results.
+NCI_CLUSTER_INVENTORY_LOOKUP_WORKERS = 10
+
+# Number of seconds between polls for changes by the hypervisor list panel,
+# which then redraws the hypervisor colours and counts in place.  Set to 0 to
+# disable polling.
+NCI_HVLIST_POLL_INTERVAL = 60
+
+# Number of background threads in each process that run post-processing jobs,
+# such as associating floating IPs with newly launched instances.
+NCI_JOB_WORKERS = 4
+
+# Number of seconds for which the status of a background job is kept, in the
+# Django cache.  The jobs run in the process that launched the instance, so a
+# cache that is shared between the dashboard's processes (such as memcached)
+# is needed for their status and messages to be shown reliably.
+NCI_JOB_TTL = 3600
+
+# Number of seconds between polls by the instances panel for the status of the
+# user's background jobs, while any are still running.
+NCI_JOB_POLL_INTERVAL = 5
@@ -0,0 +1,305 @@
+# openstack_dashboard.local.nci.tests
+#
+# Copyright (c) 2015, NCI, Australian National University.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from keystoneclient import exceptions as keystone_exceptions
+from mox import IsA  # noqa
+from novaclient import exceptions as nova_exceptions
+
+from openstack_dashboard import api
+from openstack_dashboard.local.nci import inventory
+from openstack_dashboard.local.nci import jobs
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import concurrency
+from openstack_dashboard.utils import identity
+
+
+def associate(job, request, address):
+    job.success("Associated {0}".format(address))
+
+
+def fail(job, request):
+    raise Exception("No ports")
+
+
+class JobRunnerTests(test.TestCase):
+    def setUp(self):
+        super(JobRunnerTests, self).setUp()
+        cache.clear()
+        self.runner = jobs.JobRunner()
+        # The jobs are run by the test rather than by worker threads.
+        self.mox.stubs.Set(self.runner, "_start_workers", lambda: None)
+
+    def _run_queued(self):
+        while not self.runner._queue.empty():
+            self.runner._run(*self.runner._queue.get_nowait())
+
+    def test_submit(self):
+        job_id = self.runner.submit(self.request, "Associate", associate,
+                                    "10.0.0.1")
+
+        job, = jobs.get_user_jobs(self.request, collect=True)
+        self.assertEqual(job_id, job["id"])
+        self.assertEqual(jobs.QUEUED, job["status"])
+        self.assertEqual("Associate", job["description"])
+
+        self._run_queued()
+        job, = jobs.get_user_jobs(self.request, collect=True)
+        self.assertEqual(jobs.SUCCEEDED, job["status"])
+        self.assertEqual([["success", "Associated 10.0.0.1"]],
+                         [list(m) for m in job["messages"]])
+
+        # A finished job is only collected once.
+        self.assertEqual([], jobs.get_user_jobs(self.request, collect=True))
+
+    def test_failed_job(self):
+        self.runner.submit(self.request, "Associate", fail)
+        self._run_queued()
+
+        job, = jobs.get_user_jobs(self.request)
+        self.assertEqual(jobs.FAILED, job["status"])
+        self.assertEqual("error", job["messages"][0][0])
+        self.assertIn("No ports", job["messages"][0][1])
+
+    def test_jobs_kept_until_collected(self):
+        first = self.runner.submit(self.request, "First", associate, "a")
+        self._run_queued()
+        second = self.runner.submit(self.request, "Second", associate, "b")
+
+        self.assertEqual([first, second],
+                         [j["id"] for j in jobs.get_user_jobs(self.request)])
+        self.assertEqual([first, second],
+                         [j["id"] for j in
+                          jobs.get_user_jobs(self.request, collect=True)])
+        # Only the pending job is left.
+        self.assertEqual([second],
+                         [j["id"] for j in jobs.get_user_jobs(self.request)])
+
+    def test_most_recent_jobs(self):
+        self.mox.stubs.Set(jobs, "MAX_USER_JOBS", 2)
+        job_ids = [self.runner.submit(self.request, "Job", associate, i)
+                   for i in range(3)]
+
+        self.assertEqual(job_ids[1:],
+                         [j["id"] for j in jobs.get_user_jobs(self.request)])
+
+    def test_detached_request(self):
+        requests = []
+
+        def record(job, request):
+            requests.append(request)
+
+        self.runner.submit(self.request, "Record", record)
+        self._run_queued()
+
+        request, = requests
+        self.assertIsNot(self.request, request)
+        self.assertFalse(hasattr(request, "session"))
+        self.assertEqual(self.request.user.id, request.user.id)
+        self.assertEqual(self.request.user.token.id, request.user.token.id)
+        # It's a copy of the user itself, rather than of the lazy object.
+        self.assertTrue(request.user.is_authenticated())
+        self.assertEqual(self.request.user.services_region,
+                         request.user.services_region)
+
+    @override_settings(NCI_JOB_TTL=100)
+    def test_jobs_across_periods(self):
+        now = [1090.0]
+        self.mox.stubs.Set(jobs.time, "time", lambda: now[0])
+        first = self.runner.submit(self.request, "First", associate, "a")
+        now[0] = 1110.0
+        second = self.runner.submit(self.request, "Second", associate, "b")
+
+        # The count of each period is kept until its jobs have expired.
+        self.assertEqual([first, second],
+                         [j["id"] for j in jobs.get_user_jobs(self.request)])
+        now[0] = 1195.0
+        self.assertEqual([second],
+                         [j["id"] for j in jobs.get_user_jobs(self.request)])
+
+
+class ClusterInventoryTests(test.APITestCase):
+    def setUp(self):
+        super(ClusterInventoryTests, self).setUp()
+        cache.clear()
+        self.calls = []
+        self.flavor_list = self.flavors.list()
+        servers = [api.nova.Server(s, self.request)
+                   for s in self.servers.list()]
+        self.project_d = dict(
+            (t.id, identity.Identity(t.id, t.name, t.enabled, t.description))
+            for t in self.tenants.list())
+
+        self._stub(api.nova, "aggregate_details_list", lambda request: [])
+        self._stub(api.nova, "hypervisor_list",
+                   lambda request: self.hypervisors.list())
+        self._stub(api.nova, "server_list",
+                   lambda request, all_tenants: (servers, False))
+        self._stub(identity.projects, "entries",
+                   lambda request: self.project_d)
+        self._stub(api.nova, "flavor_list", lambda request: self.flavor_list)
+
+    def _stub(self, obj, name, func):
+        def stub(request, *args, **kwargs):
+            self.calls.append((name,) + args)
+            return func(request, *args, **kwargs)
+        self.mox.stubs.Set(obj, name, stub)
+
+    def _count(self, name):
+        return len([c for c in self.calls if c[0] == name])
+
+    def test_cached(self):
+        first = inventory.get_cluster_inventory(self.request)
+        second = inventory.get_cluster_inventory(self.request)
+
+        for name in ("aggregate_details_list", "hypervisor_list",
+                     "server_list", "entries", "flavor_list"):
+            self.assertEqual(1, self._count(name), name)
+        self.assertEqual(first.digest, second.digest)
+        self.assertEqual(first.digest,
+                         inventory.get_cluster_inventory_digest(self.request))
+        self.assertEqual(len(self.servers.list()), len(second.instances))
+        self.assertEqual(set(self.project_d), set(second.project_d))
+
+        # Each caller gets its own copies of the resources.
+        self.assertIsNot(first.instances[0], second.instances[0])
+
+    def test_refresh(self):
+        first = inventory.get_cluster_inventory(self.request)
+        self.flavor_list = self.flavors.list()[:1]
+        second = inventory.get_cluster_inventory(self.request, refresh=True)
+
+        self.assertEqual(2, self._count("server_list"))
+        self.assertNotEqual(first.digest, second.digest)
+        self.assertEqual(second.digest,
+                         inventory.get_cluster_inventory_digest(self.request))
+
+    def test_no_inventory_digest(self):
+        self.assertIsNone(
+            inventory.get_cluster_inventory_digest(self.request))
+
+    @override_settings(NCI_CLUSTER_INVENTORY_LOOKUP_WORKERS=3)
+    def test_lookups_fanned_out(self):
+        # Every server refers to the first flavor.
+        missing = self.flavors.first()
+        self.flavor_list = self.flavors.list()[1:]
+        self._stub(api.nova, "flavor_get", lambda request, i: missing)
+        workers = []
+
+        def fan_out(calls, max_workers=None, timeout=None):
+            workers.append(max_workers)
+            return real_fan_out(calls, max_workers, timeout)
+        real_fan_out = concurrency.fan_out
+        self.mox.stubs.Set(concurrency, "fan_out", fan_out)
+
+        inv = inventory.get_cluster_inventory(self.request)
+
+        self.assertEqual([None, 3], workers)
+        self.assertEqual([("flavor_get", missing.id)],
+                         [c for c in self.calls if c[0] == "flavor_get"])
+        self.assertEqual(missing.name, inv.flavor_d[missing.id].name)
+
+    def test_lookup_failure(self):
+        missing = self.flavors.first()
+        self.flavor_list = self.flavors.list()[1:]
+
+        def flavor_get(request, flavor_id):
+            raise self.exceptions.nova
+
+        self._stub(api.nova, "flavor_get", flavor_get)
+
+        inv = inventory.get_cluster_inventory(self.request)
+        self.assertNotIn(missing.id, inv.flavor_d)
+
+        # Unlike a flavor that doesn't exist, it is looked up again.
+        inventory.get_cluster_inventory(self.request, refresh=True)
+        self.assertEqual(2, self._count("flavor_get"))
+
+    def test_missing_resolved(self):
+        flavor = self.flavors.first()
+        self.flavor_list = self.flavors.list()[1:]
+        tenant = self.tenants.first()
+        project = self.project_d.pop(tenant.id)
+        self._stub(api.nova, "flavor_get", lambda request, i: flavor)
+        self._stub(identity.projects, "get", lambda request, i: project)
+
+        inv = inventory.get_cluster_inventory(self.request)
+
+        self.assertEqual([("flavor_get", flavor.id)],
+                         [c for c in self.calls if c[0] == "flavor_get"])
+        self.assertEqual([("get", tenant.id)],
+                         [c for c in self.calls if c[0] == "get"])
+        self.assertEqual(flavor.name, inv.flavor_d[flavor.id].name)
+        self.assertEqual(project, inv.project_d[tenant.id])
+
+        # The lookups are part of the cached snapshot.
+        inventory.get_cluster_inventory(self.request)
+        self.assertEqual(1, self._count("flavor_get"))
+        self.assertEqual(1, self._count("get"))
+
+    def test_not_found_remembered(self):
+        flavor = self.flavors.first()
+        self.flavor_list = self.flavors.list()[1:]
+        tenant = self.tenants.first()
+        del self.project_d[tenant.id]
+
+        def flavor_get(request, flavor_id):
+            raise nova_exceptions.NotFound(404)
+
+        def project_get(request, project_id):
+            raise keystone_exceptions.NotFound()
+
+        self._stub(api.nova, "flavor_get", flavor_get)
+        self._stub(identity.projects, "get", project_get)
+
+        inv = inventory.get_cluster_inventory(self.request)
+        self.assertNotIn(flavor.id, inv.flavor_d)
+        self.assertNotIn(tenant.id, inv.project_d)
+
+        # The missing IDs aren't looked up again on a refresh...
+        inventory.get_cluster_inventory(self.request, refresh=True)
+        self.assertEqual(2, self._count("server_list"))
+        self.assertEqual(1, self._count("flavor_get"))
+        self.assertEqual(1, self._count("get"))
+
+        # ...until they are forgotten.
+        cache.clear()
+        inventory.get_cluster_inventory(self.request)
+        self.assertEqual(2, self._count("flavor_get"))
+        self.assertEqual(2, self._count("get"))
+
+    @override_settings(NCI_CLUSTER_INVENTORY_NOT_FOUND_TTL=0)
+    def test_not_found_ttl(self):
+        self.flavor_list = self.flavors.list()[1:]
+
+        def flavor_get(request, flavor_id):
+            raise nova_exceptions.NotFound(404)
+
+        self._stub(api.nova, "flavor_get", flavor_get)
+        self.mox.StubOutWithMock(cache, "set_many")
+        cache.set_many({"{0}:missing-flavor:{1}".format(
+            inventory.CACHE_KEY_PREFIX, self.flavors.first().id): True}, 0)
+        cache.set_many(IsA(dict), IsA(int))
+        self.mox.ReplayAll()
+
+        inventory.get_cluster_inventory(self.request)
+
+
+# vim:ts=4 et sw=4 sts=4:
@@ -0,0 +1,110 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import optparse
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand  # noqa
+from django.core.management.base import CommandError  # noqa
+from django import http
+from keystoneclient.auth.identity import generic
+from keystoneclient import session
+from openstack_auth import user as auth_user
+
+from horizon import exceptions
+
+from openstack_dashboard import api  # noqa
+from openstack_dashboard.utils import capabilities
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        optparse.make_option('--auth-url',
+                             default=os.environ.get('OS_AUTH_URL'),
+                             help='Keystone URL (default: $OS_AUTH_URL or '
+                                  'OPENSTACK_KEYSTONE_URL)'),
+        optparse.make_option('--username',
+                             default=os.environ.get('OS_USERNAME'),
+                             help='User name (default: $OS_USERNAME)'),
+        optparse.make_option('--password',
+                             default=os.environ.get('OS_PASSWORD'),
+                             help='Password (default: $OS_PASSWORD)'),
+        optparse.make_option('--project',
+                             default=(os.environ.get('OS_PROJECT_NAME') or
+                                      os.environ.get('OS_TENANT_NAME')),
+                             help='Project name (default: $OS_PROJECT_NAME)'),
+        optparse.make_option('--user-domain',
+                             default=os.environ.get('OS_USER_DOMAIN_NAME'),
+                             help='User domain name for keystone v3 '
+                                  '(default: $OS_USER_DOMAIN_NAME)'),
+        optparse.make_option('--project-domain',
+                             default=os.environ.get('OS_PROJECT_DOMAIN_NAME'),
+                             help='Project domain name for keystone v3 '
+                                  '(default: $OS_PROJECT_DOMAIN_NAME)'),
+        optparse.make_option('--region',
+                             default=os.environ.get('OS_REGION_NAME'),
+                             help='Region of the services (default: '
+                                  '$OS_REGION_NAME or the first region)'),
+    )
+    help = ("Fetches the extensions supported by the nova, neutron and cinder "
+            "endpoints into the cache, so that the first requests served "
+            "don't have to.  The dashboard must use a cache shared between "
+            "processes (such as memcached) for this to be of use.")
+
+    def _request(self, options):
+        auth_url = options['auth_url'] or getattr(settings,
+                                                  'OPENSTACK_KEYSTONE_URL',
+                                                  None)
+        if not (auth_url and options['username'] and options['password']):
+            raise CommandError("A keystone URL, user name and password are "
+                               "required.")
+
+        auth = generic.Password(
+            auth_url=auth_url,
+            username=options['username'],
+            password=options['password'],
+            project_name=options['project'],
+            user_domain_name=options['user_domain'],
+            project_domain_name=options['project_domain'])
+        verify = getattr(settings, 'OPENSTACK_SSL_CACERT', None) or not \
+            getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
+        try:
+            auth_ref = auth.get_access(session.Session(verify=verify))
+        except Exception as e:
+            raise CommandError("Unable to authenticate: %s" % e)
+
+        request = http.HttpRequest()
+        request.session = {}
+        request.user = auth_user.create_user_from_token(
+            request, auth_user.Token(auth_ref), auth_url,
+            services_region=options['region'])
+        return request
+
+    def handle(self, *args, **options):
+        request = self._request(options)
+        failed = False
+        for registry in capabilities.registries():
+            try:
+                registry.prewarm(request)
+            except exceptions.ServiceCatalogException:
+                self.stdout.write("Skipped %s: no endpoint in the service "
+                                  "catalog." % registry.kind)
+            except Exception as e:
+                failed = True
+                self.stderr.write("Unable to fetch the %s capabilities: %s"
+                                  % (registry.kind, e))
+            else:
+                self.stdout.write("Fetched the %s capabilities."
+                                  % registry.kind)
+        if failed:
+            raise CommandError("Some capabilities could not be fetched.")
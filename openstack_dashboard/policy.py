@@ -26,6 +26,26 @@ def check(actions, request, target=None):
     return True
 
 
+def check_many(checks, request):
+    """Wrapper of the configurable method to make several policy checks.
+
+    ``checks`` is a list of (actions, target) tuples, and a list of the
+    results of each is returned.  The checks are made in one pass by
+    ``POLICY_CHECK_MANY_FUNCTION`` if it's set, or else one at a time.
+    """
+
+    policy_check_many = getattr(settings, "POLICY_CHECK_MANY_FUNCTION", None)
+    policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
+
+    if policy_check_many and policy_check:
+        return policy_check_many(checks, request)
+    if policy_check:
+        return [policy_check(actions, request, target)
+                for actions, target in checks]
+
+    return [True for check in checks]
+
+
 class PolicyTargetMixin(object):
     """Mixin that adds the get_policy_target function
 
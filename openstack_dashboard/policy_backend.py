@@ -13,8 +13,10 @@
 
 """Policy engine for Horizon"""
 
+import collections
 import logging
 import os.path
+import threading
 
 from django.conf import settings
 from openstack_auth import utils as auth_utils
@@ -35,6 +37,43 @@ CONF.policy_dirs = []
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
 
+# The decisions made with the rules of each scope, as a _Decisions.  The
+# enforcers only replace their rules when the policy files are modified, so
+# the decisions are forgotten whenever that happens.
+_DECISIONS = {}
+# The number of decisions kept for each scope, as the targets include IDs.
+_MAX_DECISIONS = 10000
+
+
+class _Decisions(object):
+    """A bounded, least recently used, map of the (action, credentials,
+    target) of each check to the decision made with one version of a
+    scope's rules.  It's shared by the threads serving requests.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the decision for the key, or None if there isn't one.
+
+        Raises TypeError if part of the key isn't hashable.
+        """
+        with self._lock:
+            decision = self._entries.pop(key, None)
+            if decision is not None:
+                self._entries[key] = decision
+            return decision
+
+    def set(self, key, decision):
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= _MAX_DECISIONS:
+                self._entries.popitem(last=False)
+            self._entries[key] = decision
+
 
 def _get_enforcer():
     global _ENFORCER
@@ -57,6 +96,7 @@ def _get_enforcer():
 def reset():
     global _ENFORCER
     _ENFORCER = None
+    _DECISIONS.clear()
 
 
 def check(actions, request, target=None):
@@ -97,9 +137,40 @@ def check(actions, request, target=None):
     :returns: boolean if the user has permission or not for the actions.
     """
 
-    if target is None:
-        target = {}
+    return check_many(((actions, target),), request)[0]
+
+
+def check_many(checks, request):
+    """Check user permission for several sets of actions at once.
+
+    :param checks: list of (actions, target) tuples, each as would be passed
+                   to :func:`check` (the target may be None).
+    :param request: django http request object.
+    :returns: list of booleans, one for each of the checks.
+
+    The user's credentials are only worked out, and the policy files only
+    checked for changes, once for all of the checks.
+    """
     user = auth_utils.get_user(request)
+    credentials = _user_to_credentials(request, user)
+    # The token isn't referred to by the rules, and changes at every login.
+    fingerprint = _freeze(dict((k, v) for k, v in credentials.items()
+                               if k != 'token'))
+    enforcer = _get_enforcer()
+    decisions = {}
+
+    results = []
+    for actions, target in checks:
+        target = _get_target(user, target)
+        # if any check fails return failure
+        results.append(all(_decide(enforcer, decisions, scope, action,
+                                   target, credentials, fingerprint)
+                           for scope, action in actions))
+    return results
+
+
+def _get_target(user, target):
+    target = dict(target or {})
 
     # Several service policy engines default to a project id check for
     # ownership. Since the user is already scoped to a project, if a
@@ -119,31 +190,60 @@ def check(actions, request, target=None):
     # same for domain_id
     if target.get('domain_id') is None:
         target['domain_id'] = user.domain_id
+    return target
 
-    credentials = _user_to_credentials(request, user)
 
-    enforcer = _get_enforcer()
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _decide(enforcer, decisions, scope, action, target, credentials,
+            fingerprint):
+    """Returns whether the action is allowed, reusing the decision made
+    earlier with the same rules, credentials and target where possible.
+
+    ``decisions`` holds the :class:`_Decisions` of each scope already used
+    by the caller.
+    """
+    # if no policy for scope, allow action, underlying API will
+    # ultimately block the action if not permitted, treat as though
+    # allowed
+    if scope not in enforcer:
+        return True
+    scope_enforcer = enforcer[scope]
+
+    if scope not in decisions:
+        # Reloads the rules if the policy file has been modified.
+        scope_enforcer.load_rules()
+        memo = _DECISIONS.get(scope)
+        if memo is None or memo.rules is not scope_enforcer.rules:
+            memo = _Decisions(scope_enforcer.rules)
+            _DECISIONS[scope] = memo
+        decisions[scope] = memo
+    memo = decisions[scope]
+
+    try:
+        key = (action, fingerprint, _freeze(target))
+        decision = memo.get(key)
+    except TypeError:
+        # Part of the target isn't hashable, so it can't be memoized.
+        key = decision = None
+    if decision is not None:
+        return decision
 
-    for action in actions:
-        scope, action = action[0], action[1]
-        if scope in enforcer:
-            # if any check fails return failure
-            if not enforcer[scope].enforce(action, target, credentials):
-                # to match service implementations, if a rule is not found,
-                # use the default rule for that service policy
-                #
-                # waiting to make the check because the first call to
-                # enforce loads the rules
-                if action not in enforcer[scope].rules:
-                    if not enforcer[scope].enforce('default',
-                                                   target, credentials):
-                        return False
-                else:
-                    return False
-        # if no policy for scope, allow action, underlying API will
-        # ultimately block the action if not permitted, treat as though
-        # allowed
-    return True
+    # to match service implementations, if a rule is not found,
+    # use the default rule for that service policy
+    decision = bool(
+        scope_enforcer.enforce(action, target, credentials) or
+        (action not in scope_enforcer.rules and
+         scope_enforcer.enforce('default', target, credentials)))
+    if key is not None:
+        memo.set(key, decision)
+    return decision
 
 
 def _user_to_credentials(request, user):
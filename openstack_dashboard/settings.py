@@ -312,6 +312,7 @@ if not SECRET_KEY:
 
 from openstack_dashboard import policy_backend
 POLICY_CHECK_FUNCTION = policy_backend.check
+POLICY_CHECK_MANY_FUNCTION = policy_backend.check_many
 
 # Add HORIZON_CONFIG to the context information for offline compression
 COMPRESS_OFFLINE_CONTEXT = {
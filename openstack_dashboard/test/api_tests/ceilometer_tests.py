@@ -318,3 +318,30 @@ class CeilometerApiTests(test.APITestCase):
                          vars(statistic_obj))
 
         self.assertEqual(len(resources), len(data))
+
+    def test_resource_aggregates_with_statistics_coalesced(self):
+        statistics = self.statistics.list()
+        query = [{'field': 'project_id', 'op': 'eq', 'value': '1'}]
+
+        ceilometerclient = self.stub_ceilometerclient()
+        ceilometerclient.statistics = self.mox.CreateMockAnything()
+        # The two aggregates share a query, so each meter is only queried
+        # once.
+        ceilometerclient.statistics.list(meter_name='fake_meter_1',
+                                         period=None, q=query).\
+            AndReturn(statistics)
+        ceilometerclient.statistics.list(meter_name='fake_meter_2',
+                                         period=None, q=query).\
+            AndRaise(self.exceptions.ceilometer)
+        self.mox.ReplayAll()
+
+        ceilometer_usage = api.ceilometer.CeilometerUsage(http.HttpRequest)
+        data = ceilometer_usage.resource_aggregates_with_statistics(
+            queries={'first': query, 'second': query},
+            meter_names=['fake_meter_1', 'fake_meter_2'], stats_attr='max')
+
+        self.assertEqual(2, len(data))
+        for aggregate in data:
+            self.assertEqual(9, aggregate.get_meter('fake_meter_1'))
+            # A failed query is treated as having no statistics.
+            self.assertIsNone(aggregate.get_meter('fake_meter_2'))
@@ -94,6 +94,39 @@ class CinderApiTests(test.APITestCase):
         associate_spec = assoc_vol_types[0].associated_qos_spec
         self.assertTrue(associate_spec, qos_specs_only_one[0].name)
 
+    def test_qos_spec_associations_cached(self):
+        qos_spec = self.cinder_qos_specs.first()
+        associations = self.cinder_qos_spec_associations.list()
+        volume_type_ids = [vol_type.id for vol_type in associations]
+
+        cinderclient = self.stub_cinderclient()
+        cinderclient.qos_specs = self.mox.CreateMockAnything()
+        cinderclient.qos_specs.get_associations(qos_spec.id).\
+            AndReturn(associations)
+        cinderclient.qos_specs.associate(qos_spec, '1').\
+            AndRaise(self.exceptions.cinder)
+        cinderclient.qos_specs.associate(qos_spec, '1')
+        cinderclient.qos_specs.get_associations(qos_spec.id).\
+            AndReturn(associations)
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            self.assertEqual(
+                {qos_spec.id: volume_type_ids},
+                api.cinder.qos_spec_associations(self.request, [qos_spec.id]))
+        # A failed change leaves them cached.
+        self.assertRaises(type(self.exceptions.cinder),
+                          api.cinder.qos_spec_associate, self.request,
+                          qos_spec, '1')
+        self.assertEqual(
+            {qos_spec.id: volume_type_ids},
+            api.cinder.qos_spec_associations(self.request, [qos_spec.id]))
+        # Changing an association discards the cached associations.
+        api.cinder.qos_spec_associate(self.request, qos_spec, '1')
+        self.assertEqual(
+            {qos_spec.id: volume_type_ids},
+            api.cinder.qos_spec_associations(self.request, [qos_spec.id]))
+
     def test_absolute_limits_with_negative_values(self):
         values = {"maxTotalVolumes": -1, "totalVolumesUsed": -1}
         expected_results = {"maxTotalVolumes": float("inf"),
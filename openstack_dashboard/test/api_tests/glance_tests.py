@@ -17,8 +17,12 @@
 #    under the License.
 
 from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.utils import override_settings
 
+import glanceclient.exc as glance_exceptions
+from mox import Func  # noqa
+
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -247,3 +251,118 @@ class GlanceApiTests(test.APITestCase):
         self.mox.ReplayAll()
         image = api.glance.image_get(self.request, 'empty')
         self.assertIsNone(image.name)
+
+    def test_image_create_upload(self):
+        image = self.images.first()
+        data = SimpleUploadedFile('image.img', b'0123456789')
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create(name='image').AndReturn(image)
+        uploader = self.mox.CreateMockAnything()
+        self.mox.stubs.Set(api.glance, '_uploader', uploader)
+        uploads = []
+
+        def queued(run):
+            uploads.append(run.__self__)
+            return run.__self__.image_id == image.id
+
+        uploader.submit(Func(queued), glanceclient)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(self.request, name='image', data=data)
+        self.assertEqual({'status': api.glance.UPLOAD_QUEUED,
+                          'bytes_sent': 0,
+                          'total': 10},
+                         api.glance.image_upload_progress(self.request,
+                                                          image.id))
+
+        # The upload reads its own copy of the data, as Django deletes the
+        # uploaded file at the end of the request.
+        data.close()
+        upload = uploads[0]
+        self.assertIsNot(data.file, upload.file)
+        self.assertEqual(b'0123456789', upload.read())
+        upload.close()
+
+    def test_image_create_copy_from(self):
+        image = self.images.first()
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.create(name='image').AndReturn(image)
+        uploader = self.mox.CreateMockAnything()
+        self.mox.stubs.Set(api.glance, '_uploader', uploader)
+        uploader.submit(glanceclient.images.update, image.id,
+                        copy_from='http://example.com/image.img',
+                        purge_props=False)
+        self.mox.ReplayAll()
+
+        api.glance.image_create(self.request, name='image',
+                                copy_from='http://example.com/image.img')
+
+    def test_image_upload_run(self):
+        image = self.images.first()
+        upload = api.glance.ImageUpload(
+            image.id, SimpleUploadedFile('image.img', b'0123456789'))
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.update(image.id, data=upload, purge_props=False) \
+            .WithSideEffects(lambda image_id, data, purge_props:
+                             [data.read(4) for i in range(4)])
+        self.mox.ReplayAll()
+
+        upload.run(glanceclient)
+        self.assertEqual({'status': api.glance.UPLOAD_SUCCEEDED,
+                          'bytes_sent': 10,
+                          'total': 10},
+                         api.glance.image_upload_progress(self.request,
+                                                          image.id))
+        self.assertTrue(upload.file.closed)
+
+    def test_image_upload_cancelled(self):
+        image = self.images.first()
+        upload = api.glance.ImageUpload(
+            image.id, SimpleUploadedFile('image.img', b'0123456789'))
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+
+        def cancel(image_id, data, purge_props):
+            data.read(4)
+            api.glance.image_upload_cancel(self.request, image_id)
+            data._checked = 0
+            data.read(4)
+
+        glanceclient.images.update(image.id, data=upload, purge_props=False) \
+            .WithSideEffects(cancel)
+        self.mox.ReplayAll()
+
+        upload.run(glanceclient)
+        progress = api.glance.image_upload_progress(self.request, image.id)
+        self.assertEqual(api.glance.UPLOAD_CANCELLED, progress['status'])
+        self.assertEqual(8, progress['bytes_sent'])
+
+    def test_image_upload_image_deleted(self):
+        # The image may be deleted by a process that doesn't share the
+        # cache, which glance reports when the data is sent.
+        image = self.images.first()
+        upload = api.glance.ImageUpload(
+            image.id, SimpleUploadedFile('image.img', b'0123456789'))
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images = self.mox.CreateMockAnything()
+        glanceclient.images.update(image.id, data=upload, purge_props=False) \
+            .AndRaise(glance_exceptions.HTTPNotFound())
+        self.mox.ReplayAll()
+
+        upload.run(glanceclient)
+        progress = api.glance.image_upload_progress(self.request, image.id)
+        self.assertEqual(api.glance.UPLOAD_CANCELLED, progress['status'])
+        self.assertTrue(upload.file.closed)
+
+    def test_image_upload_cancelled_while_queued(self):
+        image = self.images.first()
+        upload = api.glance.ImageUpload(
+            image.id, SimpleUploadedFile('image.img', b'0123456789'))
+        api.glance.image_upload_cancel(self.request, image.id)
+        upload.run(self.stub_glanceclient())
+        progress = api.glance.image_upload_progress(self.request, image.id)
+        self.assertEqual(api.glance.UPLOAD_CANCELLED, progress['status'])
+        self.assertEqual(0, progress['bytes_sent'])
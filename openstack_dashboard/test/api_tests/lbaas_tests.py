@@ -12,6 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from mox import IsA  # noqa
+import six
+
+from horizon import messages
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -166,22 +170,32 @@ class LbaasApiTests(test.APITestCase):
         ret_val = api.lbaas.pool_create(self.request, **form_data)
         self.assertIsInstance(ret_val, api.lbaas.Pool)
 
-    @test.create_stubs({neutronclient: ('list_pools', 'list_vips'),
-                        api.neutron: ('subnet_list',)})
+    @test.create_stubs({neutronclient: ('list_pools', 'list_subnets',
+                                        'list_vips')})
     def test_pool_list(self):
         pools = {'pools': self.api_pools.list()}
-        subnets = self.subnets.list()
-        vips = {'vips': self.api_vips.list()}
+        subnet_ids = sorted(set(p['subnet_id'] for p in pools['pools']))
+        subnets = [{'id': s['id'], 'cidr': s['cidr']}
+                   for s in self.api_subnets.list() if s['id'] in subnet_ids]
+        vip_ids = sorted(set(p['vip_id'] for p in pools['pools']
+                             if p['vip_id']))
+        vips = [{'id': v['id'], 'name': v['name']}
+                for v in self.api_vips.list() if v['id'] in vip_ids]
 
         neutronclient.list_pools().AndReturn(pools)
-        api.neutron.subnet_list(self.request).AndReturn(subnets)
-        neutronclient.list_vips().AndReturn(vips)
+        # Only the referenced subnets and VIPs are listed, for their names.
+        neutronclient.list_subnets(id=subnet_ids, fields=['id', 'cidr']) \
+            .AndReturn({'subnets': subnets})
+        neutronclient.list_vips(id=vip_ids, fields=['id', 'name']) \
+            .AndReturn({'vips': vips})
         self.mox.ReplayAll()
 
         ret_val = api.lbaas.pool_list(self.request)
         for v in ret_val:
             self.assertIsInstance(v, api.lbaas.Pool)
             self.assertTrue(v.id)
+        self.assertEqual(subnets[0]['cidr'], ret_val[0].subnet_name)
+        self.assertEqual(vips[0]['name'], ret_val[0].vip_name)
 
     @test.create_stubs({neutronclient: ('show_pool', 'show_vip',
                                         'list_members',
@@ -194,14 +208,16 @@ class LbaasApiTests(test.APITestCase):
         vip_dict = {'vip': self.api_vips.first()}
 
         neutronclient.show_pool(pool.id).AndReturn(pool_dict)
-        api.neutron.subnet_get(self.request, subnet.id).AndReturn(subnet)
-        neutronclient.show_vip(pool.vip_id).AndReturn(vip_dict)
-        neutronclient.list_members(pool_id=pool.id).AndReturn(
+        # The resources of the pool are fetched concurrently.
+        api.neutron.subnet_get(self.request, subnet.id).InAnyOrder() \
+            .AndReturn(subnet)
+        neutronclient.show_vip(pool.vip_id).InAnyOrder().AndReturn(vip_dict)
+        neutronclient.list_members(pool_id=pool.id).InAnyOrder().AndReturn(
             {'members': self.api_members.list()})
         monitor = self.api_monitors.first()
         for pool_mon in pool.health_monitors:
-            neutronclient.show_health_monitor(pool_mon).AndReturn(
-                {'health_monitors': [monitor]})
+            neutronclient.show_health_monitor(pool_mon).InAnyOrder() \
+                .AndReturn({'health_monitors': [monitor]})
         self.mox.ReplayAll()
 
         ret_val = api.lbaas.pool_get(self.request, pool.id)
@@ -217,6 +233,39 @@ class LbaasApiTests(test.APITestCase):
         self.assertIsInstance(ret_val.health_monitors[0],
                               api.lbaas.PoolMonitor)
 
+    @test.create_stubs({neutronclient: ('show_pool', 'show_vip',
+                                        'list_members',
+                                        'show_health_monitor',),
+                        api.neutron: ('subnet_get',),
+                        messages: ('warning',)})
+    def test_pool_get_subnet_exception(self):
+        pool = self.pools.first()
+        subnet = self.subnets.first()
+        pool_dict = {'pool': self.api_pools.first()}
+        vip_dict = {'vip': self.api_vips.first()}
+
+        neutronclient.show_pool(pool.id).AndReturn(pool_dict)
+        api.neutron.subnet_get(self.request, subnet.id).InAnyOrder() \
+            .AndRaise(self.exceptions.neutron)
+        neutronclient.show_vip(pool.vip_id).InAnyOrder().AndReturn(vip_dict)
+        neutronclient.list_members(pool_id=pool.id).InAnyOrder().AndReturn(
+            {'members': self.api_members.list()})
+        monitor = self.api_monitors.first()
+        for pool_mon in pool.health_monitors:
+            neutronclient.show_health_monitor(pool_mon).InAnyOrder() \
+                .AndReturn({'health_monitors': [monitor]})
+        messages.warning(self.request, IsA(six.text_type))
+        self.mox.ReplayAll()
+
+        # The other resources are still expanded.
+        ret_val = api.lbaas.pool_get(self.request, pool.id)
+        self.assertIsInstance(ret_val, api.lbaas.Pool)
+        self.assertFalse(hasattr(ret_val, 'subnet'))
+        self.assertEqual(ret_val.vip.id, vip_dict['vip']['id'])
+        self.assertEqual(2, len(ret_val.members))
+        self.assertEqual(len(pool.health_monitors),
+                         len(ret_val.health_monitors))
+
     @test.create_stubs({neutronclient: ('update_pool',)})
     def test_pool_update(self):
         form_data = {'name': 'pool1name',
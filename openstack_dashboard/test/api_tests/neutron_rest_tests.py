@@ -57,8 +57,9 @@ class NeutronNetworksTestCase(test.TestCase):
             {'name': 'mynetwork'}
         )
 
+    @mock.patch.object(neutron, 'quotas')
     @mock.patch.object(neutron.api, 'neutron')
-    def _test_create(self, supplied_body, expected_call, client):
+    def _test_create(self, supplied_body, expected_call, client, quotas):
         request = self.mock_rest_request(body=supplied_body)
         client.network_create.return_value = self._networks[0]
         response = neutron.Networks().post(request)
@@ -68,6 +69,8 @@ class NeutronNetworksTestCase(test.TestCase):
                          + str(TEST.api_networks.first().get("id")))
         self.assertEqual(response.content,
                          json.dumps(TEST.api_networks.first()))
+        quotas.invalidate_tenant_quota_usages.assert_called_once_with(
+            request, self._networks[0].tenant_id)
 
 
 class NeutronSubnetsTestCase(test.TestCase):
@@ -88,8 +91,9 @@ class NeutronSubnetsTestCase(test.TestCase):
         client.subnet_list.assert_called_once_with(
             request, network_id=TEST.api_networks.first().get("id"))
 
+    @mock.patch.object(neutron, 'quotas')
     @mock.patch.object(neutron.api, 'neutron')
-    def test_create(self, client):
+    def test_create(self, client, quotas):
         request = self.mock_rest_request(
             body='{"network_id": "%s",'
                  ' "ip_version": "4",'
@@ -102,6 +106,8 @@ class NeutronSubnetsTestCase(test.TestCase):
                          str(TEST.api_subnets.first().get("id")))
         self.assertEqual(response.content,
                          json.dumps(TEST.api_subnets.first()))
+        quotas.invalidate_tenant_quota_usages.assert_called_once_with(
+            request, self._subnets[0].tenant_id)
 
 
 class NeutronPortsTestCase(test.TestCase):
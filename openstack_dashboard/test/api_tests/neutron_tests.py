@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import uuid
 
 from django.test.utils import override_settings
@@ -28,14 +29,90 @@ class NeutronApiTests(test.APITestCase):
         networks = {'networks': self.api_networks.list()}
         subnets = {'subnets': self.api_subnets.list()}
 
+        subnet_ids = sorted(s['id'] for s in self.api_subnets.list())
+
         neutronclient = self.stub_neutronclient()
         neutronclient.list_networks().AndReturn(networks)
-        neutronclient.list_subnets().AndReturn(subnets)
+        neutronclient.list_subnets(id=subnet_ids).AndReturn(subnets)
         self.mox.ReplayAll()
 
         ret_val = api.neutron.network_list(self.request)
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Network)
+            for s in n.subnets:
+                self.assertIsInstance(s, api.neutron.Subnet)
+
+    def test_network_list_without_subnets(self):
+        networks = {'networks': self.api_networks.list()}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn(networks)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list(self.request, expand_subnet=False)
+        for n in ret_val:
+            self.assertIsInstance(n, api.neutron.Network)
+
+    def test_network_list_for_tenant(self):
+        # network_list() replaces the subnet IDs of the network dicts.
+        tenant_networks = copy.deepcopy(self.api_networks.list()[:2])
+        shared_networks = copy.deepcopy(self.api_networks.list()[1:3])
+        subnets = self.api_subnets.list()
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks(tenant_id='1', shared=False) \
+            .AndReturn({'networks': tenant_networks})
+        neutronclient.list_subnets(id=sorted([subnets[0]['id'],
+                                              subnets[1]['id']])) \
+            .AndReturn({'subnets': subnets[:2]})
+        neutronclient.list_networks(shared=True) \
+            .AndReturn({'networks': shared_networks})
+        # The subnet of the second network was fetched with the first list.
+        neutronclient.list_subnets(id=[subnets[2]['id']]) \
+            .AndReturn({'subnets': [subnets[2]]})
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list_for_tenant(self.request, '1')
+        self.assertEqual(4, len(ret_val))
+        self.assertEqual([[subnets[0]['id']], [subnets[1]['id']],
+                          [subnets[1]['id']], [subnets[2]['id']]],
+                         [[s.id for s in n.subnets] for n in ret_val])
+
+    def test_dhcp_agent_network_counts(self):
+        agents = self.api_agents.list()
+        networks = self.api_networks.list()
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_agents(agent_type='DHCP agent') \
+            .AndReturn({'agents': agents})
+        # The networks of each agent are listed concurrently.
+        neutronclient.list_networks_on_dhcp_agent(agents[0]['id'],
+                                                  fields='id') \
+            .InAnyOrder() \
+            .AndReturn({'networks': [{'id': networks[0]['id']},
+                                     {'id': networks[1]['id']}]})
+        neutronclient.list_networks_on_dhcp_agent(agents[1]['id'],
+                                                  fields='id') \
+            .InAnyOrder() \
+            .AndReturn({'networks': [{'id': networks[0]['id']}]})
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.dhcp_agent_network_counts(self.request)
+        self.assertEqual({networks[0]['id']: 2, networks[1]['id']: 1},
+                         dict(ret_val))
+
+    def test_resource_count(self):
+        networks = {'networks': [{'id': n['id']}
+                                 for n in self.api_networks.list()]}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks(tenant_id='1', fields='id') \
+            .AndReturn(networks)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.resource_count(self.request, 'networks',
+                                             tenant_id='1')
+        self.assertEqual(len(self.api_networks.list()), ret_val)
 
     def test_network_get(self):
         network = {'network': self.api_networks.first()}
@@ -36,8 +36,9 @@ class NovaRestTestCase(test.TestCase):
                          '{"items": [{"id": "one"}, {"id": "two"}]}')
         nc.keypair_list.assert_called_once_with(request)
 
+    @mock.patch.object(nova, 'quotas')
     @mock.patch.object(nova.api, 'nova')
-    def test_keypair_create(self, nc):
+    def test_keypair_create(self, nc, quotas):
         request = self.mock_rest_request(body='''{"name": "Ni!"}''')
         new = nc.keypair_create.return_value
         new.to_dict.return_value = {'name': 'Ni!', 'public_key': 'sekrit'}
@@ -49,9 +50,11 @@ class NovaRestTestCase(test.TestCase):
                          '{"name": "Ni!", "public_key": "sekrit"}')
         self.assertEqual(response['location'], '/api/nova/keypairs/Ni%21')
         nc.keypair_create.assert_called_once_with(request, 'Ni!')
+        quotas.invalidate_tenant_quota_usages.assert_called_once_with(request)
 
+    @mock.patch.object(nova, 'quotas')
     @mock.patch.object(nova.api, 'nova')
-    def test_keypair_import(self, nc):
+    def test_keypair_import(self, nc, quotas):
         request = self.mock_rest_request(body='''
             {"name": "Ni!", "public_key": "hi"}
         ''')
@@ -65,6 +68,7 @@ class NovaRestTestCase(test.TestCase):
                          '{"name": "Ni!", "public_key": "hi"}')
         self.assertEqual(response['location'], '/api/nova/keypairs/Ni%21')
         nc.keypair_import.assert_called_once_with(request, 'Ni!', 'hi')
+        quotas.invalidate_tenant_quota_usages.assert_called_once_with(request)
 
     #
     # Availability Zones
@@ -124,8 +128,9 @@ class NovaRestTestCase(test.TestCase):
                          '"missing required parameter \'source_id\'"')
         nc.server_create.assert_not_called()
 
+    @mock.patch.object(nova, 'quotas')
     @mock.patch.object(nova.api, 'nova')
-    def test_server_create_basic(self, nc):
+    def test_server_create_basic(self, nc, quotas):
         request = self.mock_rest_request(body='''{"name": "Ni!",
             "source_id": "image123", "flavor_id": "flavor123",
             "key_name": "sekrit", "user_data": "base64 yes",
@@ -142,6 +147,8 @@ class NovaRestTestCase(test.TestCase):
             request, 'Ni!', 'image123', 'flavor123', 'sekrit', 'base64 yes',
             [{'name': 'root'}]
         )
+        quotas.invalidate_tenant_quota_usages.assert_called_once_with(
+            request)
 
     @mock.patch.object(nova.api, 'nova')
     def test_server_get_single(self, nc):
@@ -19,10 +19,13 @@
 
 from __future__ import absolute_import
 
+import copy
+
 from django.conf import settings
 from django import http
 from django.test.utils import override_settings
 
+import mock
 from mox import IsA  # noqa
 from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import servers
@@ -49,6 +52,39 @@ class ServerWrapperTests(test.TestCase):
         self.assertEqual(image.name, server.image_name)
 
 
+class NovaClientPoolTests(test.TestCase):
+
+    def setUp(self):
+        super(NovaClientPoolTests, self).setUp()
+        api.nova.clear_client_pool()
+        api.nova.client_pool_stats.reset()
+
+    def test_novaclient_reused_for_token(self):
+        client = api.nova.novaclient(self.request)
+        self.assertIs(client, api.nova.novaclient(self.request))
+        self.assertEqual(self.request.user.token.id,
+                         client.client.auth.token)
+        self.assertEqual({'hits': 1, 'misses': 1, 'connections': 0},
+                         api.nova.client_pool_stats.as_dict())
+
+    def test_novaclient_not_shared_between_tokens(self):
+        client = api.nova.novaclient(self.request)
+        self.request.user.token = copy.copy(self.token)
+        self.request.user.token.id = 'other-token'
+        other = api.nova.novaclient(self.request)
+        self.assertIsNot(client, other)
+        self.assertEqual('other-token', other.client.auth.token)
+        # The HTTP connections are shared, however.
+        self.assertIs(client.client.session, other.client.session)
+
+    @override_settings(NOVA_CLIENT_POOL_SIZE=1)
+    def test_novaclient_pool_size(self):
+        client = api.nova.novaclient(self.request)
+        api.nova.clear_client_pool()
+        self.assertIsNot(client, api.nova.novaclient(self.request))
+        self.assertEqual(2, api.nova.client_pool_stats.misses)
+
+
 class ComputeApiTests(test.APITestCase):
 
     def test_server_reboot(self):
@@ -347,3 +383,84 @@ class ComputeApiTests(test.APITestCase):
         ret_val = api.nova.migrate_host(self.request, "host", True, True,
                                         True)
         self.assertTrue(ret_val)
+
+    def test_aggregate_details_list(self):
+        aggregates = self.aggregates.list()
+        details = dict((a.id, a) for a in aggregates)
+        novaclient = self.stub_novaclient()
+        novaclient.aggregates = mock.Mock()
+        novaclient.aggregates.list.return_value = aggregates
+        novaclient.aggregates.get_details.side_effect = details.get
+        self.mox.ReplayAll()
+
+        result = api.nova.aggregate_details_list(self.request)
+        self.assertEqual(aggregates, result)
+
+        # The details are cached for later requests.
+        cached = api.nova.aggregate_details_list(self.request)
+        self.assertEqual([a.id for a in aggregates], [a.id for a in cached])
+        self.assertEqual([a.hosts for a in aggregates],
+                         [a.hosts for a in cached])
+        self.assertEqual(1, novaclient.aggregates.list.call_count)
+        self.assertEqual(len(aggregates),
+                         novaclient.aggregates.get_details.call_count)
+
+        # A failed change leaves them cached.
+        novaclient.aggregates.update.side_effect = self.exceptions.nova
+        self.assertRaises(type(self.exceptions.nova),
+                          api.nova.aggregate_update, self.request,
+                          aggregates[0].id, {'name': 'foo'})
+        api.nova.aggregate_details_list(self.request)
+        self.assertEqual(1, novaclient.aggregates.list.call_count)
+
+        # Until an aggregate is changed.
+        novaclient.aggregates.update.side_effect = None
+        api.nova.aggregate_update(self.request, aggregates[0].id,
+                                  {'name': 'foo'})
+        api.nova.aggregate_details_list(self.request)
+        self.assertEqual(2, novaclient.aggregates.list.call_count)
+
+    def test_instance_volumes_list(self):
+        server = self.servers.first()
+        volumes = [copy.copy(v) for v in self.volumes.list()[:3]]
+        novaclient = self.stub_novaclient()
+        novaclient.volumes = self.mox.CreateMockAnything()
+        novaclient.volumes.get_server_volumes(server.id).AndReturn(volumes)
+        cinderclient = self.stub_cinderclient()
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        # Only the attached volumes are retrieved, rather than all of the
+        # project's volumes.
+        for volume in volumes:
+            cinderclient.volumes.get(volume.id).InAnyOrder() \
+                .AndReturn(volume)
+        self.mox.ReplayAll()
+
+        result = api.nova.instance_volumes_list(self.request, server.id)
+        self.assertEqual([volumes[0].name, volumes[1].id, volumes[2].name],
+                         [volume.name for volume in result])
+
+    def test_evacuate_host_progress(self):
+        hypervisor = self.hypervisors.first()
+        server = hypervisor.servers[0]
+        novaclient = self.stub_novaclient()
+        novaclient.hypervisors = self.mox.CreateMockAnything()
+        novaclient.hypervisors.search('host', True).AndReturn([hypervisor])
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.servers.evacuate(server['uuid'], 'target', False) \
+            .AndRaise(nova_exceptions.ClientException(409))
+        self.mox.ReplayAll()
+
+        self.assertRaises(nova_exceptions.ClientException,
+                          api.nova.evacuate_host,
+                          self.request, 'host', 'target', False)
+
+        operations = api.nova.host_operations_get(self.request,
+                                                  ['host', 'other'])
+        self.assertEqual(['host'], list(operations))
+        operation = operations['host']
+        self.assertEqual('evacuate', operation['action'])
+        self.assertTrue(operation['finished'])
+        self.assertEqual([(server['uuid'], server['name'],
+                           api.nova.HostOperation.FAILED)],
+                         [(i['id'], i['name'], i['status'])
+                          for i in operation['instances']])
@@ -27,6 +27,7 @@ from ceilometerclient.v2 import client as ceilometer_client
 from cinderclient import client as cinder_client
 from django.conf import settings
 from django.contrib.messages.storage import default_storage  # noqa
+from django.core.cache import cache
 from django.core.handlers import wsgi
 from django.core import urlresolvers
 from django.test.client import RequestFactory  # noqa
@@ -53,6 +54,7 @@ from horizon.test import helpers as horizon_helpers
 from openstack_dashboard import api
 from openstack_dashboard import context_processors
 from openstack_dashboard.test.test_data import utils as test_utils
+from openstack_dashboard.utils import capabilities
 
 
 # Makes output of failing mox tests much easier to read.
@@ -164,6 +166,10 @@ class TestCase(horizon_helpers.TestCase):
         self.patchers = {}
         self.add_panel_mocks()
 
+        # Don't let data cached across requests leak between tests.
+        cache.clear()
+        capabilities.clear()
+
         super(TestCase, self).setUp()
 
     def _setup_test_data(self):
@@ -31,6 +31,27 @@ class PolicyTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check,
+                       POLICY_CHECK_MANY_FUNCTION=policy_backend.check_many)
+    def test_policy_check_many_set(self):
+        value = policy.check_many([((("identity", "admin_required"),), None),
+                                   ((("dummy", "default"),), None)],
+                                  request=self.request)
+        self.assertEqual([False, True], value)
+
+    @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
+    def test_policy_check_many_function_not_set(self):
+        value = policy.check_many([((("identity", "admin_required"),), None),
+                                   ((("dummy", "default"),), None)],
+                                  request=self.request)
+        self.assertEqual([False, True], value)
+
+    @override_settings(POLICY_CHECK_FUNCTION=None)
+    def test_policy_check_many_not_set(self):
+        value = policy.check_many([((("identity", "admin_required"),), None)],
+                                  request=self.request)
+        self.assertEqual([True], value)
+
 
 class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
     @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
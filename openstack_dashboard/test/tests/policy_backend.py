@@ -12,6 +12,7 @@
 
 from django.test.utils import override_settings
 
+from openstack_dashboard.openstack.common import fileutils
 from openstack_dashboard import policy
 from openstack_dashboard import policy_backend
 from openstack_dashboard.test import helpers as test
@@ -69,6 +70,66 @@ class PolicyBackendTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    def test_check_many(self):
+        policy_backend.reset()
+        value = policy_backend.check_many(
+            [((("identity", "admin_required"),), None),
+             ((("dummy", "default"),), None),
+             ((("compute", "compute:get"),), None),
+             ((("compute", "compute:get"),), {"project_id": "other"})],
+            self.request)
+        self.assertEqual([False, True, True, False], value)
+
+    def _count_enforcements(self, scope):
+        enforcer = policy_backend._get_enforcer()[scope]
+        enforce = enforcer.enforce
+        calls = []
+
+        def counted_enforce(rule, target, creds, *args, **kwargs):
+            calls.append(rule)
+            return enforce(rule, target, creds, *args, **kwargs)
+
+        enforcer.enforce = counted_enforce
+        self.addCleanup(policy_backend.reset)
+        return calls
+
+    def test_check_memoized(self):
+        policy_backend.reset()
+        calls = self._count_enforcements("identity")
+        for i in range(3):
+            self.assertFalse(policy_backend.check(
+                (("identity", "admin_required"),), self.request))
+        self.assertEqual(["admin_required"], calls)
+
+        # A different target is a different decision.
+        self.assertFalse(policy_backend.check(
+            (("identity", "admin_required"),), self.request,
+            target={"project_id": "other"}))
+        self.assertEqual(["admin_required"] * 2, calls)
+
+    def test_check_memo_reset_when_policy_reloaded(self):
+        policy_backend.reset()
+        calls = self._count_enforcements("identity")
+        policy_backend.check((("identity", "admin_required"),), self.request)
+
+        # The policy file is reloaded when it's modified.
+        enforcer = policy_backend._get_enforcer()["identity"]
+        fileutils._FILE_CACHE[enforcer.policy_path]['mtime'] = 0
+        policy_backend.check((("identity", "admin_required"),), self.request)
+        self.assertEqual(["admin_required"] * 2, calls)
+
+    def test_decisions_bounded(self):
+        self.mox.stubs.Set(policy_backend, "_MAX_DECISIONS", 2)
+        decisions = policy_backend._Decisions(rules=None)
+        decisions.set("a", True)
+        decisions.set("b", False)
+        # "a" is now the most recently used, so "b" is evicted.
+        self.assertTrue(decisions.get("a"))
+        decisions.set("c", False)
+        self.assertEqual(["a", "c"], list(decisions._entries))
+        self.assertIsNone(decisions.get("b"))
+        self.assertFalse(decisions.get("c"))
+
 
 class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
     @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
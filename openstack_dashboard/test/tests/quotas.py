@@ -19,7 +19,9 @@
 
 from __future__ import absolute_import
 
+from django.core.cache import cache
 from django import http
+from django.test.utils import override_settings
 from mox import IsA  # noqa
 
 from openstack_dashboard import api
@@ -93,6 +95,175 @@ class QuotaTests(test.APITestCase):
         # Compare internal structure of usages to expected.
         self.assertItemsEqual(expected_output, quota_usages.usages)
 
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',),
+                        cinder: ('volume_list', 'volume_snapshot_list',
+                                 'tenant_quota_get',)})
+    def test_tenant_quota_usages_volume_failure(self):
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == self.request.user.tenant_id]
+
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(True)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(False)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+        search_opts = {'tenant_id': self.request.user.tenant_id}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=True) \
+            .AndReturn([servers, False])
+        opts = {'alltenants': 1, 'tenant_id': self.request.user.tenant_id}
+        cinder.volume_list(IsA(http.HttpRequest), opts) \
+            .AndRaise(self.exceptions.cinder)
+        cinder.volume_snapshot_list(IsA(http.HttpRequest), opts) \
+            .AndReturn(self.cinder_volume_snapshots.list())
+        cinder.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.cinder_quotas.first())
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        expected_output = self.get_usages(with_volume=False)
+        expected_output.update({
+            'volumes': {'quota': 1, 'available': 0, 'unavailable': True},
+            'snapshots': {'quota': 1, 'available': 0, 'unavailable': True},
+            'gigabytes': {'quota': 1000, 'available': 0,
+                          'unavailable': True}})
+
+        # The volume quotas have nothing available, but the rest are still
+        # reported.
+        self.assertEqual(expected_output, dict(quota_usages.usages))
+
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_cached(self):
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == self.request.user.tenant_id]
+
+        # The usage is only retrieved once for the two requests.
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(False)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(False)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+        search_opts = {'tenant_id': self.request.user.tenant_id}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=True) \
+            .AndReturn([servers, False])
+
+        self.mox.ReplayAll()
+
+        quotas.tenant_quota_usages(self.request)
+        request = http.HttpRequest()
+        request.user = self.request.user
+        quota_usages = quotas.tenant_quota_usages(request)
+        expected_output = self.get_usages(with_volume=False)
+
+        self.assertEqual(expected_output, dict(quota_usages.usages))
+
+        key = quotas._quota_usage_cache_key(request, '1')
+        self.assertIsNotNone(cache.get(key))
+        quotas.invalidate_tenant_quota_usages(request)
+        self.assertIsNone(cache.get(key))
+
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_other_tenant_not_cached(self):
+        # The floating IPs are listed in the admin's own scope, so the usage
+        # of another tenant isn't shared with that tenant's own members.
+        for i in range(2):
+            api.base.is_service_enabled(IsA(http.HttpRequest),
+                                        'volume').AndReturn(False)
+            api.base.is_service_enabled(IsA(http.HttpRequest),
+                                        'network').AndReturn(False)
+            api.nova.flavor_list(IsA(http.HttpRequest)) \
+                .AndReturn(self.flavors.list())
+            api.nova.tenant_quota_get(IsA(http.HttpRequest), '2') \
+                .AndReturn(self.quotas.first())
+            api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+                .AndReturn(True)
+            api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+                .AndReturn(self.floating_ips.list())
+            api.nova.server_list(IsA(http.HttpRequest),
+                                 search_opts={'tenant_id': '2'},
+                                 all_tenants=True) \
+                .AndReturn([[], False])
+
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            request = http.HttpRequest()
+            request.user = self.request.user
+            quotas.tenant_quota_usages(request, tenant_id='2')
+
+        self.assertIsNone(cache.get(quotas._quota_usage_cache_key(request,
+                                                                  '2')))
+
+    @override_settings(OPENSTACK_QUOTA_USAGE_COUNT_ONLY=True)
+    @test.create_stubs({api.nova: ('tenant_absolute_limits',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',),
+                        cinder: ('tenant_absolute_limits',
+                                 'tenant_quota_get',)})
+    def test_tenant_quota_usages_count_only(self):
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(True)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').MultipleTimes() \
+            .AndReturn(False)
+        api.nova.tenant_absolute_limits(IsA(http.HttpRequest),
+                                        tenant_id=None) \
+            .AndReturn({'totalInstancesUsed': 2,
+                        'totalCoresUsed': 2,
+                        'totalRAMUsed': 1024})
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+        cinder.tenant_absolute_limits(IsA(http.HttpRequest)) \
+            .AndReturn({'totalVolumesUsed': 4,
+                        'totalSnapshotsUsed': 3,
+                        'totalGigabytesUsed': 120})
+        cinder.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.cinder_quotas.first())
+
+        self.mox.ReplayAll()
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        expected_output = self.get_usages()
+
+        self.assertEqual(expected_output, dict(quota_usages.usages))
+
     @test.create_stubs({api.nova: ('server_list',
                                    'flavor_list',
                                    'tenant_quota_get',),
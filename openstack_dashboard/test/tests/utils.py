@@ -14,10 +14,22 @@
 #    under the License.
 
 import datetime
+import threading
+import time
 import uuid
 
+from django import http
+from django.test.utils import override_settings
+from mox import Func  # noqa
+from mox import IsA  # noqa
+from openstack_auth import utils as auth_utils
+
+from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import capabilities
+from openstack_dashboard.utils import concurrency
 from openstack_dashboard.utils import filters
+from openstack_dashboard.utils import identity
 from openstack_dashboard.utils import metering
 
 
@@ -63,3 +75,225 @@ class UtilsMeteringTests(test.TestCase):
     def test_calc_date_args_invalid(self):
         self.assertRaises(
             ValueError, metering.calc_date_args, object, object, "other")
+
+
+class UtilsConcurrencyTests(test.TestCase):
+
+    def test_fan_out_preserves_order(self):
+        calls = [lambda n=n: n * 2 for n in range(10)]
+        results = concurrency.fan_out(calls, max_workers=3)
+        self.assertEqual([r.get() for r in results], list(range(0, 20, 2)))
+
+    def test_fan_out_isolates_failures(self):
+        def fail():
+            raise ValueError("boom")
+
+        results = concurrency.fan_out([lambda: 1, fail, lambda: 3])
+        self.assertEqual(results[0].get(), 1)
+        self.assertTrue(results[1].failed)
+        self.assertIsInstance(results[1].exception, ValueError)
+        self.assertRaises(ValueError, results[1].get)
+        self.assertEqual(results[2].get(), 3)
+
+    def test_fan_out_runs_concurrently(self):
+        barrier = threading.Event()
+        results = concurrency.fan_out([barrier.wait, barrier.set],
+                                      timeout=5)
+        self.assertFalse(any(r.failed for r in results))
+
+    def test_fan_out_bounded_workers(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def call():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+        concurrency.fan_out([call] * 12, max_workers=4)
+        self.assertLessEqual(max(peak), 4)
+
+    def test_fan_out_timeout(self):
+        event = threading.Event()
+        results = concurrency.fan_out([lambda: 1, event.wait], timeout=0.1)
+        event.set()
+        self.assertEqual(results[0].get(), 1)
+        self.assertRaises(concurrency.CallTimeout, results[1].get)
+
+    def test_parallel_map_raises(self):
+        def check(n):
+            if n == 2:
+                raise ValueError(n)
+            return n
+
+        self.assertEqual(concurrency.parallel_map(check, [0, 1]), [0, 1])
+        self.assertRaises(ValueError,
+                          concurrency.parallel_map, check, [1, 2, 3])
+
+
+class UtilsIdentityTests(test.APITestCase):
+    def _request_with_roles(self, *roles):
+        request = http.HttpRequest()
+        request.user = auth_utils.get_user(self.request)
+        request.user.roles = [{'name': role} for role in roles]
+        return request
+
+    @test.create_stubs({api.keystone: ('tenant_list', 'tenant_get')})
+    def test_projects_directory(self):
+        tenants = self.tenants.list()
+        api.keystone.tenant_list(IsA(http.HttpRequest), domain=None,
+                                 paginate=False) \
+            .AndReturn([tenants[1:], False])
+        api.keystone.tenant_get(IsA(http.HttpRequest), tenants[0].id) \
+            .AndReturn(tenants[0])
+        self.mox.ReplayAll()
+
+        # The list is only retrieved once, and only projects missing from
+        # it are looked up individually (and only once).
+        entries = identity.projects.entries(self.request)
+        self.assertEqual(set(t.id for t in tenants[1:]), set(entries))
+        for i in range(2):
+            project = identity.projects.get(self.request, tenants[0].id)
+            self.assertEqual(tenants[0].name, project.name)
+            self.assertEqual(tenants[0].enabled, project.enabled)
+        project = identity.projects.get(self.request, tenants[1].id)
+        self.assertEqual(tenants[1].name, project.name)
+
+    @test.create_stubs({api.keystone: ('user_list',)})
+    def test_users_directory_forget(self):
+        users = self.users.list()
+        api.keystone.user_list(IsA(http.HttpRequest)).AndReturn(users)
+        api.keystone.user_list(IsA(http.HttpRequest)).AndReturn(users[1:])
+        self.mox.ReplayAll()
+
+        self.assertIn(users[0].id, identity.users.entries(self.request))
+        identity.users.entries(self.request)
+        identity.users.forget(self.request)
+        self.assertNotIn(users[0].id, identity.users.entries(self.request))
+
+    @test.create_stubs({api.keystone: ('user_list',)})
+    def test_users_directory_scoped(self):
+        users = self.users.list()
+        other = self._request_with_roles('member')
+        api.keystone.user_list(self.request).AndReturn(users)
+        api.keystone.user_list(other).AndReturn(users[1:])
+        self.mox.ReplayAll()
+
+        # Users with other roles get (and share) a directory of their own.
+        self.assertIn(users[0].id, identity.users.entries(self.request))
+        self.assertNotIn(users[0].id, identity.users.entries(other))
+        self.assertIn(users[0].id, identity.users.entries(self.request))
+
+    @test.create_stubs({api.keystone: ('user_list',)})
+    def test_users_directory_forget_all_scopes(self):
+        users = self.users.list()
+        other = self._request_with_roles('member')
+        api.keystone.user_list(other).AndReturn(users)
+        api.keystone.user_list(other).AndReturn(users[1:])
+        self.mox.ReplayAll()
+
+        identity.users.entries(other)
+        identity.users.forget(self.request)
+        self.assertNotIn(users[0].id, identity.users.entries(other))
+
+    @override_settings(IDENTITY_DIRECTORY_REFRESH_INTERVAL=-1)
+    @test.create_stubs({api.keystone: ('user_list',)})
+    def test_users_directory_refresh_detached(self):
+        users = self.users.list()
+
+        def detached(request):
+            return (request is not self.request and
+                    request.user.token.id == self.request.user.token.id and
+                    request.session == {})
+
+        api.keystone.user_list(self.request).AndReturn(users[1:])
+        api.keystone.user_list(Func(detached)).AndReturn(users)
+        self.mox.ReplayAll()
+
+        threads = []
+
+        class Thread(object):
+            def __init__(self, target):
+                threads.append(target)
+
+            def start(self):
+                pass
+
+        self.mox.stubs.Set(identity.threading, 'Thread', Thread)
+        identity.users.entries(self.request)
+        self.assertNotIn(users[0].id, identity.users.entries(self.request))
+
+        # The directory is refreshed after the request, without it.
+        threads[0]()
+        self.assertIn(users[0].id, identity.users.entries(self.request))
+
+
+class UtilsCapabilitiesTests(test.APITestCase):
+    def setUp(self):
+        super(UtilsCapabilitiesTests, self).setUp()
+        self.fetched = []
+
+        def fetch(request):
+            self.fetched.append(request)
+            return len(self.fetched)
+
+        self.registry = capabilities.Registry(
+            'test', lambda request: 'http://example.com/%s' % request.user.id,
+            fetch)
+        self.addCleanup(capabilities._registries.remove, self.registry)
+
+    def test_registry_shared_between_requests(self):
+        other = http.HttpRequest()
+        other.user = self.request.user
+        self.assertEqual(1, self.registry.get(self.request))
+        self.assertEqual(1, self.registry.get(other))
+        # The capabilities are also kept in the Django cache, for the other
+        # processes.
+        capabilities.clear()
+        self.assertEqual(1, self.registry.get(other))
+        self.assertEqual([self.request], self.fetched)
+
+    def test_registry_keyed_by_endpoint(self):
+        self.assertEqual(1, self.registry.get(self.request))
+        self.request.user.id = 'other'
+        self.assertEqual(2, self.registry.get(self.request))
+
+    @override_settings(CAPABILITIES_CACHE_TTL=0)
+    def test_registry_disabled(self):
+        self.assertEqual(1, self.registry.get(self.request))
+        self.assertEqual(2, self.registry.get(self.request))
+
+    def test_registry_prewarm(self):
+        self.registry.get(self.request)
+        self.registry.prewarm(self.request)
+        self.assertEqual(2, self.registry.get(self.request))
+
+    @override_settings(CAPABILITIES_REFRESH_INTERVAL=0)
+    def test_registry_background_refresh(self):
+        refreshed = threading.Event()
+        self.assertEqual(1, self.registry.get(self.request))
+        self.registry._fetch = lambda request: refreshed.set() or 'new'
+        # The cached capabilities are returned while they're refreshed.
+        self.assertEqual(1, self.registry.get(self.request))
+        self.assertTrue(refreshed.wait(5))
+        for i in range(50):
+            if self.registry.get(self.request) == 'new':
+                break
+            time.sleep(0.1)
+        self.assertEqual('new', self.registry.get(self.request))
+
+    def test_neutron_extensions_shared_between_requests(self):
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_extensions() \
+            .AndReturn({'extensions': self.api_extensions.list()})
+        self.mox.ReplayAll()
+
+        other = http.HttpRequest()
+        other.user = self.request.user
+        self.assertTrue(
+            api.neutron.is_extension_supported(self.request, 'quotas'))
+        self.assertTrue(api.neutron.is_extension_supported(other, 'quotas'))
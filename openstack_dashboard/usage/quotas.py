@@ -11,9 +11,13 @@
 # under the License.
 
 from collections import defaultdict
+import functools
+import hashlib
 import itertools
 import logging
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -24,6 +28,7 @@ from openstack_dashboard.api import cinder
 from openstack_dashboard.api import network
 from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
+from openstack_dashboard.utils import concurrency
 
 
 LOG = logging.getLogger(__name__)
@@ -115,6 +120,8 @@ class QuotaUsage(dict):
             self.usages[quota.name]['available'] = float("inf")
         else:
             self.usages[quota.name]['quota'] = int(quota.limit)
+            if 'used' in self.usages[quota.name]:
+                self.update_available(quota.name)
 
     def tally(self, name, value):
         """Adds to the "used" metric for the given quota."""
@@ -126,8 +133,21 @@ class QuotaUsage(dict):
         self.usages[name]['used'] += int(value)  # Fail if can't coerce to int.
         self.update_available(name)
 
+    def mark_unavailable(self, name):
+        """Records that the usage of the given quota couldn't be retrieved.
+
+        The quota is still reported, but with nothing available (and the
+        ``unavailable`` flag set), since it's not known whether any is.
+        """
+        self.usages[name].pop('used', None)
+        self.usages[name]['available'] = 0
+        self.usages[name]['unavailable'] = True
+
     def update_available(self, name):
         """Updates the "available" metric for the given quota."""
+        if 'quota' not in self.usages[name]:
+            # Nothing to do until the limit is known (see add_quota).
+            return
         available = self.usages[name]['quota'] - self.usages[name]['used']
         if available < 0:
             available = 0
@@ -252,24 +272,83 @@ def get_disabled_quotas(request):
     return disabled_quotas
 
 
+def _fan_out(calls):
+    """Makes the given independent API calls concurrently.
+
+    The number of calls in flight at once is limited by the
+    ``OPENSTACK_QUOTA_USAGE_MAX_WORKERS`` setting, and any that haven't
+    completed after ``OPENSTACK_QUOTA_USAGE_TIMEOUT`` seconds are reported
+    as failed.
+    """
+    return concurrency.fan_out(
+        calls,
+        max_workers=getattr(settings, 'OPENSTACK_QUOTA_USAGE_MAX_WORKERS', 10),
+        timeout=getattr(settings, 'OPENSTACK_QUOTA_USAGE_TIMEOUT', 30))
+
+
+def _count_only(request):
+    """Whether usage should be taken from the services' own usage counters
+    (or counted without retrieving the resources) rather than tallied from
+    the full resource lists.
+
+    See the ``OPENSTACK_QUOTA_USAGE_COUNT_ONLY`` setting.
+    """
+    return getattr(settings, 'OPENSTACK_QUOTA_USAGE_COUNT_ONLY', False)
+
+
+# Maps quota names to the absolute limits reporting their usage.
+NOVA_USAGE_LIMITS = {'instances': 'totalInstancesUsed',
+                     'cores': 'totalCoresUsed',
+                     'ram': 'totalRAMUsed'}
+
+CINDER_USAGE_LIMITS = {'volumes': 'totalVolumesUsed',
+                       'snapshots': 'totalSnapshotsUsed',
+                       'gigabytes': 'totalGigabytesUsed'}
+
+
+def _tally_limits(usages, limits, usage_limits):
+    """Tallies usage from the given absolute limits.
+
+    Returns False, having tallied nothing, if any of the limits weren't
+    reported.
+    """
+    if not all(name in limits for name in usage_limits.values()):
+        return False
+    for quota_name, limit_name in usage_limits.items():
+        usages.tally(quota_name, limits[limit_name])
+    return True
+
+
 def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
+    if _count_only(request):
+        own_tenant = tenant_id in (None, request.user.project_id)
+        limits = nova.tenant_absolute_limits(
+            request, tenant_id=None if own_tenant else tenant_id)
+        if _tally_limits(usages, limits, NOVA_USAGE_LIMITS):
+            return
+
     if tenant_id:
-        instances, has_more = nova.server_list(
-            request, search_opts={'tenant_id': tenant_id}, all_tenants=True)
+        list_servers = functools.partial(
+            nova.server_list, request, search_opts={'tenant_id': tenant_id},
+            all_tenants=True)
     else:
-        instances, has_more = nova.server_list(request)
+        list_servers = functools.partial(nova.server_list, request)
+    servers, flavors = _fan_out([list_servers,
+                                 functools.partial(nova.flavor_list, request)])
+    instances, has_more = servers.get()
 
     # Fetch deleted flavors if necessary.
-    flavors = dict([(f.id, f) for f in nova.flavor_list(request)])
-    missing_flavors = [instance.flavor['id'] for instance in instances
-                       if instance.flavor['id'] not in flavors]
-    for missing in missing_flavors:
-        if missing not in flavors:
-            try:
-                flavors[missing] = nova.flavor_get(request, missing)
-            except Exception:
-                flavors[missing] = {}
-                exceptions.handle(request, ignore=True)
+    flavors = dict([(f.id, f) for f in flavors.get()])
+    missing_flavors = list(set(instance.flavor['id'] for instance in instances
+                               if instance.flavor['id'] not in flavors))
+    results = _fan_out([functools.partial(nova.flavor_get, request, missing)
+                        for missing in missing_flavors])
+    for missing, result in zip(missing_flavors, results):
+        try:
+            flavors[missing] = result.get()
+        except Exception:
+            flavors[missing] = {}
+            exceptions.handle(request, ignore=True)
 
     usages.tally('instances', len(instances))
 
@@ -284,76 +363,208 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         usages.tally('ram', 0)
 
 
-def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
-    floating_ips = []
+def _tenant_floating_ip_list(request):
     try:
         if network.floating_ip_supported(request):
-            floating_ips = network.tenant_floating_ip_list(request)
+            return network.tenant_floating_ip_list(request)
     except Exception:
         pass
-    usages.tally('floating_ips', len(floating_ips))
+    return []
 
-    if 'security_group' not in disabled_quotas:
-        security_groups = []
-        security_groups = network.security_group_list(request)
-        usages.tally('security_groups', len(security_groups))
 
-    if 'network' not in disabled_quotas:
-        networks = []
-        networks = neutron.network_list(request, shared=False)
-        if tenant_id:
-            networks = filter(lambda net: net.tenant_id == tenant_id, networks)
-        usages.tally('networks', len(networks))
+def _tenant_floating_ip_count(request, tenant_id):
+    try:
+        if network.floating_ip_supported(request):
+            return neutron.resource_count(request, 'floatingips',
+                                          tenant_id=tenant_id)
+    except Exception:
+        pass
+    return 0
 
+
+def _get_tenant_network_counts(request, usages, disabled_quotas, tenant_id):
+    """Counts the tenant's neutron resources without retrieving them."""
+    tenant_id = tenant_id or request.user.project_id
+    count = functools.partial(neutron.resource_count, request,
+                              tenant_id=tenant_id)
+    calls = {'floating_ips': functools.partial(_tenant_floating_ip_count,
+                                               request, tenant_id)}
+    if 'security_group' not in disabled_quotas:
+        calls['security_groups'] = functools.partial(count,
+                                                     'security_groups')
+    if 'network' not in disabled_quotas:
+        calls['networks'] = functools.partial(count, 'networks',
+                                              shared=False)
     if 'subnet' not in disabled_quotas:
-        subnets = []
-        subnets = neutron.subnet_list(request)
-        usages.tally('subnets', len(subnets))
+        calls['subnets'] = functools.partial(count, 'subnets')
+    if 'router' not in disabled_quotas:
+        calls['routers'] = functools.partial(count, 'routers')
 
+    names = list(calls)
+    for name, result in zip(names, _fan_out([calls[n] for n in names])):
+        usages.tally(name, result.get())
+
+
+def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
+    if _count_only(request) and base.is_service_enabled(request, 'network'):
+        _get_tenant_network_counts(request, usages, disabled_quotas,
+                                   tenant_id)
+        return
+
+    calls = {'floating_ips': functools.partial(_tenant_floating_ip_list,
+                                               request)}
+    if 'security_group' not in disabled_quotas:
+        calls['security_groups'] = functools.partial(
+            network.security_group_list, request)
+    if 'network' not in disabled_quotas:
+        calls['networks'] = functools.partial(neutron.network_list, request,
+                                              shared=False)
+    if 'subnet' not in disabled_quotas:
+        calls['subnets'] = functools.partial(neutron.subnet_list, request)
     if 'router' not in disabled_quotas:
-        routers = []
-        routers = neutron.router_list(request)
-        if tenant_id:
-            routers = filter(lambda rou: rou.tenant_id == tenant_id, routers)
-        usages.tally('routers', len(routers))
+        calls['routers'] = functools.partial(neutron.router_list, request)
+
+    names = list(calls)
+    results = dict(zip(names, [r.get() for r in
+                               _fan_out([calls[n] for n in names])]))
+
+    if tenant_id:
+        for name in ('networks', 'routers'):
+            if name in results:
+                results[name] = [r for r in results[name]
+                                 if r.tenant_id == tenant_id]
+    for name in names:
+        usages.tally(name, len(results[name]))
 
 
 def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
     if 'volumes' not in disabled_quotas:
+        # The volume limits are only available for the user's own tenant.
+        if (_count_only(request) and
+                tenant_id in (None, request.user.project_id) and
+                _tally_limits(usages, cinder.tenant_absolute_limits(request),
+                              CINDER_USAGE_LIMITS)):
+            return
+
         if tenant_id:
             opts = {'alltenants': 1, 'tenant_id': tenant_id}
-            volumes = cinder.volume_list(request, opts)
-            snapshots = cinder.volume_snapshot_list(request, opts)
+            calls = [functools.partial(cinder.volume_list, request, opts),
+                     functools.partial(cinder.volume_snapshot_list, request,
+                                       opts)]
         else:
-            volumes = cinder.volume_list(request)
-            snapshots = cinder.volume_snapshot_list(request)
+            calls = [functools.partial(cinder.volume_list, request),
+                     functools.partial(cinder.volume_snapshot_list, request)]
+        volumes, snapshots = [r.get() for r in _fan_out(calls)]
         usages.tally('gigabytes', sum([int(v.size) for v in volumes]))
         usages.tally('volumes', len(volumes))
         usages.tally('snapshots', len(snapshots))
 
 
+# Usage of these services is optional, in that if it can't be retrieved then
+# the remaining quotas are still reported.  (Their own quotas are marked as
+# unavailable.)
+ISOLATED_USAGES = {
+    'network': ('floating_ips', 'security_groups', 'networks', 'subnets',
+                'routers'),
+    'volume': ('gigabytes', 'volumes', 'snapshots'),
+}
+
+
+QUOTA_USAGE_CACHE_PREFIX = 'quota-usages'
+
+
+def _quota_usage_cache_key(request, tenant_id):
+    region = request.user.services_region or ''
+    return '%s:%s:%s' % (QUOTA_USAGE_CACHE_PREFIX,
+                         hashlib.md5(region.encode('utf-8')).hexdigest(),
+                         tenant_id)
+
+
+def invalidate_tenant_quota_usages(request, tenant_id=None):
+    """Discards the cached quota usage of the given tenant.
+
+    This should be called whenever the dashboard creates or deletes a
+    resource counted against the tenant's quotas, so that the change shows
+    up straight away rather than once the cached usage has expired.
+    If no tenant_id is provided, the request.user.project_id is assumed.
+    """
+    if not tenant_id:
+        tenant_id = request.user.project_id
+    cache.delete(_quota_usage_cache_key(request, tenant_id))
+
+
 @memoized
 def tenant_quota_usages(request, tenant_id=None):
     """Get our quotas and construct our usage object.
     If no tenant_id is provided, a the request.user.project_id
     is assumed to be used
+
+    The quota limits and the usage of each service are retrieved
+    concurrently.  If the network or volume usage can't be retrieved, the
+    error is logged and the quotas of that service are reported with
+    nothing available (see :meth:`QuotaUsage.mark_unavailable`).
+
+    The usage of the user's own project is shared between requests for
+    ``OPENSTACK_QUOTA_USAGE_CACHE_TTL`` seconds; see
+    :func:`invalidate_tenant_quota_usages`.  The usage of any other project
+    (as seen by an admin) isn't cached, since some of it is counted in the
+    admin's own scope.
     """
     if not tenant_id:
         tenant_id = request.user.project_id
 
+    ttl = 0
+    if tenant_id == request.user.project_id:
+        ttl = getattr(settings, 'OPENSTACK_QUOTA_USAGE_CACHE_TTL', 30)
+    if ttl:
+        key = _quota_usage_cache_key(request, tenant_id)
+        cached = cache.get(key)
+        if cached is not None:
+            usages = QuotaUsage()
+            usages.usages.update(cached)
+            return usages
+
     disabled_quotas = get_disabled_quotas(request)
     usages = QuotaUsage()
-
-    for quota in get_tenant_quota_data(request,
-                                       disabled_quotas=disabled_quotas,
-                                       tenant_id=tenant_id):
+    complete = True
+
+    # Each service tallies its usage separately, since the limits may not
+    # have arrived yet; the tallies are merged in once they have.
+    services = [('compute', _get_tenant_compute_usages),
+                ('network', _get_tenant_network_usages),
+                ('volume', _get_tenant_volume_usages)]
+    service_usages = [QuotaUsage() for service in services]
+    calls = [functools.partial(get_tenant_quota_data, request,
+                               disabled_quotas=disabled_quotas,
+                               tenant_id=tenant_id)]
+    calls.extend(functools.partial(get_usages, request, service_usage,
+                                   disabled_quotas, tenant_id)
+                 for ((name, get_usages), service_usage)
+                 in zip(services, service_usages))
+    results = _fan_out(calls)
+
+    for quota in results[0].get():
         usages.add_quota(quota)
 
     # Get our usages.
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
-
+    for ((name, get_usages), service_usage, result) in zip(
+            services, service_usages, results[1:]):
+        if result.failed and name in ISOLATED_USAGES:
+            LOG.error("Unable to retrieve %s usage for quotas: %s",
+                      name, result.exception)
+            for quota_name in ISOLATED_USAGES[name]:
+                if quota_name in usages:
+                    usages.mark_unavailable(quota_name)
+            complete = False
+            continue
+        result.get()
+        for quota_name, usage in service_usage.usages.items():
+            usages.tally(quota_name, usage['used'])
+
+    # Partial results aren't cached, so that the missing quotas come back
+    # as soon as the service does.
+    if ttl and complete:
+        cache.set(key, dict(usages.usages), ttl)
     return usages
 
 
@@ -0,0 +1,153 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A process-wide registry of the capabilities (i.e. extensions) of each
+service endpoint.
+
+The extensions supported by a service depend on its endpoint rather than on
+the user asking, but checking for them is needed to render most pages (e.g.
+to work out the disabled quotas, or whether row actions are allowed), so
+fetching them once per request is a large part of the cost of a page view.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+LOG = logging.getLogger(__name__)
+
+_registries = []
+
+
+class Registry(object):
+    """Keeps the capabilities of one kind of service, keyed by endpoint.
+
+    ``endpoint_func(request)`` returns the endpoint of the service used by
+    the request, and ``fetch_func(request)`` retrieves its capabilities,
+    which must be picklable.
+
+    The capabilities of each endpoint are kept in this process, and in the
+    Django cache (so that they're shared with the other processes and can be
+    prewarmed with the ``prewarm_capabilities`` management command), for up
+    to ``CAPABILITIES_CACHE_TTL`` seconds.  If
+    ``CAPABILITIES_REFRESH_INTERVAL`` is set, then once they are older than
+    that they are refreshed in a background thread the next time they're
+    used, so requests rarely have to wait for them.
+    """
+
+    def __init__(self, kind, endpoint_func, fetch_func):
+        self.kind = kind
+        self._endpoint = endpoint_func
+        self._fetch = fetch_func
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        _registries.append(self)
+
+    def _cache_key(self, endpoint):
+        return 'capabilities:%s:%s' % (
+            self.kind, hashlib.md5(endpoint.encode('utf-8')).hexdigest())
+
+    def _load(self, request, endpoint):
+        entry = {'value': self._fetch(request), 'timestamp': time.time()}
+        ttl = getattr(settings, 'CAPABILITIES_CACHE_TTL', 300)
+        if ttl:
+            cache.set(self._cache_key(endpoint), entry, ttl)
+            with self._lock:
+                self._entries[endpoint] = entry
+        return entry
+
+    def _refresh(self, request, endpoint):
+        with self._lock:
+            if endpoint in self._refreshing:
+                return
+            self._refreshing.add(endpoint)
+
+        def run():
+            try:
+                self._load(request, endpoint)
+            except Exception:
+                LOG.exception("Unable to refresh the %s capabilities.",
+                              self.kind)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(endpoint)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def get(self, request):
+        """Returns the capabilities of the endpoint used by the request."""
+        endpoint = self._endpoint(request)
+        ttl = getattr(settings, 'CAPABILITIES_CACHE_TTL', 300)
+        now = time.time()
+
+        entry = self._entries.get(endpoint)
+        if ttl and (entry is None or now - entry['timestamp'] > ttl):
+            # Another process may have fetched them already.
+            entry = cache.get(self._cache_key(endpoint))
+            if entry is not None:
+                with self._lock:
+                    self._entries[endpoint] = entry
+        if not ttl or entry is None or now - entry['timestamp'] > ttl:
+            LOG.debug("Fetching the %s capabilities.", self.kind)
+            return self._load(request, endpoint)['value']
+
+        interval = getattr(settings, 'CAPABILITIES_REFRESH_INTERVAL', None)
+        if interval is not None and now - entry['timestamp'] > interval:
+            self._refresh(request, endpoint)
+        return entry['value']
+
+    def prewarm(self, request):
+        """Fetches the capabilities of the endpoint used by the request,
+        replacing any that are cached.
+        """
+        self._load(request, self._endpoint(request))
+
+    def clear(self):
+        """Forgets the capabilities cached in this process."""
+        with self._lock:
+            self._entries.clear()
+
+
+def registries():
+    """Returns every :class:`Registry` that has been created."""
+    return list(_registries)
+
+
+def clear():
+    """Forgets the capabilities cached in this process by every registry."""
+    for registry in _registries:
+        registry.clear()
+
+
+def endpoint_for(request, service_type):
+    """Returns the endpoint of the given service type used by the request,
+    as a key for a :class:`Registry`.
+
+    The project ID included in some endpoints (e.g. nova's) is replaced, so
+    that every project shares the capabilities of the endpoint.
+    """
+    # Imported here as the API modules create their registries on import.
+    from openstack_dashboard.api import base
+
+    endpoint = base.url_for(request, service_type)
+    project_id = getattr(request.user, 'project_id', None)
+    if project_id:
+        endpoint = endpoint.replace(project_id, '%(project_id)s')
+    return endpoint
@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Helpers for issuing independent API calls concurrently."""
+
+import logging
+import sys
+import threading
+import time
+
+import six
+from six.moves import queue
+
+
+LOG = logging.getLogger(__name__)
+
+
+class CallTimeout(Exception):
+    """The call did not complete before the deadline given to fan_out."""
+
+
+class CallResult(object):
+    """The outcome of a single call made by :func:`fan_out`."""
+
+    def __init__(self, value=None, exc_info=None):
+        self.value = value
+        self.exc_info = exc_info
+
+    @property
+    def failed(self):
+        return self.exc_info is not None
+
+    @property
+    def exception(self):
+        return self.exc_info[1] if self.exc_info is not None else None
+
+    def get(self):
+        """Return the value of the call, re-raising any exception it raised."""
+        if self.exc_info is not None:
+            six.reraise(*self.exc_info)
+        return self.value
+
+
+def _call(func):
+    try:
+        return CallResult(value=func())
+    except Exception:
+        return CallResult(exc_info=sys.exc_info())
+
+
+def fan_out(calls, max_workers=None, timeout=None):
+    """Runs independent callables concurrently and returns their outcomes.
+
+    ``calls`` is a sequence of callables taking no arguments (bind arguments
+    with ``functools.partial``).  At most ``max_workers`` of them run at the
+    same time; by default every call gets its own thread.
+
+    Returns a list of :class:`CallResult` in the same order as ``calls``.
+    An exception raised by one call is captured in its result and does not
+    affect the other calls.  If ``timeout`` seconds pass before every call
+    has completed, the outstanding ones are reported as failed with
+    :class:`CallTimeout` and are left to finish in the background.
+    """
+    calls = list(calls)
+    if not calls:
+        return []
+    if max_workers is None or max_workers > len(calls):
+        max_workers = len(calls)
+    if max_workers <= 1 and timeout is None:
+        # Not worth starting a thread for.
+        return [_call(func) for func in calls]
+
+    deadline = None if timeout is None else time.time() + timeout
+    results = [None] * len(calls)
+    pending = queue.Queue()
+    for index, func in enumerate(calls):
+        pending.put((index, func))
+    remaining = [len(calls)]
+    finished = threading.Condition()
+
+    def worker():
+        while True:
+            if deadline is not None and time.time() >= deadline:
+                return
+            try:
+                index, func = pending.get_nowait()
+            except queue.Empty:
+                return
+            result = _call(func)
+            with finished:
+                results[index] = result
+                remaining[0] -= 1
+                finished.notify()
+
+    for _ in range(max_workers):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    with finished:
+        while remaining[0]:
+            if deadline is None:
+                finished.wait()
+                continue
+            wait = deadline - time.time()
+            if wait <= 0:
+                break
+            finished.wait(wait)
+        outcome = list(results)
+
+    for index, result in enumerate(outcome):
+        if result is None:
+            LOG.warning("Concurrent call %r timed out after %ss.",
+                        calls[index], timeout)
+            try:
+                raise CallTimeout(calls[index])
+            except CallTimeout:
+                outcome[index] = CallResult(exc_info=sys.exc_info())
+    return outcome
+
+
+def parallel_map(func, items, max_workers=None, timeout=None):
+    """Like ``map(func, items)``, but with the calls made concurrently.
+
+    The first exception raised by any call (in the order of ``items``) is
+    re-raised once all the calls have finished.
+    """
+    calls = [lambda item=item: func(item) for item in items]
+    return [result.get()
+            for result in fan_out(calls, max_workers=max_workers,
+                                  timeout=timeout)]
@@ -0,0 +1,189 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A shared directory of the names of the keystone users and projects.
+
+Several admin views only need to show the names of the users and projects
+that own other resources, but would otherwise download the whole user and
+project lists from keystone on every page view.
+"""
+
+import collections
+import copy
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django import http
+
+from openstack_dashboard.api import keystone
+
+
+LOG = logging.getLogger(__name__)
+
+
+Identity = collections.namedtuple('Identity',
+                                  ['id', 'name', 'enabled', 'description'])
+
+
+def _identity(resource):
+    return Identity(resource.id,
+                    resource.name,
+                    getattr(resource, 'enabled', True),
+                    getattr(resource, 'description', None) or '')
+
+
+def _scope(request):
+    """Returns what determines which users and projects the request's user
+    may list: the keystone endpoint, their domain and their roles.
+    """
+    user = request.user
+    roles = sorted(role['name'] for role in getattr(user, 'roles', None) or [])
+    return '%s|%s|%s' % (getattr(user, 'endpoint', None) or '',
+                         getattr(user, 'user_domain_id', None) or '',
+                         ','.join(roles))
+
+
+def _detach(request):
+    """Returns a new request with just the user (and hence the token) of the
+    given one, for the directory to be refreshed with after the request has
+    finished.
+    """
+    user = request.user
+    # Evaluate a lazy user and copy the user it wraps, so that the copy
+    # doesn't refer to the request.
+    user.is_authenticated()
+    detached = http.HttpRequest()
+    detached.user = copy.copy(getattr(user, '_wrapped', user))
+    detached.session = {}
+    return detached
+
+
+class Directory(object):
+    """Maps the IDs of one kind of keystone resource to an :class:`Identity`
+    holding its name and whether it is enabled.
+
+    The whole list is retrieved at once and kept in the Django cache, so that
+    it's shared between requests, for up to ``IDENTITY_DIRECTORY_TTL``
+    seconds.  Once it's older than ``IDENTITY_DIRECTORY_REFRESH_INTERVAL``
+    seconds it's refreshed in a background thread the next time it's used,
+    so requests rarely have to wait for it.
+
+    A separate directory is kept for each keystone endpoint, domain and set
+    of roles, as those determine which users and projects may be listed, so
+    it's shared only by users who would get the same list.  It's still best
+    used in views whose users may list all users and projects anyway (i.e.
+    admin views), as the lists are retrieved with the admin endpoint.
+    """
+
+    def __init__(self, kind, list_func, get_func):
+        self.kind = kind
+        self._list = list_func
+        self._get = get_func
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    def _cache_key(self, request):
+        # Every scope's directory is discarded at once by changing the
+        # generation (see forget()).
+        generation = cache.get(self._generation_key()) or 0
+        return 'identity-directory:%s:%s:%s' % (
+            self.kind, generation,
+            hashlib.md5(_scope(request).encode('utf-8')).hexdigest())
+
+    def _generation_key(self):
+        return 'identity-directory:%s:generation' % self.kind
+
+    def _load(self, request, key):
+        entries = dict((r.id, _identity(r)) for r in self._list(request))
+        directory = {'entries': entries, 'timestamp': time.time()}
+        cache.set(key, directory,
+                  getattr(settings, 'IDENTITY_DIRECTORY_TTL', 600))
+        return directory
+
+    def _refresh(self, request, key):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._load(request, key)
+            except Exception:
+                LOG.exception("Unable to refresh the %s directory.",
+                              self.kind)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        request = _detach(request)
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    def entries(self, request):
+        """Returns a dict mapping each ID to its :class:`Identity`."""
+        key = self._cache_key(request)
+        directory = cache.get(key)
+        if directory is None:
+            LOG.debug("Loading the %s directory.", self.kind)
+            directory = self._load(request, key)
+        elif (time.time() - directory['timestamp'] >
+              getattr(settings, 'IDENTITY_DIRECTORY_REFRESH_INTERVAL', 120)):
+            self._refresh(request, key)
+        return directory['entries']
+
+    def get(self, request, obj_id):
+        """Returns the :class:`Identity` with the given ID.
+
+        IDs that aren't in the directory (e.g. those created since it was
+        loaded) are looked up individually, so this raises the usual
+        keystone exceptions if there's no such resource.
+        """
+        entry = self.entries(request).get(obj_id)
+        if entry is None:
+            key = '%s:%s' % (self._cache_key(request), obj_id)
+            entry = cache.get(key)
+            if entry is None:
+                entry = _identity(self._get(request, obj_id))
+                cache.set(key, entry,
+                          getattr(settings, 'IDENTITY_DIRECTORY_TTL', 600))
+        return entry
+
+    def forget(self, request):
+        """Discards the directory of every scope (and the resources looked up
+        individually), after a resource has been created, changed or
+        deleted, so that it's reloaded when next used.
+        """
+        key = self._generation_key()
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+# The keystone API functions are looked up when called, so that they can be
+# stubbed out in tests.
+users = Directory(
+    'user',
+    lambda request: keystone.user_list(request),
+    lambda request, user_id: keystone.user_get(request, user_id))
+
+projects = Directory(
+    'project',
+    lambda request: keystone.tenant_list(request, domain=None,
+                                         paginate=False)[0],
+    lambda request, project_id: keystone.tenant_get(request, project_id))
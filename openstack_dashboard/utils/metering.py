@@ -20,6 +20,7 @@ import pytz
 from horizon.utils import units
 
 from openstack_dashboard import api
+from openstack_dashboard.utils import identity
 
 
 LOG = logging.getLogger(__name__)
@@ -167,7 +168,9 @@ def normalize_series_by_unit(series):
 
 class ProjectAggregatesQuery(object):
     def __init__(self, request, date_from, date_to,
-                 period=None, additional_query=[]):
+                 period=None, additional_query=None):
+        # Don't modify the caller's list (or a shared default).
+        additional_query = list(additional_query or [])
         if not period:
             period = calc_period(date_from, date_to)
         if date_from:
@@ -182,9 +185,7 @@ class ProjectAggregatesQuery(object):
         self.request = request
         self.period = period
         self.additional_query = additional_query
-        tenants, more = api.keystone.tenant_list(request,
-                                                 domain=None,
-                                                 paginate=False)
+        tenants = identity.projects.entries(request).values()
         self.queries = {}
 
         for tenant in tenants: